@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.core.deps import get_jsonplaceholder_orchestrator
 from app.orchestration.jsonplaceholder_orchestrator import JsonPlaceholderOrchestrator
@@ -7,7 +7,9 @@ router = APIRouter()
 
 
 @router.get("/posts")
-def list_posts(
+async def list_posts(
+    start: int = Query(default=0, ge=0),
+    limit: int = Query(default=10, ge=1, le=100),
     orchestrator: JsonPlaceholderOrchestrator = Depends(get_jsonplaceholder_orchestrator),
 ) -> list[dict]:
-    return orchestrator.list_posts()
+    return await orchestrator.list_posts(start=start, limit=limit)
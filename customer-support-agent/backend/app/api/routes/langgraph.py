@@ -1,15 +1,85 @@
-from fastapi import APIRouter, Depends
+from typing import Annotated
 
-from app.api.schemas.langgraph import LangGraphSupportRequest, LangGraphSupportResponse
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.schemas.langgraph import (
+    LangGraphCacheStatsResponse,
+    LangGraphSessionResponse,
+    LangGraphSupportBatchRequest,
+    LangGraphSupportRequest,
+    LangGraphSupportResponse,
+    LangGraphSupportStreamRequest,
+    LangGraphTriageStatsResponse,
+)
 from app.core.deps import get_langgraph_orchestrator
 from app.orchestration.langgraph_orchestrator import LangGraphOrchestrator
 
 router = APIRouter()
 
+Orchestrator = Annotated[LangGraphOrchestrator, Depends(get_langgraph_orchestrator)]
+
 
 @router.post("/support", response_model=LangGraphSupportResponse)
-def process_support_message(
+async def process_support_message(
     payload: LangGraphSupportRequest,
-    orchestrator: LangGraphOrchestrator = Depends(get_langgraph_orchestrator),
+    orchestrator: Orchestrator,
 ) -> LangGraphSupportResponse:
-    return orchestrator.process_support_message(payload.query)
+    return await orchestrator.process_support_message(
+        payload.query,
+        pipeline_mode=payload.pipeline_mode,
+        tenant_id=payload.tenant_id,
+    )
+
+
+@router.post("/support/stream")
+async def stream_support_message(
+    payload: LangGraphSupportStreamRequest,
+    orchestrator: Orchestrator,
+) -> StreamingResponse:
+    # Server-sent events: category, analysis, response deltas, then done. Always runs the
+    # per-node pipeline, so pipeline_mode is ignored here.
+    return StreamingResponse(
+        orchestrator.stream_support_message(
+            payload.query,
+            session_id=payload.session_id,
+            tenant_id=payload.tenant_id,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/support/batch")
+async def process_support_batch(
+    payload: LangGraphSupportBatchRequest,
+    orchestrator: Orchestrator,
+) -> StreamingResponse:
+    # One JSON object per line, written as each item completes (not in request order).
+    return StreamingResponse(
+        orchestrator.process_support_batch(payload),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/sessions/{session_id}", response_model=LangGraphSessionResponse)
+async def session_history(
+    session_id: str,
+    orchestrator: Orchestrator,
+    limit: int = Query(default=20, ge=1, le=200),
+) -> LangGraphSessionResponse:
+    return await orchestrator.session_history(session_id, limit)
+
+
+@router.get("/cache/stats", response_model=LangGraphCacheStatsResponse)
+def cache_stats(
+    orchestrator: Orchestrator,
+) -> LangGraphCacheStatsResponse:
+    return orchestrator.cache_stats()
+
+
+@router.get("/triage/stats", response_model=LangGraphTriageStatsResponse)
+def triage_stats(
+    orchestrator: Orchestrator,
+) -> LangGraphTriageStatsResponse:
+    return orchestrator.triage_stats()
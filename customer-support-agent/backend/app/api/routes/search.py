@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
 from app.api.schemas.search import SearchResponse
 from app.core.deps import get_search_orchestrator
@@ -9,7 +9,10 @@ router = APIRouter()
 
 @router.get("", response_model=SearchResponse)
 async def search(
+    response: Response,
     q: str = Query(..., min_length=2),
     orchestrator: SearchOrchestrator = Depends(get_search_orchestrator),
 ) -> SearchResponse:
-    return await orchestrator.search(q)
+    result, headers = await orchestrator.search(q)
+    response.headers.update(headers)
+    return result
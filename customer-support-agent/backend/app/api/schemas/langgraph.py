@@ -1,8 +1,21 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field, model_validator
 
+PipelineMode = Literal["graph", "fused"]
+# Which tier chose the category: the caller, confident rules (cascade), the LLM, or rules
+# after the LLM call failed.
+CategorySource = Literal["provided", "rules", "llm", "rules_fallback"]
+# Who wrote the response: a canonical knowledge-base article (no LLM call), the LLM, or
+# the rules template after the LLM call failed.
+ResponseSource = Literal["knowledge_base", "llm", "rules_fallback"]
+
 
 class LangGraphSupportRequest(BaseModel):
     query: str = Field(..., min_length=1)
+    pipeline_mode: PipelineMode | None = None  # Defaults to SUPPORT_PIPELINE_MODE
+    # Tenants listed in SUPPORT_PREMIUM_TENANTS are scheduled ahead of routine traffic.
+    tenant_id: str | None = Field(default=None, max_length=128)
 
     @model_validator(mode="before")
     @classmethod
@@ -14,8 +27,63 @@ class LangGraphSupportRequest(BaseModel):
         return data
 
 
+class LangGraphSupportStreamRequest(LangGraphSupportRequest):
+    # Continues a stored conversation; needs DATABASE_URL, otherwise ignored.
+    session_id: str | None = Field(default=None, min_length=1, max_length=128)
+
+
 class LangGraphSupportResponse(BaseModel):
     query: str
     category: str
     analysis: str
     response: str
+    category_source: CategorySource = "rules_fallback"
+    response_source: ResponseSource = "llm"
+    pipeline_mode: PipelineMode = "graph"
+    cache_hit: bool = False
+    truncated: bool = False  # Streamed response cut off by a provider error
+
+
+class LangGraphSupportBatchRequest(BaseModel):
+    queries: list[str] = Field(..., min_length=1, max_length=1000)
+    # Defaults to SUPPORT_BATCH_CONCURRENCY
+    concurrency: int | None = Field(default=None, ge=1, le=64)
+    pack_categorization: bool = False  # Categorize many queries per LLM call
+    pipeline_mode: PipelineMode | None = None
+    tenant_id: str | None = Field(default=None, max_length=128)
+
+
+class LangGraphSupportBatchItem(LangGraphSupportResponse):
+    """One NDJSON line of a batch response; lines arrive in completion order."""
+
+    index: int
+
+
+class LangGraphSupportBatchError(BaseModel):
+    index: int
+    query: str
+    error: str
+
+
+class LangGraphSessionTurn(BaseModel):
+    role: str
+    content: str
+    response_id: str | None = None
+    created_at: float
+
+
+class LangGraphSessionResponse(BaseModel):
+    session_id: str
+    last_response_id: str | None = None
+    turns: list[LangGraphSessionTurn]
+
+
+class LangGraphCacheStatsResponse(BaseModel):
+    caches: dict[str, dict[str, float]]
+
+
+class LangGraphTriageStatsResponse(BaseModel):
+    categorization: dict[str, float]
+    routing: dict[str, float] = Field(default_factory=dict)  # LLM failover/hedging counters
+    scheduling: dict[str, float] = Field(default_factory=dict)  # Queue depth per priority
+    responses: dict[str, float] = Field(default_factory=dict)  # Knowledge base vs. generated
@@ -1,13 +1,32 @@
 import httpx
 
+from app.core.http_cache import ConditionalResponseCache
+from app.core.http_client import get_http_client
+
 
 class JsonPlaceholderClient:
     base_url = "https://jsonplaceholder.typicode.com"
 
-    def list_posts(self) -> list[dict]:
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(f"{self.base_url}/posts")
-            response.raise_for_status()
-            data = response.json()
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        cache: ConditionalResponseCache | None = None,
+        base_url: str | None = None,
+    ) -> None:
+        # Defaults to the app-wide pooled client; `cache` revalidates repeat calls by ETag.
+        self._http_client = http_client
+        self._cache = cache
+        if base_url:
+            self.base_url = base_url
+
+    async def list_posts(self, start: int = 0, limit: int = 10) -> list[dict]:
+        # The upstream pages with `_start`/`_limit`, so only the requested posts are sent.
+        params = {"_start": start, "_limit": limit}
+        client = self._http_client or get_http_client()
+        url = f"{self.base_url}/posts"
+        if self._cache is not None:
+            return await self._cache.get_json(client, url, params=params)
 
-        return data[:10]
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
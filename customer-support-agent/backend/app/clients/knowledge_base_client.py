@@ -0,0 +1,26 @@
+from app.core.config import settings
+from app.services.support.knowledge_base import KnowledgeBaseIndex, open_knowledge_base
+
+
+def get_knowledge_base_index() -> KnowledgeBaseIndex:
+    if not settings.KNOWLEDGE_BASE_INDEX_PATH:
+        raise ValueError("KNOWLEDGE_BASE_INDEX_PATH is not set")
+    return open_knowledge_base(settings.KNOWLEDGE_BASE_INDEX_PATH)
+
+
+class KnowledgeBaseClient:
+    """Help-center articles from the local BM25 index; answers without a network call."""
+
+    name = "knowledge_base"
+    cacheable = False  # Faster than a cache lookup; SearchService skips the search cache
+
+    def __init__(self, index: KnowledgeBaseIndex | None = None, limit: int | None = None) -> None:
+        self._index = index
+        self.limit = limit or settings.KNOWLEDGE_BASE_RESULT_LIMIT
+
+    async def search(self, query: str) -> list[dict[str, str]]:
+        index = self._index or get_knowledge_base_index()
+        return [
+            {"title": document["title"], "url": document["url"], "source": self.name}
+            for _, document in index.search(query, self.limit)
+        ]
@@ -2,9 +2,23 @@ from typing import Any
 
 import httpx
 
+from app.core.http_client import get_http_client
+
 
 class WikipediaClient:
+    name = "wikipedia"
     base_url = "https://en.wikipedia.org/w/api.php"
+    article_url = "https://en.wikipedia.org/wiki/"
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        base_url: str | None = None,
+    ) -> None:
+        # Defaults to the app-wide pooled client, so searches reuse keep-alive connections.
+        self._http_client = http_client
+        if base_url:
+            self.base_url = base_url
 
     async def search(self, query: str) -> list[dict[str, str]]:
         params = {
@@ -15,17 +29,17 @@ class WikipediaClient:
             "srlimit": 5,
         }
         headers = {"User-Agent": "customer-support-agent/1.0 (https://github.com/travellingcoderr/gen-ai-projects/customer-support-agent)"}
-        async with httpx.AsyncClient(timeout=10.0, headers=headers) as client:
-            response = await client.get(self.base_url, params=params)
-            response.raise_for_status()
-            payload: dict[str, Any] = response.json()
+        client = self._http_client or get_http_client()
+        response = await client.get(self.base_url, params=params, headers=headers)
+        response.raise_for_status()
+        payload: dict[str, Any] = response.json()
 
         items = payload.get("query", {}).get("search", [])
         return [
             {
                 "title": item.get("title", ""),
-                "url": f"https://en.wikipedia.org/wiki/{item.get('title', '').replace(' ', '_')}",
-                "source": "wikipedia",
+                "url": f"{self.article_url}{item.get('title', '').replace(' ', '_')}",
+                "source": self.name,
             }
             for item in items
         ]
@@ -5,17 +5,91 @@ class Settings(BaseSettings):
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
 
     APP_ENV: str = "local"
-    DATABASE_URL: str = ""
+    DATABASE_URL: str = ""  # postgresql://... (asyncpg) or sqlite:///path; enables sessions
+    DATABASE_POOL_MIN_SIZE: int = 1
+    DATABASE_POOL_MAX_SIZE: int = 10
     REDIS_URL: str = "redis://localhost:6379/0"
     OPENAI_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
     CORS_ORIGINS: str = "http://localhost:3000"
     LLM_PROVIDER: str = "openai"
     LLM_MODEL: str = ""  # Provider default: gpt-4o-mini (openai), gemini-2.0-flash-exp (gemini)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100  # Per provider client pool
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    LLM_HTTP_TIMEOUT_SECONDS: float = 60.0
+    STARTUP_IMPORT_WARMUP: bool = True  # Import the LLM SDK and LangGraph in the background
+    GEMINI_MODEL_CACHE_SIZE: int = 32  # Cached GenerativeModel handles per process
+    LLM_ROUTING_MODE: str = "single"  # single | failover | hedge (support graph completions)
+    LLM_HEDGE_PERCENTILE: float = 95.0  # Primary latency percentile before the hedge is sent
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 2.0  # Used until enough latency samples exist
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # Latency samples before hedge delays/timeouts adapt
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open a provider breaker
+    LLM_BREAKER_RESET_SECONDS: float = 30.0  # Open time before a half-open probe
+    LLM_TIMEOUT_PERCENTILE: float = 99.0  # Per-node timeout = percentile x multiplier, clamped
+    LLM_TIMEOUT_MULTIPLIER: float = 2.0
+    LLM_TIMEOUT_MIN_SECONDS: float = 1.0
+    LLM_TIMEOUT_MAX_SECONDS: float = 20.0  # Also the timeout until a node has samples
+    LLM_RATE_LIMIT_BACKEND: str = "off"  # off | memory (per worker) | redis (shared budget)
+    LLM_RATE_LIMIT_RPM: int = 500  # Requests per minute per (provider, model)
+    LLM_RATE_LIMIT_TPM: int = 200_000  # Estimated tokens per minute per (provider, model)
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 2.0  # Queue budget before degrading to rules
+    LLM_RATE_LIMIT_COMPLETION_TOKENS: int = 300  # Output tokens assumed per call
+    SUPPORT_PIPELINE_MODE: str = "graph"  # graph (3 LLM calls) | fused (1 structured call)
+    SUPPORT_BATCH_CONCURRENCY: int = 16  # Default in-flight items per batch request
+    SUPPORT_BATCH_PACK_SIZE: int = 25  # Queries per packed categorization call
+    SUPPORT_CATEGORIZE_MODE: str = "llm_first"  # llm_first | cascade (rules first when confident)
+    SUPPORT_CASCADE_THRESHOLD: float = 0.7  # Rule confidence needed to skip the LLM categorize call
+    SUPPORT_CASCADE_AUDIT_RATE: float = 0.0  # Share of rule decisions re-checked by the LLM
+    SUPPORT_LLM_MAX_CONCURRENCY: int = 0  # In-flight LLM calls per worker; 0 disables scheduling
+    SUPPORT_PRIORITY_AGING_SECONDS: float = 5.0  # Wait that outranks one priority class
+    SUPPORT_PREMIUM_TENANTS: str = ""  # Comma-separated tenant ids served ahead of routine
+    SUPPORT_KB_ANSWER_THRESHOLD: float = 0.6  # KB confidence that skips the respond LLM call
+    SUPPORT_KB_CONTEXT_THRESHOLD: float = 0.1  # Below the answer threshold: passage for the prompt
+    SUPPORT_KB_CONTEXT_PASSAGES: int = 3  # Articles added to the respond prompt; 0 disables
+    SUPPORT_TAXONOMY_PATH: str = ""  # Rule keywords; defaults to app/services/support/taxonomy.json
+    SEMANTIC_CACHE_BACKEND: str = "off"  # off | memory | redis (shared via REDIS_URL)
+    SEMANTIC_CACHE_THRESHOLD: float = 0.8  # Cosine similarity required for a hit
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1024
+    SEMANTIC_CACHE_TTL_SECONDS: int = 3600
+    COMPLETION_CACHE_BACKEND: str = "memory"  # off | memory | redis (shared via REDIS_URL)
+    COMPLETION_CACHE_MAX_ENTRIES: int = 4096
+    COMPLETION_CACHE_TTL_SECONDS: int = 300
+    COMPLETION_CACHE_NODE_TTLS: str = "categorize=3600,analyze=900,respond=300,fused=300"
+    SESSION_HISTORY_TURNS: int = 20  # Turns loaded per streamed request
+    SESSION_FLUSH_INTERVAL_SECONDS: float = 0.5  # Write-behind batch interval
+    SESSION_FLUSH_BATCH_SIZE: int = 100  # Buffered turns that trigger an early flush
+    HTTP_CLIENT_HTTP2: bool = True  # Used when `h2` is installed (httpx[http2])
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100  # Shared outbound client (Wikipedia, ...)
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10.0
+    JSONPLACEHOLDER_CACHE_MAX_ENTRIES: int = 256  # ETag-revalidated responses; 0 disables
+    JSONPLACEHOLDER_CACHE_TTL_SECONDS: float = 60.0  # Cap on serving without revalidation
+    SEARCH_SOURCES: str = "wikipedia"  # knowledge_base, wikipedia, wikivoyage; comma-separated
+    SEARCH_DEADLINE_SECONDS: float = 3.0  # Slower sources are left out (response marked partial)
+    KNOWLEDGE_BASE_INDEX_PATH: str = ""  # Built by `python -m app.services.support.knowledge_base`
+    KNOWLEDGE_BASE_RESULT_LIMIT: int = 5
+    SEARCH_CACHE_BACKEND: str = "memory"  # off | memory | redis (shared via REDIS_URL)
+    SEARCH_CACHE_TTL_SECONDS: float = 300.0  # Served without revalidation while this fresh
+    SEARCH_CACHE_STALE_SECONDS: float = 3600.0  # Then served stale while refetching
+    SEARCH_CACHE_MAX_ENTRIES: int = 2048
+    TRACE_EXPORTER: str = "off"  # off | jsonl | otlp
+    TRACE_SAMPLE_RATE: float = 1.0  # Fraction of new traces recorded (decided at the root span)
+    TRACE_JSONL_PATH: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318"  # OTLP/HTTP collector base URL
+    TRACE_SERVICE_NAME: str = "customer-support-agent"
 
     def cors_origin_list(self) -> list[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
+    def search_source_list(self) -> list[str]:
+        return [name.strip().lower() for name in self.SEARCH_SOURCES.split(",") if name.strip()]
+
+    def premium_tenant_set(self) -> set[str]:
+        tenants = self.SUPPORT_PREMIUM_TENANTS.split(",")
+        return {tenant.strip() for tenant in tenants if tenant.strip()}
+
     def resolved_llm_model(self) -> str:
         if self.LLM_MODEL:
             return self.LLM_MODEL
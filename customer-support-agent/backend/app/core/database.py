@@ -0,0 +1,44 @@
+"""Shared async Postgres connection pools for optional database-backed features."""
+from typing import Any
+
+from app.core.config import settings
+
+_pools: dict[str, Any] = {}
+
+
+async def get_database_pool(url: str | None = None) -> Any:
+    """Return a process-wide `asyncpg` pool for `url` (defaults to DATABASE_URL).
+
+    `asyncpg` is an optional dependency; it is only imported when a Postgres-backed feature
+    is enabled. The pool is created on first use and belongs to the running event loop.
+    """
+    database_url = url or settings.DATABASE_URL
+    pool = _pools.get(database_url)
+    if pool is not None:
+        return pool
+
+    try:
+        import asyncpg
+    except ImportError as exc:
+        raise RuntimeError(
+            "Postgres-backed storage requires the 'asyncpg' package "
+            "(install the 'postgres' extra)."
+        ) from exc
+
+    pool = await asyncpg.create_pool(
+        database_url,
+        min_size=settings.DATABASE_POOL_MIN_SIZE,
+        max_size=settings.DATABASE_POOL_MAX_SIZE,
+    )
+    # Another caller may have created the pool while this one was connecting.
+    existing = _pools.setdefault(database_url, pool)
+    if existing is not pool:
+        await pool.close()
+    return existing
+
+
+async def close_database_pools() -> None:
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
@@ -1,34 +1,125 @@
 from app.clients.jsonplaceholder_client import JsonPlaceholderClient
+from app.clients.knowledge_base_client import KnowledgeBaseClient
 from app.clients.wikipedia_client import WikipediaClient
+from app.clients.wikivoyage_client import WikivoyageClient
+from app.core.config import settings
+from app.core.graph_registry import graph_registry
+from app.core.http_cache import (
+    JSONPLACEHOLDER_CACHE_SETTINGS,
+    ConditionalResponseCache,
+    build_jsonplaceholder_cache,
+)
+from app.core.protocols import SearchClientProtocol
 from app.orchestration.jsonplaceholder_orchestrator import JsonPlaceholderOrchestrator
 from app.orchestration.langgraph_orchestrator import LangGraphOrchestrator
 from app.orchestration.llm_orchestrator import LLMOrchestrator
 from app.orchestration.search_orchestrator import SearchOrchestrator
 from app.services.langgraph_support_service import LangGraphSupportService
 from app.services.llm_service import LLMService
+from app.services.search_cache import SEARCH_CACHE_SETTINGS, SearchCache, build_search_cache
 from app.services.search_service import SearchService
 
+SEARCH_SOURCE_CLIENTS: dict[str, type[SearchClientProtocol]] = {
+    "knowledge_base": KnowledgeBaseClient,
+    "wikipedia": WikipediaClient,
+    "wikivoyage": WikivoyageClient,
+}
+
+
+# Settings the search orchestrator (sources, deadline, cache) is built from.
+SEARCH_SETTINGS = (
+    "SEARCH_SOURCES",
+    "SEARCH_DEADLINE_SECONDS",
+    "KNOWLEDGE_BASE_INDEX_PATH",
+    "KNOWLEDGE_BASE_RESULT_LIMIT",
+    *SEARCH_CACHE_SETTINGS,
+)
+
+# Dependencies return app-scoped objects from `graph_registry`: built on first use, shared
+# by every request, and closed by the app lifespan. Clients borrow the shared HTTP pool
+# (app.core.http_client), so no route opens connections of its own.
+
 
 def get_wikipedia_client() -> WikipediaClient:
     return WikipediaClient()
 
 
+def get_jsonplaceholder_cache() -> ConditionalResponseCache | None:
+    return graph_registry.get(
+        "jsonplaceholder_cache",
+        lambda: build_jsonplaceholder_cache(settings),
+        depends_on=JSONPLACEHOLDER_CACHE_SETTINGS,
+    )
+
+
 def get_jsonplaceholder_client() -> JsonPlaceholderClient:
-    return JsonPlaceholderClient()
+    return JsonPlaceholderClient(cache=get_jsonplaceholder_cache())
 
 
-def get_search_orchestrator() -> SearchOrchestrator:
-    service = SearchService(wikipedia_client=get_wikipedia_client())
+def get_search_cache() -> SearchCache | None:
+    return graph_registry.get(
+        "search_cache",
+        lambda: build_search_cache(settings),
+        depends_on=SEARCH_CACHE_SETTINGS,
+    )
+
+
+def get_search_sources() -> list[SearchClientProtocol]:
+    sources: list[SearchClientProtocol] = []
+    for name in settings.search_source_list():
+        client_class = SEARCH_SOURCE_CLIENTS.get(name)
+        if client_class is None:
+            raise ValueError(
+                f"Unknown SEARCH_SOURCES entry {name!r}. "
+                f"Supported: {sorted(SEARCH_SOURCE_CLIENTS)}"
+            )
+        sources.append(client_class())
+    return sources
+
+
+def _build_search_orchestrator() -> SearchOrchestrator:
+    service = SearchService(
+        sources=get_search_sources(),
+        cache=get_search_cache(),
+        deadline_seconds=settings.SEARCH_DEADLINE_SECONDS,
+    )
     return SearchOrchestrator(search_service=service)
 
 
+def get_search_orchestrator() -> SearchOrchestrator:
+    return graph_registry.get(
+        "search_orchestrator",
+        _build_search_orchestrator,
+        depends_on=SEARCH_SETTINGS,
+    )
+
+
 def get_jsonplaceholder_orchestrator() -> JsonPlaceholderOrchestrator:
-    return JsonPlaceholderOrchestrator(client=get_jsonplaceholder_client())
+    return graph_registry.get(
+        "jsonplaceholder_orchestrator",
+        lambda: JsonPlaceholderOrchestrator(client=get_jsonplaceholder_client()),
+        depends_on=JSONPLACEHOLDER_CACHE_SETTINGS,
+    )
 
 
 def get_llm_orchestrator() -> LLMOrchestrator:
-    return LLMOrchestrator(llm_service=LLMService())
+    return graph_registry.get(
+        "llm_orchestrator",
+        lambda: LLMOrchestrator(llm_service=LLMService()),
+    )
+
+
+def get_langgraph_service() -> LangGraphSupportService:
+    return graph_registry.get(
+        "langgraph_support",
+        LangGraphSupportService,
+        depends_on=LangGraphSupportService.settings_dependencies,
+    )
 
 
 def get_langgraph_orchestrator() -> LangGraphOrchestrator:
-    return LangGraphOrchestrator(service=LangGraphSupportService())
+    return graph_registry.get(
+        "langgraph_orchestrator",
+        lambda: LangGraphOrchestrator(service=get_langgraph_service()),
+        depends_on=LangGraphSupportService.settings_dependencies,
+    )
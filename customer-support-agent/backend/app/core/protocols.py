@@ -2,5 +2,12 @@ from typing import Protocol
 
 
 class SearchClientProtocol(Protocol):
-    def search(self, query: str) -> list[dict[str, str]]:
+    """A federated search source; `name` is reported as each result's `source`.
+
+    Sources may set `cacheable = False` to bypass the search cache (e.g. local indexes).
+    """
+
+    name: str
+
+    async def search(self, query: str) -> list[dict[str, str]]:
         ...
@@ -1,3 +1,7 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -5,11 +9,42 @@ from app.api.routes.health import router as health_router
 from app.api.routes.jsonplaceholder import router as jsonplaceholder_router
 from app.api.routes.langgraph import router as langgraph_router
 from app.api.routes.llm import router as llm_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.search import router as search_router
 from app.core.config import settings
+from app.core.database import close_database_pools
 from app.core.exception_handlers import register_exception_handlers
+from app.core.graph_registry import graph_registry
+from app.core.http_client import close_http_client, get_http_client
+from app.core.redis_client import close_redis_clients
+from app.core.tracing import TracingMiddleware, tracer
+from app.core.warmup import warm_up_imports
+from app.services.llm.factory import close_llm_providers
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # App-scoped resources: the shared HTTP pool is opened here; services, caches and
+    # orchestrators are built on first use by `graph_registry` (see app.core.deps).
+    get_http_client()
+    warmup = None
+    if settings.STARTUP_IMPORT_WARMUP:
+        warmup = asyncio.create_task(asyncio.to_thread(warm_up_imports))
+    yield
+    if warmup is not None:
+        # The import thread cannot be interrupted; let it finish before tearing down.
+        await warmup
+    # Flush write-behind session turns and stop background refreshes while their
+    # connections are still open.
+    await graph_registry.aclose()
+    await close_http_client()
+    close_llm_providers()
+    await close_redis_clients()
+    await close_database_pools()
+    tracer.shutdown()
 
-app = FastAPI(title="customer-support-agent API")
+
+app = FastAPI(title="customer-support-agent API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,9 +54,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(TracingMiddleware)
+
 register_exception_handlers(app)
 
 app.include_router(health_router, prefix="/api", tags=["health"])
+app.include_router(metrics_router, prefix="/api", tags=["metrics"])
 app.include_router(search_router, prefix="/api/search", tags=["wiki_search"])
 app.include_router(jsonplaceholder_router, prefix="/api/test/jsonplaceholder", tags=["jsonplaceholder"])
 app.include_router(llm_router, prefix="/api/llm", tags=["llm"])
@@ -1,4 +1,16 @@
-from app.api.schemas.langgraph import LangGraphSupportResponse
+import json
+from collections.abc import AsyncIterator
+
+from app.api.schemas.langgraph import (
+    LangGraphCacheStatsResponse,
+    LangGraphSessionResponse,
+    LangGraphSupportBatchError,
+    LangGraphSupportBatchItem,
+    LangGraphSupportBatchRequest,
+    LangGraphSupportResponse,
+    LangGraphTriageStatsResponse,
+)
+from app.core.tracing import traced
 from app.services.langgraph_support_service import LangGraphSupportService
 
 
@@ -6,6 +18,61 @@ class LangGraphOrchestrator:
     def __init__(self, service: LangGraphSupportService) -> None:
         self.service = service
 
-    def process_support_message(self, query: str) -> LangGraphSupportResponse:
-        payload = self.service.run(query)
-        return LangGraphSupportResponse(**payload)
+    @traced("LangGraphOrchestrator.process_support_message")
+    async def process_support_message(
+        self,
+        query: str,
+        pipeline_mode: str | None = None,
+        tenant_id: str | None = None,
+    ) -> LangGraphSupportResponse:
+        payload = await self.service.run(query, pipeline_mode=pipeline_mode, tenant_id=tenant_id)
+        return LangGraphSupportResponse.model_validate(payload)
+
+    async def stream_support_message(
+        self,
+        query: str,
+        session_id: str | None = None,
+        tenant_id: str | None = None,
+    ) -> AsyncIterator[str]:
+        events = self.service.run_stream(query, session_id=session_id, tenant_id=tenant_id)
+        async for event, data in events:
+            if event == "done":
+                data = LangGraphSupportResponse.model_validate(data).model_dump()
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    async def process_support_batch(
+        self,
+        request: LangGraphSupportBatchRequest,
+    ) -> AsyncIterator[str]:
+        results = self.service.run_batch(
+            request.queries,
+            concurrency=request.concurrency,
+            pack_categorization=request.pack_categorization,
+            pipeline_mode=request.pipeline_mode,
+            tenant_id=request.tenant_id,
+        )
+        async for index, result in results:
+            line: LangGraphSupportBatchItem | LangGraphSupportBatchError
+            if isinstance(result, Exception):
+                line = LangGraphSupportBatchError(
+                    index=index,
+                    query=request.queries[index],
+                    error=str(result),
+                )
+            else:
+                line = LangGraphSupportBatchItem.model_validate({**result, "index": index})
+            yield line.model_dump_json() + "\n"
+
+    async def session_history(self, session_id: str, limit: int) -> LangGraphSessionResponse:
+        return LangGraphSessionResponse(**await self.service.session_history(session_id, limit))
+
+    def cache_stats(self) -> LangGraphCacheStatsResponse:
+        return LangGraphCacheStatsResponse(caches=self.service.cache_stats())
+
+    def triage_stats(self) -> LangGraphTriageStatsResponse:
+        return LangGraphTriageStatsResponse(
+            categorization=self.service.triage_stats(),
+            routing=self.service.routing_stats(),
+            scheduling=self.service.scheduling_stats(),
+            responses=self.service.response_stats(),
+        )
@@ -1,4 +1,6 @@
-from app.api.schemas.search import SearchResponse, SearchResult
+from dataclasses import asdict
+
+from app.api.schemas.search import SearchResponse, SearchResult, SearchSourceStatus
 from app.services.search_service import SearchService
 
 
@@ -6,9 +8,13 @@ class SearchOrchestrator:
     def __init__(self, search_service: SearchService) -> None:
         self.search_service = search_service
 
-    async def search(self, query: str) -> SearchResponse:
-        results = await self.search_service.search(query)
-        return SearchResponse(
+    async def search(self, query: str) -> tuple[SearchResponse, dict[str, str]]:
+        """Search results plus the HTTP cache headers describing how they were served."""
+        search = await self.search_service.federated_search(query)
+        response = SearchResponse(
             query=query,
-            results=[SearchResult(**item) for item in results],
+            results=[SearchResult(**item) for item in search.results],
+            sources=[SearchSourceStatus(**asdict(outcome)) for outcome in search.sources],
+            partial=search.partial,
         )
+        return response, self.search_service.cache_headers(search)
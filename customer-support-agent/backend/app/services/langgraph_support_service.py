@@ -1,18 +1,101 @@
 from __future__ import annotations
 
-from typing import TypedDict
+import asyncio
+import contextlib
+import json
+import random
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, TypedDict
 
 from app.core.config import settings
+from app.core.metrics import (
+    LLM_ERRORS,
+    LLM_FALLBACKS,
+    LLM_REQUEST_SECONDS,
+    current_node,
+    metrics_registry,
+    record_usage,
+    timed_node,
+)
+from app.core.tracing import traced, tracer
+from app.services.llm.base import StreamEvent
+from app.services.llm_service import LLMService
+from app.services.support.blocking_stream import iterate_in_thread
+from app.services.support.circuit_breaker import CircuitBreaker
+from app.services.support.completion_cache import CompletionCache, build_completion_cache
+from app.services.support.keyword_matcher import KeywordMatcher
+from app.services.support.knowledge_base import open_knowledge_base
+from app.services.support.llm_router import build_llm_router
+from app.services.support.priority_scheduler import PriorityScheduler, current_priority
+from app.services.support.semantic_cache import build_semantic_cache
+from app.services.support.session_store import (
+    SessionStore,
+    SessionTurn,
+    build_session_store,
+)
+
+SUPPORT_CATEGORIES = ("billing", "technical", "account", "orders", "general")
+_PASSAGE_CHARS = 600  # Per knowledge-base passage in the respond prompt
+_STREAM_CACHE_SCOPE = "graph:*"  # Streams always run the per-node pipeline, uncategorized
 
 
 class SupportState(TypedDict):
     query: str
     category: str
+    category_source: str  # provided | rules | llm | rules_fallback
     analysis: str
+    passages: list[dict[str, str]]  # Knowledge-base articles given to the respond prompt
     response: str
+    response_source: str  # knowledge_base | llm | rules_fallback
+    response_truncated: bool  # Stream cut off by a provider error after some text was sent
 
 
 class LangGraphSupportService:
+    # Settings that change the clients or compiled graph; see app.core.graph_registry.
+    settings_dependencies: tuple[str, ...] = (
+        "LLM_PROVIDER",
+        "LLM_MODEL",
+        "OPENAI_API_KEY",
+        "GEMINI_API_KEY",
+        "LLM_HTTP_MAX_CONNECTIONS",
+        "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+        "LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+        "LLM_HTTP_TIMEOUT_SECONDS",
+        "LLM_ROUTING_MODE",
+        "LLM_HEDGE_PERCENTILE",
+        "LLM_HEDGE_DEFAULT_DELAY_SECONDS",
+        "LLM_HEDGE_MIN_SAMPLES",
+        "LLM_BREAKER_FAILURE_THRESHOLD",
+        "LLM_BREAKER_RESET_SECONDS",
+        "LLM_TIMEOUT_PERCENTILE",
+        "LLM_TIMEOUT_MULTIPLIER",
+        "LLM_TIMEOUT_MIN_SECONDS",
+        "LLM_TIMEOUT_MAX_SECONDS",
+        "LLM_RATE_LIMIT_BACKEND",
+        "LLM_RATE_LIMIT_RPM",
+        "LLM_RATE_LIMIT_TPM",
+        "LLM_RATE_LIMIT_MAX_WAIT_SECONDS",
+        "LLM_RATE_LIMIT_COMPLETION_TOKENS",
+        "SUPPORT_LLM_MAX_CONCURRENCY",
+        "SUPPORT_PRIORITY_AGING_SECONDS",
+        "SEMANTIC_CACHE_BACKEND",
+        "SEMANTIC_CACHE_THRESHOLD",
+        "SEMANTIC_CACHE_MAX_ENTRIES",
+        "SEMANTIC_CACHE_TTL_SECONDS",
+        "COMPLETION_CACHE_BACKEND",
+        "COMPLETION_CACHE_MAX_ENTRIES",
+        "COMPLETION_CACHE_TTL_SECONDS",
+        "COMPLETION_CACHE_NODE_TTLS",
+        "SUPPORT_TAXONOMY_PATH",
+        "KNOWLEDGE_BASE_INDEX_PATH",
+        "REDIS_URL",
+        "DATABASE_URL",
+        "SESSION_FLUSH_INTERVAL_SECONDS",
+        "SESSION_FLUSH_BATCH_SIZE",
+    )
+
     def __init__(self) -> None:
         # Hybrid strategy:
         # 1) Prefer LLM-driven node behavior when a provider key is available.
@@ -22,7 +105,43 @@ class LangGraphSupportService:
         self._openai_client = None
         self._gemini_model = None
         self._initialize_llm_clients()
+        # Calls go through a lambda so tests can swap `_call_backend` after construction.
+        self._router = build_llm_router(
+            settings,
+            lambda backend, prompt, json_mode: self._observed_call(backend, prompt, json_mode),
+            limit_key=lambda backend: f"{backend}:{self._default_model_for(backend)}",
+        )
+        self._fallback_backends = self._initialize_fallback_backends()
+        self._scheduler = (
+            PriorityScheduler(
+                max_concurrency=settings.SUPPORT_LLM_MAX_CONCURRENCY,
+                aging_seconds=settings.SUPPORT_PRIORITY_AGING_SECONDS,
+            )
+            if settings.SUPPORT_LLM_MAX_CONCURRENCY > 0
+            else None
+        )
         self._graph = self._build_graph()
+        self._semantic_cache = build_semantic_cache(settings)
+        self._completion_cache = build_completion_cache(settings)
+        self._keywords = KeywordMatcher.from_file(settings.SUPPORT_TAXONOMY_PATH or None)
+        self._knowledge_base = (
+            open_knowledge_base(settings.KNOWLEDGE_BASE_INDEX_PATH)
+            if settings.KNOWLEDGE_BASE_INDEX_PATH
+            else None
+        )
+        self._triage_counts: Counter[str] = Counter()
+        self._response_counts: Counter[str] = Counter()
+        self._audit_tasks: set[asyncio.Task] = set()
+        self._random = random.random
+        self._llm_service = LLMService()
+        self._session_store = build_session_store(settings)
+        # Replaces the previous service's gauge when the registry rebuilds this service.
+        metrics_registry.gauge_callback(
+            "support_cache_stat",
+            "Semantic and completion cache counters, read at scrape time.",
+            ("cache", "stat"),
+            self._cache_metric_samples,
+        )
 
     def _resolve_llm_backend(self) -> str:
         provider = (settings.LLM_PROVIDER or "openai").strip().lower()
@@ -40,47 +159,145 @@ class LangGraphSupportService:
         return "none"
 
     def _initialize_llm_clients(self) -> None:
-        if self._llm_backend == "openai":
+        if self._llm_backend != "none" and not self._initialize_client(self._llm_backend):
+            self._llm_backend = "none"
+
+    def _initialize_fallback_backends(self) -> list[str]:
+        # Failover and hedging need the other provider's client as well.
+        if self._router.mode == "single" or self._llm_backend == "none":
+            return []
+        keys = {"openai": settings.OPENAI_API_KEY, "gemini": settings.GEMINI_API_KEY}
+        return [
+            backend
+            for backend, key in keys.items()
+            if backend != self._llm_backend and key and self._initialize_client(backend)
+        ]
+
+    def _initialize_client(self, backend: str) -> bool:
+        # Async clients let a single worker keep many support requests in flight while
+        # they wait on the provider, instead of parking one threadpool worker per request.
+        if backend == "openai":
             try:
-                from openai import OpenAI
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+                from app.services.llm.openai_provider import http_limits
             except ImportError:
-                self._llm_backend = "none"
-                return
-            self._openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            return
+                return False
+            self._openai_client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                timeout=settings.LLM_HTTP_TIMEOUT_SECONDS,
+                http_client=DefaultAsyncHttpxClient(limits=http_limits()),
+            )
+            return True
 
-        if self._llm_backend == "gemini":
+        if backend == "gemini":
             try:
                 import google.generativeai as genai
             except ImportError:
-                self._llm_backend = "none"
-                return
+                return False
             genai.configure(api_key=settings.GEMINI_API_KEY)
             self._gemini_model = genai.GenerativeModel(model_name=self._default_model_for("gemini"))
+            return True
+
+        return False
 
     def _default_model_for(self, backend: str) -> str:
-        if settings.LLM_MODEL:
+        # LLM_MODEL names a model of the primary provider; fallbacks use their defaults.
+        if settings.LLM_MODEL and backend == self._llm_backend:
             return settings.LLM_MODEL
         if backend == "gemini":
             return "gemini-2.0-flash-exp"
         return "gpt-4o-mini"
 
-    def _complete(self, prompt: str) -> str | None:
+    async def _complete(
+        self,
+        prompt: str,
+        json_mode: bool = False,
+        node: str = "default",
+    ) -> str | None:
+        if self._llm_backend == "none":
+            return None
+        # Provider calls below (including hedged tasks, which copy the context) label their
+        # metrics with this node.
+        token = current_node.set(node)
         try:
-            if self._llm_backend == "openai" and self._openai_client is not None:
-                response = self._openai_client.responses.create(
-                    model=self._default_model_for("openai"),
-                    input=prompt,
+            if self._completion_cache is None:
+                text = await self._complete_uncached(prompt, json_mode, node)
+            else:
+                key = CompletionCache.key(
+                    self._llm_backend,
+                    self._default_model_for(self._llm_backend),
+                    prompt,
+                    json_mode,
                 )
-                text = (response.output_text or "").strip()
-                return text or None
-
-            if self._llm_backend == "gemini" and self._gemini_model is not None:
-                response = self._gemini_model.generate_content(prompt)
-                text = (response.text or "").strip()
-                return text or None
-        except Exception:
-            return None
+                text = await self._completion_cache.get_or_compute(
+                    key,
+                    node,
+                    lambda: self._complete_uncached(prompt, json_mode, node),
+                )
+        finally:
+            current_node.reset(token)
+        if text is None:
+            LLM_FALLBACKS.inc(node, self._llm_backend)
+        return text
+
+    async def _complete_uncached(
+        self,
+        prompt: str,
+        json_mode: bool = False,
+        node: str = "default",
+    ) -> str | None:
+        backends = [self._llm_backend, *self._fallback_backends]
+        if self._scheduler is None:
+            return await self._router.complete(backends, prompt, json_mode, node)
+        # Only real provider calls take a slot; completion-cache hits never queue.
+        async with self._scheduler.slot():
+            return await self._router.complete(backends, prompt, json_mode, node)
+
+    def priority_for(self, query: str, tenant_id: str | None = None) -> str:
+        if self._keywords.count(query)["urgent"]:
+            return "urgent"
+        if tenant_id and tenant_id in settings.premium_tenant_set():
+            return "premium"
+        return "routine"
+
+    async def _observed_call(self, backend: str, prompt: str, json_mode: bool) -> str | None:
+        labels = (current_node.get(), backend, self._default_model_for(backend))
+        attributes = {"llm.node": labels[0], "llm.provider": backend, "llm.model": labels[2]}
+        with tracer.span("llm.call", attributes, kind="client") as span:
+            start = time.perf_counter()
+            try:
+                text = await self._call_backend(backend, prompt, json_mode)
+            except Exception:
+                LLM_ERRORS.inc(*labels)
+                raise
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, *labels)
+            span.set_attribute("llm.empty", text is None)
+            return text
+
+    async def _call_backend(self, backend: str, prompt: str, json_mode: bool = False) -> str | None:
+        if backend == "openai" and self._openai_client is not None:
+            extra: dict = {"text": {"format": {"type": "json_object"}}} if json_mode else {}
+            response = await self._openai_client.responses.create(
+                model=self._default_model_for("openai"),
+                input=prompt,
+                **extra,
+            )
+            usage = getattr(response, "usage", None)
+            record_usage(current_node.get(), backend, self._default_model_for(backend), usage)
+            text = (response.output_text or "").strip()
+            return text or None
+
+        if backend == "gemini" and self._gemini_model is not None:
+            generation_config = {"response_mime_type": "application/json"} if json_mode else None
+            response = await self._gemini_model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+            )
+            usage = getattr(response, "usage_metadata", None)
+            record_usage(current_node.get(), backend, self._default_model_for(backend), usage)
+            text = (response.text or "").strip()
+            return text or None
 
         return None
 
@@ -93,54 +310,600 @@ class LangGraphSupportService:
         graph = StateGraph(SupportState)
         graph.add_node("categorize", self._categorize_node)
         graph.add_node("analyze", self._analyze_node)
+        graph.add_node("retrieve", self._retrieve_node)
         graph.add_node("respond", self._respond_node)
 
         graph.add_edge(START, "categorize")
         graph.add_edge("categorize", "analyze")
-        graph.add_edge("analyze", "respond")
+        graph.add_edge("analyze", "retrieve")
+        graph.add_conditional_edges(
+            "retrieve",
+            lambda state: END if state["response_source"] == "knowledge_base" else "respond",
+            ["respond", END],
+        )
         graph.add_edge("respond", END)
 
         return graph.compile()
 
-    def run(self, query: str) -> dict[str, str]:
-        state: SupportState = {
+    @traced("LangGraphSupportService.run")
+    async def run(
+        self,
+        query: str,
+        pipeline_mode: str | None = None,
+        category: str | None = None,
+        tenant_id: str | None = None,
+    ) -> dict[str, str | bool]:
+        token = current_priority.set(self.priority_for(query, tenant_id))
+        try:
+            return await self._run(query, pipeline_mode, category)
+        finally:
+            current_priority.reset(token)
+
+    async def _run(
+        self,
+        query: str,
+        pipeline_mode: str | None,
+        category: str | None,
+    ) -> dict[str, str | bool]:
+        # Answers depend on the requested mode and on a caller-provided category, so only
+        # entries stored for the same pair are reused.
+        scope = f"{self._pipeline_mode(pipeline_mode)}:{category or '*'}"
+        if self._semantic_cache is not None:
+            cached = await self._semantic_cache.lookup(query, scope)
+            if cached is not None:
+                return {**cached, "query": query, "cache_hit": True}
+
+        result: dict[str, str | bool] = {
+            **await self._run_pipeline(query, pipeline_mode, category),
+            "cache_hit": False,
+        }
+        # Only LLM answers are cached; a rules fallback would outlive the outage behind it.
+        if self._semantic_cache is not None and result["response_source"] == "llm":
+            await self._semantic_cache.store(query, result, scope)
+        return result
+
+    async def run_stream(
+        self,
+        query: str,
+        session_id: str | None = None,
+        tenant_id: str | None = None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Yield `(event, data)` pairs: `category` and `analysis` as those nodes finish, the
+        response as `delta` chunks, then `done` with the full result.
+
+        Streaming always runs the per-node pipeline; a fused call cannot report the category
+        before the response is complete. With a `session_id`, earlier turns are sent to the
+        provider and the semantic cache is bypassed, since answers depend on the history.
+        """
+        token = current_priority.set(self.priority_for(query, tenant_id))
+        try:
+            async for item in self._run_stream(query, session_id):
+                yield item
+        finally:
+            # The consumer may close the stream from another context; nothing to restore then.
+            with contextlib.suppress(ValueError):
+                current_priority.reset(token)
+
+    async def _run_stream(
+        self,
+        query: str,
+        session_id: str | None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        store = self._session_store if session_id is not None else None
+        if self._semantic_cache is not None and store is None:
+            cached = await self._semantic_cache.lookup(query, _STREAM_CACHE_SCOPE)
+            if cached is not None:
+                hit = {**cached, "query": query, "cache_hit": True}
+                yield "category", {
+                    "category": hit["category"],
+                    "category_source": hit.get("category_source", "rules_fallback"),
+                }
+                yield "analysis", {"analysis": hit["analysis"]}
+                yield "delta", {"text": hit["response"]}
+                yield "done", hit
+                return
+
+        history: list[SessionTurn] = []
+        previous_response_id: str | None = None
+        if store is not None and session_id is not None:
+            history, previous_response_id = await self._load_session(store, session_id)
+
+        state = await self._categorize_node(self._initial_state(query))
+        yield "category", {
+            "category": state["category"],
+            "category_source": state["category_source"],
+        }
+        state = await self._analyze_node(state)
+        yield "analysis", {"analysis": state["analysis"]}
+        state = await self._retrieve_node(state)
+
+        chunks: list[str] = []
+        response_id: str | None = None
+        if state["response_source"] == "knowledge_base":
+            chunks.append(state["response"])
+            yield "delta", {"text": state["response"]}
+        else:
+            async for event in self._stream_response(state, history, previous_response_id):
+                if event.kind == "done":
+                    response_id = event.response_id
+                    continue
+                chunks.append(event.text or "")
+                yield "delta", {"text": event.text}
+
+        result: dict[str, Any] = {
             "query": query,
-            "category": "general",
+            "category": state["category"],
+            "analysis": state["analysis"],
+            "response": "".join(chunks),
+            "category_source": state["category_source"],
+            "response_source": state["response_source"],
+            "pipeline_mode": "graph",
+            "cache_hit": False,
+            "truncated": state["response_truncated"],
+        }
+        if store is not None and session_id is not None:
+            # Write-behind: buffered here, committed by the store's background flush.
+            store.append(SessionTurn(session_id, "user", query))
+            store.append(
+                SessionTurn(session_id, "assistant", result["response"], response_id)
+            )
+        elif (
+            self._semantic_cache is not None
+            and result["response_source"] == "llm"
+            and not result["truncated"]
+        ):
+            await self._semantic_cache.store(query, result, _STREAM_CACHE_SCOPE)
+        yield "done", result
+
+    async def _load_session(
+        self,
+        store: SessionStore,
+        session_id: str,
+    ) -> tuple[list[SessionTurn], str | None]:
+        # History is best-effort: a database outage degrades to a stateless reply.
+        try:
+            history = await store.recent(session_id, settings.SESSION_HISTORY_TURNS)
+            previous_response_id = await store.last_response_id(session_id)
+        except Exception:  # noqa: BLE001 - answered without history instead
+            return [], None
+        return history, previous_response_id
+
+    async def session_history(self, session_id: str, limit: int) -> dict[str, Any]:
+        if self._session_store is None:
+            return {"session_id": session_id, "last_response_id": None, "turns": []}
+        turns = await self._session_store.recent(session_id, limit)
+        return {
+            "session_id": session_id,
+            "last_response_id": await self._session_store.last_response_id(session_id),
+            "turns": [
+                {
+                    "role": turn.role,
+                    "content": turn.content,
+                    "response_id": turn.response_id,
+                    "created_at": turn.created_at,
+                }
+                for turn in turns
+            ],
+        }
+
+    async def _stream_response(
+        self,
+        state: SupportState,
+        history: Sequence[SessionTurn] = (),
+        previous_response_id: str | None = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream the response; sets `state["response_source"]` to the path that answered."""
+        # An open breaker means the provider is browning out; skip straight to the respond
+        # node, which takes the rules path without waiting on the provider.
+        breaker = self._router.breaker(self._llm_backend) if self._llm_backend != "none" else None
+        prompt = self._respond_prompt(
+            state["query"], state["category"], state["analysis"], state["passages"]
+        )
+        if breaker is not None and breaker.allow() and await self._admit_stream(breaker, prompt):
+            streamed = False
+            slot = self._scheduler.slot() if self._scheduler else contextlib.nullcontext()
+            events = iterate_in_thread(
+                lambda: self._stream_llm(prompt, history, previous_response_id)
+            )
+            try:
+                async with slot, contextlib.aclosing(events):
+                    async for event in events:
+                        streamed = streamed or event.kind == "delta"
+                        yield event
+            except Exception:  # noqa: BLE001 - any provider error takes the fallback below
+                # Before any text, fall through to the non-streaming respond node. After it,
+                # the client keeps the partial text, marked so it is never cached.
+                state["response_truncated"] = streamed
+                breaker.record_failure()
+            except BaseException:
+                # The client went away (cancellation or generator close): no verdict.
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+            if streamed:
+                state["response_source"] = "llm"
+                self._response_counts["llm"] += 1
+                return
+
+        responded = await self._respond_node(state)
+        state["response_source"] = responded["response_source"]
+        yield StreamEvent(kind="delta", text=responded["response"])
+
+    async def _admit_stream(self, breaker: CircuitBreaker, prompt: str) -> bool:
+        # Streams draw on the same per-provider budget as completions. When admission is
+        # refused the respond node takes over, which falls back to rules the same way.
+        try:
+            admitted = await self._router.admit(self._llm_backend, prompt)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        if not admitted:
+            breaker.release()
+        return admitted
+
+    def _stream_llm(
+        self,
+        prompt: str,
+        history: Sequence[SessionTurn] = (),
+        previous_response_id: str | None = None,
+    ) -> Iterator[StreamEvent]:
+        input_items = [{"role": "user", "content": prompt}]
+        if previous_response_id and self._llm_backend == "openai":
+            # The Responses API already holds the earlier turns server-side.
+            history = ()
+        else:
+            previous_response_id = None
+        input_items[:0] = [{"role": turn.role, "content": turn.content} for turn in history]
+
+        stream = self._llm_service.stream_chat(
+            model=self._default_model_for(self._llm_backend),
+            input_items=input_items,
+            previous_response_id=previous_response_id,
+            node="respond",
+            # LLM_PROVIDER may name a provider without credentials; stream on the backend
+            # `_resolve_llm_backend` picked instead.
+            provider_name=self._llm_backend,
+        )
+        with stream as events:
+            for event in events:
+                if event.kind == "done" or (event.kind == "delta" and event.text):
+                    yield event
+
+    async def run_batch(
+        self,
+        queries: Sequence[str],
+        concurrency: int | None = None,
+        pack_categorization: bool = False,
+        pipeline_mode: str | None = None,
+        tenant_id: str | None = None,
+    ) -> AsyncIterator[tuple[int, dict[str, str | bool] | Exception]]:
+        """Run queries with bounded concurrency, yielding `(index, result)` as each finishes."""
+        limit = max(1, concurrency or settings.SUPPORT_BATCH_CONCURRENCY)
+        semaphore = asyncio.Semaphore(limit)
+        categories: dict[int, str] = {}
+        if pack_categorization:
+            categories = await self._categorize_batch(queries, semaphore)
+
+        async def process(index: int, query: str) -> tuple[int, dict[str, str | bool] | Exception]:
+            async with semaphore:
+                try:
+                    result = await self.run(query, pipeline_mode, categories.get(index), tenant_id)
+                    return index, result
+                except Exception as exc:  # noqa: BLE001 - reported on that query's line
+                    return index, exc
+
+        tasks = [asyncio.create_task(process(index, query)) for index, query in enumerate(queries)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # The client may disconnect mid-stream; do not leave orphaned LLM calls running.
+            for task in tasks:
+                task.cancel()
+
+    async def _categorize_batch(
+        self,
+        queries: Sequence[str],
+        semaphore: asyncio.Semaphore,
+    ) -> dict[int, str]:
+        """Categorize many queries per LLM call. Missing or invalid labels are left out, so
+        those queries go through the normal categorize node."""
+        if self._llm_backend == "none":
+            return {}
+
+        size = max(1, settings.SUPPORT_BATCH_PACK_SIZE)
+        chunks = [
+            list(range(start, min(start + size, len(queries))))
+            for start in range(0, len(queries), size)
+        ]
+
+        async def categorize_chunk(indexes: list[int]) -> dict[int, str]:
+            numbered = "\n".join(
+                f"{position}. {queries[index]}" for position, index in enumerate(indexes, 1)
+            )
+            prompt = (
+                "Categorize each numbered customer query into exactly one label: "
+                f"{', '.join(SUPPORT_CATEGORIES)}. "
+                "Return only a JSON object mapping each query number to its label, "
+                'e.g. {"1": "billing"}.\n'
+                f"{numbered}"
+            )
+            async with semaphore:
+                raw = await self._complete(prompt, json_mode=True, node="categorize_batch")
+            labels = self._parse_json_object(raw) if raw else None
+            if labels is None:
+                return {}
+
+            resolved: dict[int, str] = {}
+            for position, index in enumerate(indexes, 1):
+                label = str(labels.get(str(position), "")).strip().lower()
+                if label in SUPPORT_CATEGORIES:
+                    resolved[index] = label
+            return resolved
+
+        categories: dict[int, str] = {}
+        for chunk_result in await asyncio.gather(*(categorize_chunk(chunk) for chunk in chunks)):
+            categories.update(chunk_result)
+        return categories
+
+    async def aclose(self) -> None:
+        for task in list(self._audit_tasks):
+            task.cancel()
+        await asyncio.gather(*self._audit_tasks, return_exceptions=True)
+        if self._session_store is not None:
+            await self._session_store.close()
+        if self._openai_client is not None:
+            await self._openai_client.close()
+
+    def triage_stats(self) -> dict[str, float | int]:
+        counts = self._triage_counts
+        audited = counts["audited"]
+        return {
+            "rules": counts["rules"],
+            "llm": counts["llm"],
+            "rules_fallback": counts["rules_fallback"],
+            "provided": counts["provided"],
+            # Cascade rule decisions that were not also sent to the LLM for auditing. A
+            # failed audit still cost a call, so attempts are subtracted, not results.
+            "llm_calls_saved": counts["rules"] - counts["audit_calls"],
+            "audit_calls": counts["audit_calls"],
+            "audited": audited,
+            "disagreements": counts["disagreements"],
+            "disagreement_rate": round(counts["disagreements"] / audited, 4) if audited else 0.0,
+        }
+
+    def response_stats(self) -> dict[str, float | int]:
+        counts = self._response_counts
+        total = counts["knowledge_base"] + counts["llm"] + counts["rules_fallback"]
+        return {
+            "knowledge_base": counts["knowledge_base"],
+            "llm": counts["llm"],
+            "rules_fallback": counts["rules_fallback"],
+            # Responses with knowledge-base passages in the respond prompt.
+            "grounded": counts["grounded"],
+            "llm_calls_saved": counts["knowledge_base"],
+            "knowledge_base_rate": round(counts["knowledge_base"] / total, 4) if total else 0.0,
+        }
+
+    def routing_stats(self) -> dict[str, float | int]:
+        return self._router.stats()
+
+    def scheduling_stats(self) -> dict[str, float | int]:
+        return self._scheduler.stats() if self._scheduler is not None else {}
+
+    def cache_stats(self) -> dict[str, dict[str, float | int]]:
+        stats: dict[str, dict[str, float | int]] = {}
+        if self._semantic_cache is not None:
+            stats["semantic"] = self._semantic_cache.stats()
+        if self._completion_cache is not None:
+            stats["completion"] = self._completion_cache.stats()
+        return stats
+
+    def _cache_metric_samples(self) -> list[tuple[tuple[str, str], float]]:
+        return [
+            ((cache, stat), value)
+            for cache, stats in self.cache_stats().items()
+            for stat, value in stats.items()
+        ]
+
+    @staticmethod
+    def _pipeline_mode(pipeline_mode: str | None) -> str:
+        return (pipeline_mode or settings.SUPPORT_PIPELINE_MODE or "graph").strip().lower()
+
+    async def _run_pipeline(
+        self,
+        query: str,
+        pipeline_mode: str | None,
+        category: str | None = None,
+    ) -> dict[str, str]:
+        mode = self._pipeline_mode(pipeline_mode)
+        # A caller-provided category means categorization already happened, so the fused
+        # call would only repeat it.
+        if mode == "fused" and category is None:
+            fused = await self._run_fused(query)
+            if fused is not None:
+                return fused
+        return await self._run_graph(query, category)
+
+    async def _run_fused(self, query: str) -> dict[str, str] | None:
+        # One structured-output call instead of three sequential round trips. Anything that
+        # does not validate returns None so the caller falls back to the per-node graph.
+        # Retrieval is local, so it runs first, as it does before the graph's respond node: a
+        # canonical article replaces the generated response and close matches ground it.
+        answer, passages = self._search_knowledge_base(query)
+        keys = (
+            f'- "category": one label from {", ".join(SUPPORT_CATEGORIES)}\n'
+            '- "analysis": a one-sentence support analysis focused on urgency and actionability\n'
+        )
+        if answer is None:
+            keys += (
+                '- "response": a concise, empathetic customer-support response with clear '
+                "next steps\n"
+            )
+        prompt = (
+            "You are a customer-support triage assistant. "
+            "Return a JSON object with exactly these keys:\n"
+            f"{keys}"
+            f"{self._articles_block(passages)}"
+            "Return only the JSON object.\n"
+            f"Query: {query}"
+        )
+        raw = await self._complete(prompt, json_mode=True, node="fused")
+        if not raw:
+            return None
+
+        parsed = self._parse_fused_output(raw, with_response=answer is None)
+        if parsed is None:
+            return None
+        self._triage_counts["llm"] += 1
+        if answer is not None:
+            parsed["response"] = answer["body"]
+            source = "knowledge_base"
+        else:
+            source = "llm"
+            if passages:
+                self._response_counts["grounded"] += 1
+        self._response_counts[source] += 1
+        return {
+            "query": query,
+            **parsed,
+            "category_source": "llm",
+            "response_source": source,
+            "pipeline_mode": "fused",
+        }
+
+    def _parse_json_object(self, raw: str) -> dict | None:
+        # Tolerate models that wrap the object in a markdown code fence.
+        start, end = raw.find("{"), raw.rfind("}")
+        if start == -1 or end < start:
+            return None
+        try:
+            data = json.loads(raw[start : end + 1])
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _parse_fused_output(
+        self,
+        raw: str,
+        with_response: bool = True,
+    ) -> dict[str, str] | None:
+        data = self._parse_json_object(raw)
+        if data is None:
+            return None
+
+        category = str(data.get("category", "")).strip().lower()
+        analysis = data.get("analysis")
+        if category not in SUPPORT_CATEGORIES:
+            return None
+        if not isinstance(analysis, str) or not analysis.strip():
+            return None
+        parsed = {"category": category, "analysis": analysis.strip()}
+        if with_response:
+            response = data.get("response")
+            if not isinstance(response, str) or not response.strip():
+                return None
+            parsed["response"] = response.strip()
+        return parsed
+
+    def _initial_state(self, query: str, category: str | None = None) -> SupportState:
+        return {
+            "query": query,
+            "category": category or "general",
+            "category_source": "provided" if category else "",
             "analysis": "",
+            "passages": [],
             "response": "",
+            "response_source": "",
+            "response_truncated": False,
         }
 
+    async def _run_graph(self, query: str, category: str | None = None) -> dict[str, str]:
+        state = self._initial_state(query, category)
+
         if self._graph is not None:
-            output = self._graph.invoke(state)
+            output = await self._graph.ainvoke(state)
             return {
                 "query": output["query"],
                 "category": output["category"],
                 "analysis": output["analysis"],
                 "response": output["response"],
+                "category_source": output["category_source"],
+                "response_source": output["response_source"],
+                "pipeline_mode": "graph",
             }
 
-        categorized = self._categorize_node(state)
-        analyzed = self._analyze_node(categorized)
-        responded = self._respond_node(analyzed)
+        categorized = await self._categorize_node(state)
+        analyzed = await self._analyze_node(categorized)
+        retrieved = await self._retrieve_node(analyzed)
+        responded = (
+            retrieved
+            if retrieved["response_source"] == "knowledge_base"
+            else await self._respond_node(retrieved)
+        )
         return {
             "query": responded["query"],
             "category": responded["category"],
             "analysis": responded["analysis"],
             "response": responded["response"],
+            "category_source": responded["category_source"],
+            "response_source": responded["response_source"],
+            "pipeline_mode": "graph",
         }
 
-    def _categorize_node(self, state: SupportState) -> SupportState:
-        category = self._categorize_with_llm(state["query"])
+    @timed_node("support", "categorize")
+    @traced("support.categorize")
+    async def _categorize_node(self, state: SupportState) -> SupportState:
+        if state["category_source"] == "provided":
+            self._triage_counts["provided"] += 1
+            return state
+
+        query = state["query"]
+        mode = (settings.SUPPORT_CATEGORIZE_MODE or "llm_first").strip().lower()
+        if mode == "cascade":
+            # Cheap tier first: a confident keyword match skips the LLM call entirely.
+            rules_category, confidence = self._score_with_rules(query)
+            if confidence >= settings.SUPPORT_CASCADE_THRESHOLD:
+                self._triage_counts["rules"] += 1
+                self._maybe_audit(query, rules_category)
+                return {**state, "category": rules_category, "category_source": "rules"}
+
+        category = await self._categorize_with_llm(query)
+        source = "llm"
         if category is None:
-            category = self._categorize_with_rules(state["query"])
+            category = self._categorize_with_rules(query)
+            source = "rules_fallback"
+        self._triage_counts[source] += 1
 
         return {
             **state,
             "category": category,
+            "category_source": source,
         }
 
-    def _analyze_node(self, state: SupportState) -> SupportState:
-        analysis = self._analyze_with_llm(state["query"], state["category"])
+    def _maybe_audit(self, query: str, rules_category: str) -> None:
+        # Sampled rule decisions are re-checked by the LLM in the background, so the
+        # disagreement rate can be measured without adding latency to the request.
+        if self._llm_backend == "none" or self._random() >= settings.SUPPORT_CASCADE_AUDIT_RATE:
+            return
+        self._triage_counts["audit_calls"] += 1
+        task = asyncio.create_task(self._audit_categorization(query, rules_category))
+        self._audit_tasks.add(task)
+        task.add_done_callback(self._audit_tasks.discard)
+
+    async def _audit_categorization(self, query: str, rules_category: str) -> None:
+        llm_category = await self._categorize_with_llm(query)
+        if llm_category is None:
+            return
+        self._triage_counts["audited"] += 1
+        if llm_category != rules_category:
+            self._triage_counts["disagreements"] += 1
+
+    @timed_node("support", "analyze")
+    @traced("support.analyze")
+    async def _analyze_node(self, state: SupportState) -> SupportState:
+        analysis = await self._analyze_with_llm(state["query"], state["category"])
         if analysis is None:
             analysis = self._analyze_with_rules(state["query"])
 
@@ -149,71 +912,157 @@ class LangGraphSupportService:
             "analysis": analysis,
         }
 
-    def _respond_node(self, state: SupportState) -> SupportState:
-        response = self._respond_with_llm(state["query"], state["category"], state["analysis"])
+    @timed_node("support", "retrieve")
+    @traced("support.retrieve")
+    async def _retrieve_node(self, state: SupportState) -> SupportState:
+        """Answer from a canonical help-center article when the match is confident enough;
+        otherwise keep the closest articles as passages for the respond prompt."""
+        answer, passages = self._search_knowledge_base(state["query"])
+        if answer is not None:
+            self._response_counts["knowledge_base"] += 1
+            return {
+                **state,
+                "response": answer["body"],
+                "response_source": "knowledge_base",
+            }
+
+        if passages:
+            self._response_counts["grounded"] += 1
+        return {**state, "passages": passages}
+
+    def _search_knowledge_base(
+        self,
+        query: str,
+    ) -> tuple[dict[str, str] | None, list[dict[str, str]]]:
+        """The canonical answer for `query`, if any, else the passages to ground a response."""
+        if self._knowledge_base is None:
+            return None, []
+
+        limit = max(1, settings.SUPPORT_KB_CONTEXT_PASSAGES)
+        ceiling = self._knowledge_base.score_ceiling(query)
+        matches = [
+            (score / ceiling, document)
+            for score, document in self._knowledge_base.search(query, limit)
+        ]
+        if matches and matches[0][0] >= settings.SUPPORT_KB_ANSWER_THRESHOLD:
+            return matches[0][1], []
+
+        passages = [
+            document
+            for confidence, document in matches[: settings.SUPPORT_KB_CONTEXT_PASSAGES]
+            if confidence >= settings.SUPPORT_KB_CONTEXT_THRESHOLD
+        ]
+        return None, passages
+
+    @timed_node("support", "respond")
+    @traced("support.respond")
+    async def _respond_node(self, state: SupportState) -> SupportState:
+        response = await self._respond_with_llm(
+            state["query"],
+            state["category"],
+            state["analysis"],
+            state["passages"],
+        )
+        source = "llm"
         if response is None:
             response = self._respond_with_rules(state["category"], state["analysis"])
+            source = "rules_fallback"
+        self._response_counts[source] += 1
 
         return {
             **state,
             "response": response,
+            "response_source": source,
         }
 
-    def _categorize_with_llm(self, query: str) -> str | None:
+    async def _categorize_with_llm(self, query: str) -> str | None:
         prompt = (
             "Categorize the customer query into exactly one label: "
             "billing, technical, account, orders, general. "
             "Return only the label.\n"
             f"Query: {query}"
         )
-        label = self._complete(prompt)
+        label = await self._complete(prompt, node="categorize")
         if not label:
             return None
 
         normalized = label.strip().lower()
-        allowed = ["billing", "technical", "account", "orders", "general"]
-        for item in allowed:
+        for item in SUPPORT_CATEGORIES:
             if item in normalized:
                 return item
         return None
 
-    def _analyze_with_llm(self, query: str, category: str) -> str | None:
+    async def _analyze_with_llm(self, query: str, category: str) -> str | None:
         prompt = (
             "Write a one-sentence support analysis for this customer query. "
             "Focus on urgency and actionability.\n"
             f"Category: {category}\n"
             f"Query: {query}"
         )
-        return self._complete(prompt)
+        return await self._complete(prompt, node="analyze")
 
-    def _respond_with_llm(self, query: str, category: str, analysis: str) -> str | None:
-        prompt = (
+    @staticmethod
+    def _articles_block(passages: Sequence[dict[str, str]]) -> str:
+        articles = "".join(
+            f"- {passage['title']} ({passage['url']}): {passage['body'][:_PASSAGE_CHARS]}\n"
+            for passage in passages
+        )
+        if not articles:
+            return ""
+        return f"Help-center articles (use where relevant, cite the URL):\n{articles}"
+
+    def _respond_prompt(
+        self,
+        query: str,
+        category: str,
+        analysis: str,
+        passages: Sequence[dict[str, str]] = (),
+    ) -> str:
+        return (
             "Write a concise, empathetic customer-support response with clear next steps.\n"
+            f"{self._articles_block(passages)}"
             f"Category: {category}\n"
             f"Analysis: {analysis}\n"
             f"Query: {query}"
         )
-        return self._complete(prompt)
+
+    async def _respond_with_llm(
+        self,
+        query: str,
+        category: str,
+        analysis: str,
+        passages: Sequence[dict[str, str]] = (),
+    ) -> str | None:
+        prompt = self._respond_prompt(query, category, analysis, passages)
+        return await self._complete(prompt, node="respond")
 
     def _categorize_with_rules(self, query: str) -> str:
-        text = query.lower()
-        if any(keyword in text for keyword in ["refund", "charge", "billing", "invoice"]):
-            return "billing"
-        if any(keyword in text for keyword in ["error", "bug", "not working", "crash"]):
-            return "technical"
-        if any(keyword in text for keyword in ["login", "password", "account", "profile"]):
-            return "account"
-        if any(keyword in text for keyword in ["delivery", "shipping", "order", "tracking"]):
-            return "orders"
-        return "general"
+        return self._score_with_rules(query)[0]
+
+    def _score_with_rules(self, query: str) -> tuple[str, float]:
+        """Return the rule category and a 0..1 confidence.
+
+        Confidence grows with the number of hits for the winning category (1 hit: 0.75,
+        2: 0.875, ...) and is scaled by its share of all category hits, so a query that
+        mentions both a refund and a login error scores low.
+        """
+        hits = self._keywords.count(query)
+        ranked = [(hits[category], category) for category in self._keywords.categories]
+        total = sum(count for count, _ in ranked)
+        if total == 0:
+            return "general", 0.0
+
+        # max() keeps the first of equal counts, so taxonomy order still breaks ties.
+        top_hits, category = max(ranked, key=lambda item: item[0])
+        strength = 1.0 - 0.5 ** (top_hits + 1)
+        return category, round(strength * top_hits / total, 4)
 
     def _analyze_with_rules(self, query: str) -> str:
-        text = query.lower()
-        urgent = any(keyword in text for keyword in ["urgent", "asap", "immediately", "angry"])
+        urgent = self._keywords.count(query)["urgent"] > 0
 
         if urgent:
             return "High-priority request. Respond with urgency and offer immediate escalation."
-        if len(text) < 30:
+        if len(query) < 30:
             return "Low-context request. Ask clarifying questions before final resolution."
         return "Standard support request. Provide clear next steps and expected turnaround."
 
@@ -1,4 +1,11 @@
 from app.services.llm.base import LLMChatStream, LLMProvider, StreamEvent
-from app.services.llm.factory import get_llm_provider, register_provider
+from app.services.llm.factory import get_llm_provider, register_provider, reset_llm_providers
 
-__all__ = ["LLMProvider", "LLMChatStream", "StreamEvent", "get_llm_provider", "register_provider"]
+__all__ = [
+    "LLMProvider",
+    "LLMChatStream",
+    "StreamEvent",
+    "get_llm_provider",
+    "register_provider",
+    "reset_llm_providers",
+]
@@ -1,32 +1,109 @@
-"""Provider factory resolved via LLM_PROVIDER in settings."""
+"""Provider factory resolved via LLM_PROVIDER in settings.
+
+Provider modules import their SDKs (`openai`, `google.generativeai`) at module level, and
+those take most of the app's import time, so built-in providers are registered by import
+path and only imported when first selected (or by the startup warmup, app.core.warmup).
+"""
+import importlib
+import importlib.util
+import threading
+
 from app.core.config import settings
 from app.services.llm.base import LLMProvider
-from app.services.llm.openai_provider import OpenAIProvider
 
-try:
-    from app.services.llm.gemini_provider import GeminiProvider
+# Built-in providers as "module:Class"; resolved to the class on first use.
+_registry: dict[str, type[LLMProvider] | str] = {
+    "openai": "app.services.llm.openai_provider:OpenAIProvider",
+}
 
-    _GEMINI_AVAILABLE = True
-except ImportError:
-    _GEMINI_AVAILABLE = False
+if importlib.util.find_spec("google.generativeai") is not None:
+    _registry["gemini"] = "app.services.llm.gemini_provider:GeminiProvider"
 
-_registry: dict[str, type[LLMProvider]] = {
-    "openai": OpenAIProvider,
-}
+# Settings read when a provider is constructed; a change rebuilds the cached instance.
+PROVIDER_SETTINGS = (
+    "OPENAI_API_KEY",
+    "GEMINI_API_KEY",
+    "LLM_HTTP_MAX_CONNECTIONS",
+    "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+    "LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+    "LLM_HTTP_TIMEOUT_SECONDS",
+    "GEMINI_MODEL_CACHE_SIZE",
+)
 
-if _GEMINI_AVAILABLE:
-    _registry["gemini"] = GeminiProvider
+_instances: dict[str, tuple[tuple[object, ...], LLMProvider]] = {}
+_lock = threading.Lock()
 
 
-def get_llm_provider() -> LLMProvider:
-    key = (settings.LLM_PROVIDER or "openai").strip().lower()
+def _provider_key(name: str | None = None) -> str:
+    key = (name or settings.LLM_PROVIDER or "openai").strip().lower()
     if key not in _registry:
         raise ValueError(
-            f"Unknown LLM_PROVIDER={settings.LLM_PROVIDER!r}. "
+            f"Unknown LLM_PROVIDER={name or settings.LLM_PROVIDER!r}. "
             f"Supported: {list(_registry.keys())}"
         )
-    return _registry[key]()
+    return key
+
+
+def load_provider_class(key: str | None = None) -> type[LLMProvider]:
+    """Import the provider for `key` (default: LLM_PROVIDER) without constructing it."""
+    key = key or _provider_key()
+    provider = _registry[key]
+    if isinstance(provider, str):
+        module_name, _, class_name = provider.partition(":")
+        provider = getattr(importlib.import_module(module_name), class_name)
+        _registry[key] = provider
+    return provider
+
+
+def get_llm_provider(name: str | None = None) -> LLMProvider:
+    """Return the process-wide provider for `name` (default: LLM_PROVIDER).
+
+    Providers own SDK clients and their connection pools, so they are built once and
+    reused; rebuilding per call would pay a fresh TLS handshake on every request.
+    """
+    key = _provider_key(name)
+    fingerprint = tuple(getattr(settings, name) for name in PROVIDER_SETTINGS)
+    entry = _instances.get(key)
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
+
+    replaced: LLMProvider | None = None
+    with _lock:
+        entry = _instances.get(key)
+        if entry is None or entry[0] != fingerprint:
+            if entry is not None:
+                replaced = entry[1]
+            entry = (fingerprint, load_provider_class(key)())
+            _instances[key] = entry
+    # Settings changed (e.g. a rotated key): release the old client's connection pool.
+    if replaced is not None:
+        _close(replaced)
+    return entry[1]
 
 
 def register_provider(name: str, provider_class: type[LLMProvider]) -> None:
-    _registry[name.strip().lower()] = provider_class
+    key = name.strip().lower()
+    with _lock:
+        _registry[key] = provider_class
+        _instances.pop(key, None)
+
+
+def close_llm_providers() -> None:
+    """Close cached providers' SDK clients (app shutdown) and drop them."""
+    with _lock:
+        providers = [provider for _, provider in _instances.values()]
+        _instances.clear()
+    for provider in providers:
+        _close(provider)
+
+
+def _close(provider: LLMProvider) -> None:
+    close = getattr(provider, "close", None)
+    if close is not None:
+        close()
+
+
+def reset_llm_providers() -> None:
+    """Drop cached provider instances (tests, or after rotating credentials)."""
+    with _lock:
+        _instances.clear()
@@ -1,7 +1,53 @@
+import time
+from collections.abc import Iterator
+from typing import Any, Self
+
 from app.core.config import settings
+from app.core.metrics import (
+    LLM_ERRORS,
+    LLM_REQUEST_SECONDS,
+    LLM_TIME_TO_FIRST_TOKEN_SECONDS,
+    record_usage,
+)
+from app.services.llm.base import LLMChatStream, StreamEvent
 from app.services.llm.factory import get_llm_provider
 
 
+class _InstrumentedStream:
+    """Wraps a provider stream to record time-to-first-token, duration, tokens and errors."""
+
+    def __init__(self, stream: LLMChatStream, node: str, provider: str, model: str) -> None:
+        self._stream = stream
+        self._labels = (node, provider, model)
+
+    def __enter__(self) -> Self:
+        self._stream.__enter__()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self._stream.__exit__(*args)
+
+    def __iter__(self) -> Iterator[StreamEvent]:
+        start = time.perf_counter()
+        first_token = False
+        try:
+            for event in self._stream:
+                if event.kind == "delta" and event.text and not first_token:
+                    first_token = True
+                    LLM_TIME_TO_FIRST_TOKEN_SECONDS.observe(
+                        time.perf_counter() - start, *self._labels
+                    )
+                elif event.kind == "done":
+                    record_usage(*self._labels, event.usage)
+                yield event
+        except Exception:
+            LLM_ERRORS.inc(*self._labels)
+            raise
+        finally:
+            # Also covers streams that end without "done" or are closed early by the caller.
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, *self._labels)
+
+
 class LLMService:
     def get_runtime_config(self) -> dict[str, str | bool]:
         provider = (settings.LLM_PROVIDER or "openai").strip().lower()
@@ -15,12 +61,21 @@ class LLMService:
     def stream_chat(
         self,
         model: str,
-        input_items: list[dict],
+        input_items: list[dict[str, Any]],
         previous_response_id: str | None = None,
-    ):
-        provider = get_llm_provider()
-        return provider.stream_chat(
-            model=model,
-            input_items=input_items,
-            previous_response_id=previous_response_id,
-        )
+        node: str = "chat",
+        provider_name: str | None = None,
+    ) -> LLMChatStream:
+        """Open a chat stream on `provider_name`, or on LLM_PROVIDER when it is not given."""
+        provider = get_llm_provider(provider_name)
+        provider_name = (provider_name or settings.LLM_PROVIDER or "openai").strip().lower()
+        try:
+            stream = provider.stream_chat(
+                model=model,
+                input_items=input_items,
+                previous_response_id=previous_response_id,
+            )
+        except Exception:
+            LLM_ERRORS.inc(node, provider_name, model)
+            raise
+        return _InstrumentedStream(stream, node, provider_name, model)
@@ -1,12 +1,24 @@
-from openai import OpenAI
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Built on first use: importing `openai` is slow, and most requests never need it."""
+    from openai import OpenAI
+
+    return OpenAI(api_key=settings.OPENAI_API_KEY)
 
 
 def create_response_stream(model: str, input_items: list, previous_response_id: str | None = None):
-    return client.responses.stream(
+    return get_openai_client().responses.stream(
         model=model,
         input=input_items,
         previous_response_id=previous_response_id,
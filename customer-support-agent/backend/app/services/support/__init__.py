@@ -0,0 +1 @@
+"""Support workflow helpers (caching, classification, retrieval)."""
@@ -0,0 +1,67 @@
+"""Consume a blocking iterator (provider SDK streams) from the event loop.
+
+Each stream gets its own thread that pulls items and hands them to the loop through an
+`asyncio.Queue`: one thread per open stream instead of one executor hop per token, so
+the number of concurrent streams is not capped by the default executor's size.
+
+Closing the async iterator (client disconnect, cancellation) sets a flag the thread
+checks between items; the thread then closes the blocking iterator itself, so the
+provider connection is released without touching a generator that is mid-`next()`.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncGenerator, Callable, Iterator
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+async def iterate_in_thread(
+    open_iterator: Callable[[], Iterator[T]],
+) -> AsyncGenerator[T, None]:
+    """Yield the items of `open_iterator()`, which is created and consumed on a new thread.
+
+    Exceptions raised by the iterator are re-raised here, after the items before them.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[Any, BaseException | None]] = asyncio.Queue()
+    stopped = threading.Event()
+
+    def hand_over(item: Any, error: BaseException | None = None) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+        except RuntimeError:
+            stopped.set()  # The loop has closed; nobody is listening any more.
+
+    def pump() -> None:
+        try:
+            iterator = open_iterator()
+            try:
+                for item in iterator:
+                    if stopped.is_set():
+                        break
+                    hand_over(item)
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+        except BaseException as exc:  # noqa: BLE001 - re-raised on the event loop
+            hand_over(_END, exc)
+        else:
+            hand_over(_END)
+
+    threading.Thread(target=pump, name="blocking-stream", daemon=True).start()
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
@@ -0,0 +1,208 @@
+"""Exact-match cache for LLM completions issued by the support graph.
+
+Keys cover backend, model, output mode and the full prompt text, so only identical
+requests share an answer. Concurrent misses for the same key are coalesced into a single
+upstream call (single-flight).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import Settings
+
+
+class InMemoryCompletionStore:
+    """Size-bounded LRU with a per-entry expiry."""
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    async def set(self, key: str, text: str, ttl_seconds: float) -> None:
+        self._entries[key] = (self._clock() + ttl_seconds, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisCompletionStore:
+    """Shared store; Redis handles expiry and `maxmemory-policy` handles the size bound."""
+
+    def __init__(self, client: Any, prefix: str) -> None:
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> str | None:
+        raw = await self._client.get(f"{self._prefix}:{key}")
+        if raw is None:
+            return None
+        return raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
+
+    async def set(self, key: str, text: str, ttl_seconds: float) -> None:
+        await self._client.set(f"{self._prefix}:{key}", text, ex=max(1, int(ttl_seconds)))
+
+
+class _LeaderCancelled(Exception):
+    """Raised to followers when the caller running the shared completion is cancelled."""
+
+
+def parse_node_ttls(raw: str) -> dict[str, float]:
+    """Parse `"categorize=3600,respond=300"` into a node -> seconds mapping."""
+    ttls: dict[str, float] = {}
+    for item in raw.split(","):
+        node, sep, value = item.partition("=")
+        if not sep or not node.strip():
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = -1.0
+        if seconds < 0:
+            raise ValueError(
+                f"Invalid COMPLETION_CACHE_NODE_TTLS entry {item.strip()!r}: "
+                "expected node=seconds with a non-negative number"
+            )
+        ttls[node.strip().lower()] = seconds
+    return ttls
+
+
+class CompletionCache:
+    def __init__(
+        self,
+        store: InMemoryCompletionStore | RedisCompletionStore,
+        default_ttl_seconds: float,
+        node_ttls: dict[str, float] | None = None,
+    ) -> None:
+        self.store = store
+        self.default_ttl_seconds = default_ttl_seconds
+        self.node_ttls = node_ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._inflight: dict[str, asyncio.Future[str | None]] = {}
+
+    @staticmethod
+    def key(backend: str, model: str, prompt: str, json_mode: bool = False) -> str:
+        material = "\x1f".join([backend, model, "json" if json_mode else "text", prompt])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, node: str) -> float:
+        return self.node_ttls.get(node, self.default_ttl_seconds)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        node: str,
+        compute: Callable[[], Awaitable[str | None]],
+    ) -> str | None:
+        ttl = self.ttl_for(node)
+        if ttl <= 0:
+            return await compute()
+
+        while True:
+            pending = self._inflight.get(key)
+            if pending is None:
+                try:
+                    cached = await self.store.get(key)
+                except Exception:  # noqa: BLE001 - an unreachable store is treated as a miss
+                    self.errors += 1
+                    cached = None
+                if cached is not None:
+                    self.hits += 1
+                    return cached
+                # Re-check: another caller may have started the same request while we
+                # awaited the store.
+                pending = self._inflight.get(key)
+                if pending is None:
+                    break
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # The leader went away mid-call: the first follower back here takes over
+                # and the others coalesce onto it.
+                self.coalesced -= 1
+
+        self.misses += 1
+        future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting when the leader is cancelled; mark the exception retrieved.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = future
+        text: str | None = None
+        try:
+            text = await compute()
+        except asyncio.CancelledError:
+            self._inflight.pop(key, None)
+            future.set_exception(_LeaderCancelled())
+            raise
+        finally:
+            # If the leading caller fails, followers get None and take the same rules
+            # fallback as any other failed completion.
+            if not future.done():
+                self._inflight.pop(key, None)
+                future.set_result(text)
+
+        # Failed completions (None) are not cached so the next request retries the provider.
+        if text is not None:
+            try:
+                await self.store.set(key, text, ttl)
+            except Exception:  # noqa: BLE001 - a failed store only costs a future miss
+                self.errors += 1
+        return text
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_completion_cache(app_settings: Settings) -> CompletionCache | None:
+    backend = (app_settings.COMPLETION_CACHE_BACKEND or "off").strip().lower()
+    if backend in ("", "off", "none"):
+        return None
+
+    store: InMemoryCompletionStore | RedisCompletionStore
+    if backend == "redis":
+        from app.core.redis_client import get_redis_client
+
+        store = RedisCompletionStore(client=get_redis_client(), prefix="support:completion")
+    elif backend == "memory":
+        store = InMemoryCompletionStore(max_entries=app_settings.COMPLETION_CACHE_MAX_ENTRIES)
+    else:
+        raise ValueError(
+            f"Unknown COMPLETION_CACHE_BACKEND={app_settings.COMPLETION_CACHE_BACKEND!r}. "
+            "Supported: ['off', 'memory', 'redis']"
+        )
+
+    return CompletionCache(
+        store=store,
+        default_ttl_seconds=app_settings.COMPLETION_CACHE_TTL_SECONDS,
+        node_ttls=parse_node_ttls(app_settings.COMPLETION_CACHE_NODE_TTLS),
+    )
@@ -0,0 +1,91 @@
+"""Compiled keyword matcher for the rule-based support fallback.
+
+The taxonomy maps labels (categories such as `billing` and signals such as `urgent`) to
+keywords. Keywords are compiled once into hash tables keyed by word: exact words, wildcard
+prefixes and the first word of multi-word phrases. Matching tokenizes the text once and
+does a few dictionary lookups per token, so cost grows with the length of the text rather
+than with the number of keywords, and every match is word-boundary aligned.
+
+Keyword syntax:
+- `invoice` matches the whole word only.
+- `refund*` matches the word and any suffix (`refunds`, `refunded`).
+- `not working` matches the words in sequence.
+"""
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).with_name("taxonomy.json")
+
+_TOKEN_RE = re.compile(r"\w+")
+_WORD_CACHE_LIMIT = 65536
+
+
+class KeywordMatcher:
+    def __init__(
+        self,
+        categories: dict[str, list[str]],
+        signals: dict[str, list[str]] | None = None,
+    ) -> None:
+        # Category order is significant: earlier categories win ties in rule-based triage.
+        self.categories = list(categories)
+        self.signals = list(signals or {})
+        self._exact: dict[str, str] = {}
+        self._prefixes: dict[str, str] = {}
+        self._phrases: dict[str, list[tuple[tuple[str, ...], str]]] = {}
+
+        for label, keywords in {**categories, **(signals or {})}.items():
+            for keyword in keywords:
+                words = _TOKEN_RE.findall(keyword.lower())
+                if not words:
+                    continue
+                if len(words) > 1:
+                    self._phrases.setdefault(words[0], []).append((tuple(words[1:]), label))
+                elif keyword.rstrip().endswith("*"):
+                    self._prefixes.setdefault(words[0], label)
+                else:
+                    self._exact.setdefault(words[0], label)
+
+        # Longest prefix first, so `password*` beats a shorter `pass*` on the same token.
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes}, reverse=True)
+        # Token -> label memo. Support text reuses a small vocabulary, so most tokens skip
+        # the prefix probes after the first sighting.
+        self._word_cache: dict[str, str | None] = {}
+
+    @classmethod
+    def from_file(cls, path: str | Path | None = None) -> KeywordMatcher:
+        data = json.loads(Path(path or DEFAULT_TAXONOMY_PATH).read_text(encoding="utf-8"))
+        return cls(categories=data.get("categories", {}), signals=data.get("signals", {}))
+
+    def _match_word(self, token: str) -> str | None:
+        try:
+            return self._word_cache[token]
+        except KeyError:
+            pass
+        label = self._exact.get(token)
+        if label is None:
+            for length in self._prefix_lengths:
+                if length <= len(token):
+                    label = self._prefixes.get(token[:length])
+                    if label is not None:
+                        break
+        if len(self._word_cache) >= _WORD_CACHE_LIMIT:
+            self._word_cache.clear()
+        self._word_cache[token] = label
+        return label
+
+    def count(self, text: str) -> Counter[str]:
+        """Return per-label keyword hit counts from a single pass over `text`."""
+        tokens = _TOKEN_RE.findall(text.lower())
+        hits: Counter[str] = Counter()
+        for position, token in enumerate(tokens):
+            for rest, phrase_label in self._phrases.get(token, ()):
+                if tuple(tokens[position + 1 : position + 1 + len(rest)]) == rest:
+                    hits[phrase_label] += 1
+            word_label = self._match_word(token)
+            if word_label is not None:
+                hits[word_label] += 1
+        return hits
@@ -0,0 +1,322 @@
+"""BM25 search over help-center articles, served from a memory-mapped index file.
+
+The index is built offline from a directory of articles:
+
+    python -m app.services.support.knowledge_base ARTICLES_DIR OUTPUT [--base-url /help/]
+
+Articles are markdown (`.md`, optional `key: value` front matter for `title`/`url`; the
+title otherwise comes from the first `# ` heading) or JSON (one article object, or a list,
+with `title`, `body` and optional `url`).
+
+File layout (little-endian; every section 8-byte aligned so it maps straight to numpy):
+
+    header       magic, version, doc/term/posting counts, k1, b, section offsets
+    term_offsets uint64[terms + 1]  byte offsets into term_blob (terms sorted)
+    term_blob    utf-8 terms, concatenated
+    postings     uint64[terms + 1]  start of each term's run in doc_ids/term_freqs
+    doc_ids      uint32[postings]
+    term_freqs   uint32[postings]
+    doc_norms    float32[docs]      k1 * (1 - b + b * length / avg_length), precomputed
+    meta_offsets uint64[docs + 1]   byte offsets into meta_blob
+    meta_blob    utf-8 JSON per document ({"title", "url", "body"})
+
+Opening an index maps the file read-only, so workers share its pages through the OS page
+cache and startup costs no parsing. A query does a binary search per term and one
+vectorized score update per posting list.
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import math
+import mmap
+import re
+import struct
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+MAGIC = b"KBBM25\x00\x00"
+VERSION = 1
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+TITLE_WEIGHT = 2  # Title terms count this many times toward term frequency
+
+# magic, version, docs, terms, postings, k1, b, then the 9 section offsets.
+_HEADER = struct.Struct("<8sIIIIdd9Q")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    {
+        "a", "am", "an", "and", "are", "as", "at", "be", "by", "can", "could", "do", "does",
+        "for", "from", "get", "have", "how", "i", "if", "in", "is", "it", "me", "my", "need",
+        "of", "on", "or", "please", "that", "the", "this", "to", "want", "was", "what",
+        "when", "where", "why", "will", "with", "would", "you", "your",
+    }
+)
+_FRONT_MATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens without stopwords; a trailing plural `s` is folded."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass(frozen=True)
+class Article:
+    title: str
+    url: str
+    body: str
+
+
+def _markdown_article(path: Path, root: Path, base_url: str) -> Article:
+    text = path.read_text(encoding="utf-8")
+    fields: dict[str, str] = {}
+    front_matter = _FRONT_MATTER_RE.match(text)
+    if front_matter:
+        for line in front_matter.group(1).splitlines():
+            key, _, value = line.partition(":")
+            fields[key.strip().lower()] = value.strip().strip("\"'")
+        text = text[front_matter.end():]
+    title = fields.get("title")
+    # A leading `# ` heading is the title, not part of the answer text.
+    lines = text.lstrip().splitlines()
+    if lines and lines[0].startswith("# "):
+        title = title or lines[0][2:].strip()
+        text = "\n".join(lines[1:])
+    title = title or path.stem.replace("-", " ").replace("_", " ")
+    url = fields.get("url") or base_url + path.relative_to(root).with_suffix("").as_posix()
+    return Article(title=title, url=url, body=text.strip())
+
+
+def _json_articles(path: Path, root: Path, base_url: str) -> Iterator[Article]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    items = payload if isinstance(payload, list) else [payload]
+    default_url = base_url + path.relative_to(root).with_suffix("").as_posix()
+    for position, item in enumerate(items):
+        url = item.get("url") or (default_url if len(items) == 1 else f"{default_url}#{position}")
+        yield Article(title=item.get("title", ""), url=url, body=item.get("body", ""))
+
+
+def load_articles(directory: str | Path, base_url: str = "/help/") -> list[Article]:
+    """Read every markdown and JSON article under `directory`, in path order."""
+    root = Path(directory)
+    articles: list[Article] = []
+    for path in sorted(root.rglob("*")):
+        suffix = path.suffix.lower()
+        if suffix in (".md", ".markdown"):
+            articles.append(_markdown_article(path, root, base_url))
+        elif suffix == ".json":
+            articles.extend(_json_articles(path, root, base_url))
+    return articles
+
+
+def _aligned(chunks: list[bytes]) -> tuple[bytes, list[int]]:
+    """Concatenate sections after the header, padding each to 8 bytes; return offsets."""
+    offsets: list[int] = []
+    position = _HEADER.size
+    body = bytearray()
+    for chunk in chunks:
+        padding = -position % 8
+        body += b"\x00" * padding
+        position += padding
+        offsets.append(position)
+        body += chunk
+        position += len(chunk)
+    return bytes(body), offsets
+
+
+def build_index(
+    articles: Iterable[Article],
+    k1: float = DEFAULT_K1,
+    b: float = DEFAULT_B,
+) -> bytes:
+    """Serialize `articles` into the on-disk index format."""
+    documents = list(articles)
+    postings: dict[str, list[tuple[int, int]]] = {}
+    lengths: list[int] = []
+    for doc_id, article in enumerate(documents):
+        counts = Counter(tokenize(article.body))
+        for token in tokenize(article.title):
+            counts[token] += TITLE_WEIGHT
+        lengths.append(sum(counts.values()))
+        for token, count in counts.items():
+            postings.setdefault(token, []).append((doc_id, count))
+
+    terms = sorted(postings)
+    encoded_terms = [term.encode("utf-8") for term in terms]
+    term_offsets = np.zeros(len(terms) + 1, dtype="<u8")
+    term_offsets[1:] = np.cumsum([len(term) for term in encoded_terms])
+    run_starts = np.zeros(len(terms) + 1, dtype="<u8")
+    run_starts[1:] = np.cumsum([len(postings[term]) for term in terms])
+    pairs = [pair for term in terms for pair in postings[term]]
+    doc_ids = np.array([doc_id for doc_id, _ in pairs], dtype="<u4")
+    term_freqs = np.array([count for _, count in pairs], dtype="<u4")
+
+    lengths_array = np.array(lengths, dtype=np.float64)
+    average_length = float(lengths_array.mean()) if documents else 0.0
+    doc_norms = (k1 * (1 - b + b * lengths_array / (average_length or 1.0))).astype("<f4")
+
+    metas = [json.dumps(asdict(article)).encode("utf-8") for article in documents]
+    meta_offsets = np.zeros(len(documents) + 1, dtype="<u8")
+    meta_offsets[1:] = np.cumsum([len(meta) for meta in metas])
+
+    body, offsets = _aligned(
+        [
+            term_offsets.tobytes(),
+            b"".join(encoded_terms),
+            run_starts.tobytes(),
+            doc_ids.tobytes(),
+            term_freqs.tobytes(),
+            doc_norms.tobytes(),
+            meta_offsets.tobytes(),
+            b"".join(metas),
+            b"",  # End of file; lets the reader size the last section.
+        ]
+    )
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(documents), len(terms), len(pairs), k1, b, *offsets
+    )
+    return header + body
+
+
+def write_index(articles: Iterable[Article], path: str | Path) -> None:
+    # Write then rename, so a worker never maps a half-written file.
+    target = Path(path)
+    partial = target.with_name(target.name + ".tmp")
+    partial.write_bytes(build_index(articles))
+    partial.replace(target)
+
+
+class _Terms:
+    """Sorted term table viewed as a sequence of bytes, for `bisect`."""
+
+    def __init__(self, offsets: np.ndarray, blob: memoryview) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(self._blob[self._offsets[index] : self._offsets[index + 1]])
+
+
+class KnowledgeBaseIndex:
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        if len(buffer) < _HEADER.size or bytes(buffer[:8]) != MAGIC:
+            raise ValueError(f"{path} is not a knowledge base index")
+        (
+            _,
+            version,
+            self.doc_count,
+            term_count,
+            posting_count,
+            self.k1,
+            self.b,
+            *sections,
+        ) = _HEADER.unpack_from(buffer)
+        if version != VERSION:
+            raise ValueError(f"{path} has index version {version}, expected {VERSION}")
+
+        def array(section: int, dtype: str, count: int) -> np.ndarray:
+            return np.frombuffer(buffer, dtype=dtype, count=count, offset=sections[section])
+
+        self._terms = _Terms(
+            array(0, "<u8", term_count + 1), buffer[sections[1] : sections[2]]
+        )
+        self._run_starts = array(2, "<u8", term_count + 1)
+        self._doc_ids = array(3, "<u4", posting_count)
+        self._term_freqs = array(4, "<u4", posting_count)
+        self._doc_norms = array(5, "<f4", self.doc_count)
+        self._meta_offsets = array(6, "<u8", self.doc_count + 1)
+        self._meta_blob = buffer[sections[7] : sections[8]]
+
+    def _term_index(self, term: str) -> int | None:
+        encoded = term.encode("utf-8")
+        position = bisect.bisect_left(self._terms, encoded)
+        if position < len(self._terms) and self._terms[position] == encoded:
+            return position
+        return None
+
+    def _idf(self, frequency: int) -> float:
+        return math.log(1 + (self.doc_count - frequency + 0.5) / (frequency + 0.5))
+
+    def score_ceiling(self, query: str) -> float:
+        """Upper bound of a BM25 score for `query`: every term matched with unbounded
+        frequency. Terms missing from the index count at full weight, so dividing a score
+        by this gives a 0..1 confidence that drops when part of the query is unknown."""
+        ceiling = 0.0
+        for term in set(tokenize(query)):
+            index = self._term_index(term)
+            frequency = 0 if index is None else self._posting_count(index)
+            ceiling += self._idf(frequency) * (self.k1 + 1)
+        return ceiling
+
+    def _posting_count(self, index: int) -> int:
+        return int(self._run_starts[index + 1] - self._run_starts[index])
+
+    def document(self, doc_id: int) -> dict[str, Any]:
+        start, end = self._meta_offsets[doc_id], self._meta_offsets[doc_id + 1]
+        return json.loads(bytes(self._meta_blob[start:end]))
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[float, dict[str, Any]]]:
+        """Top `limit` documents by BM25 score, best first, as (score, {title, url, body})."""
+        if self.doc_count == 0:
+            return []
+        scores = np.zeros(self.doc_count, dtype=np.float32)
+        for term in set(tokenize(query)):
+            index = self._term_index(term)
+            if index is None:
+                continue
+            start, end = int(self._run_starts[index]), int(self._run_starts[index + 1])
+            idf = self._idf(end - start)
+            doc_ids = self._doc_ids[start:end]
+            term_freqs = self._term_freqs[start:end].astype(np.float32)
+            # Doc ids are unique within a posting list, so fancy-index += is safe.
+            scores[doc_ids] += (
+                idf * term_freqs * (self.k1 + 1) / (term_freqs + self._doc_norms[doc_ids])
+            )
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(scores[matched], -limit)[-limit:]]
+        ranked = sorted(matched, key=lambda doc_id: (-scores[doc_id], doc_id))
+        return [(float(scores[doc_id]), self.document(int(doc_id))) for doc_id in ranked]
+
+
+@lru_cache(maxsize=4)
+def open_knowledge_base(path: str) -> KnowledgeBaseIndex:
+    # One mapping per process and path; the OS page cache shares it across workers.
+    return KnowledgeBaseIndex(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build a knowledge base search index.")
+    parser.add_argument("articles", help="Directory of markdown/JSON help-center articles")
+    parser.add_argument("output", help="Index file to write")
+    parser.add_argument("--base-url", default="/help/", help="URL prefix for articles")
+    args = parser.parse_args()
+
+    articles = load_articles(args.articles, base_url=args.base_url)
+    write_index(articles, args.output)
+    print(f"Indexed {len(articles)} articles into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
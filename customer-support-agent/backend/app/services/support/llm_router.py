@@ -0,0 +1,311 @@
+"""Routes support completions across the configured LLM providers.
+
+- `single`: only the primary provider is called.
+- `failover`: providers are tried in order until one returns text.
+- `hedge`: if the primary has not answered within its recent latency percentile, the
+  same prompt is also sent to the secondary. The first usable answer wins and the other
+  call is cancelled, which trims the tail caused by occasional slow provider responses.
+
+Every call is bounded by a per-(provider, node) timeout derived from observed latency and
+guarded by a per-provider circuit breaker, so a brownout costs one short timeout per
+request rather than the SDK's full timeout and retries. An optional rate limiter admits
+calls per (provider, model) budget; a refused call is treated like an unavailable provider.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+
+from app.core.config import Settings
+from app.services.support.circuit_breaker import OPEN, CircuitBreaker
+from app.services.support.rate_limiter import RateLimiter, build_rate_limiter, estimate_tokens
+
+CallBackend = Callable[[str, str, bool], Awaitable[str | None]]
+
+ROUTING_MODES = ("single", "failover", "hedge")
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies for one provider."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+
+class LLMRouter:
+    def __init__(
+        self,
+        call_backend: CallBackend,
+        mode: str = "single",
+        hedge_percentile: float = 95.0,
+        hedge_default_delay_seconds: float = 2.0,
+        hedge_min_samples: int = 20,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+        timeout_percentile: float = 99.0,
+        timeout_multiplier: float = 2.0,
+        timeout_min_seconds: float = 1.0,
+        timeout_max_seconds: float = 20.0,
+        limiter: RateLimiter | None = None,
+        limit_key: Callable[[str], str] = str,
+        limit_max_wait_seconds: float = 2.0,
+        limit_completion_tokens: int = 300,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if mode not in ROUTING_MODES:
+            raise ValueError(
+                f"Unknown LLM_ROUTING_MODE={mode!r}. Supported: {list(ROUTING_MODES)}"
+            )
+        self._call_backend = call_backend
+        self.mode = mode
+        self.hedge_percentile = hedge_percentile
+        self.hedge_default_delay_seconds = hedge_default_delay_seconds
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.timeout_min_seconds = timeout_min_seconds
+        self.timeout_max_seconds = timeout_max_seconds
+        self.limiter = limiter
+        self._limit_key = limit_key
+        self.limit_max_wait_seconds = limit_max_wait_seconds
+        self.limit_completion_tokens = limit_completion_tokens
+        self._clock = clock
+        self._latency: dict[str, LatencyTracker] = {}
+        self._node_latency: dict[tuple[str, str], LatencyTracker] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.failovers = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.short_circuits = 0
+        self.throttled = 0
+
+    def breaker(self, backend: str) -> CircuitBreaker:
+        breaker = self._breakers.get(backend)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.breaker_failure_threshold,
+                reset_timeout_seconds=self.breaker_reset_seconds,
+            )
+            self._breakers[backend] = breaker
+        return breaker
+
+    def available(self, backend: str) -> bool:
+        """False while the provider's breaker is open (no call would be attempted)."""
+        return self.breaker(backend).state != OPEN
+
+    async def admit(self, backend: str, prompt: str) -> bool:
+        """Wait for rate-limit budget for one call; False when it would take too long."""
+        if self.limiter is None:
+            return True
+        admitted = await self.limiter.acquire(
+            self._limit_key(backend),
+            estimate_tokens(prompt, self.limit_completion_tokens),
+            self.limit_max_wait_seconds,
+        )
+        if not admitted:
+            self.throttled += 1
+        return admitted
+
+    def timeout_for(self, backend: str, node: str) -> float:
+        # Until a node has enough history, allow the ceiling; afterwards a multiple of its
+        # tail latency, so a stuck call is abandoned long before the SDK gives up.
+        tracker = self._node_latency.get((backend, node))
+        if tracker is None or len(tracker) < self.hedge_min_samples:
+            return self.timeout_max_seconds
+        observed = tracker.percentile(self.timeout_percentile) or self.timeout_max_seconds
+        return min(
+            self.timeout_max_seconds,
+            max(self.timeout_min_seconds, observed * self.timeout_multiplier),
+        )
+
+    def hedge_delay(self, backend: str) -> float:
+        tracker = self._latency.get(backend)
+        if tracker is None or len(tracker) < self.hedge_min_samples:
+            return self.hedge_default_delay_seconds
+        return tracker.percentile(self.hedge_percentile) or self.hedge_default_delay_seconds
+
+    def _record_latency(self, backend: str, node: str, seconds: float) -> None:
+        self._latency.setdefault(backend, LatencyTracker()).record(seconds)
+        self._node_latency.setdefault((backend, node), LatencyTracker()).record(seconds)
+
+    async def _timed_call(
+        self,
+        backend: str,
+        prompt: str,
+        json_mode: bool,
+        node: str = "default",
+    ) -> str | None:
+        breaker = self.breaker(backend)
+        if not breaker.allow():
+            self.short_circuits += 1
+            return None
+
+        try:
+            admitted = await self.admit(backend, prompt)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        if not admitted:
+            breaker.release()
+            return None
+
+        start = self._clock()
+        try:
+            text = await asyncio.wait_for(
+                self._call_backend(backend, prompt, json_mode),
+                timeout=self.timeout_for(backend, node),
+            )
+        except asyncio.CancelledError:
+            # A hedged loser was at least this slow; recording it keeps the percentile from
+            # drifting down to only the calls that were allowed to finish.
+            self._record_latency(backend, node, self._clock() - start)
+            breaker.release()
+            raise
+        except TimeoutError:
+            self.timeouts += 1
+            breaker.record_failure()
+            return None
+        except Exception:  # noqa: BLE001 - any provider error counts against the breaker
+            breaker.record_failure()
+            return None
+
+        breaker.record_success()
+        if text is not None:
+            self._record_latency(backend, node, self._clock() - start)
+        return text
+
+    async def complete(
+        self,
+        backends: Sequence[str],
+        prompt: str,
+        json_mode: bool = False,
+        node: str = "default",
+    ) -> str | None:
+        """Return the first usable completion from `backends` (primary first), or None.
+
+        Providers with an open breaker are skipped; with none left, the caller takes its
+        rules fallback immediately.
+        """
+        backends = [backend for backend in backends if self.available(backend)]
+        if not backends:
+            self.short_circuits += 1
+            return None
+        if self.mode == "single" or len(backends) == 1:
+            return await self._timed_call(backends[0], prompt, json_mode, node)
+        if self.mode == "hedge":
+            return await self._hedged(backends[0], backends[1], prompt, json_mode, node)
+        return await self._failover(backends, prompt, json_mode, node)
+
+    async def _failover(
+        self,
+        backends: Sequence[str],
+        prompt: str,
+        json_mode: bool,
+        node: str,
+    ) -> str | None:
+        for position, backend in enumerate(backends):
+            if position:
+                self.failovers += 1
+            text = await self._timed_call(backend, prompt, json_mode, node)
+            if text is not None:
+                return text
+        return None
+
+    async def _hedged(
+        self,
+        primary: str,
+        secondary: str,
+        prompt: str,
+        json_mode: bool,
+        node: str,
+    ) -> str | None:
+        primary_task = asyncio.create_task(self._timed_call(primary, prompt, json_mode, node))
+        tasks = [primary_task]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+            if done:
+                text = primary_task.result()
+                if text is not None:
+                    return text
+                # The primary failed fast; that is a plain failover, not a hedge.
+                self.failovers += 1
+                return await self._timed_call(secondary, prompt, json_mode, node)
+
+            self.hedges += 1
+            secondary_task = asyncio.create_task(
+                self._timed_call(secondary, prompt, json_mode, node)
+            )
+            tasks.append(secondary_task)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    text = task.result()
+                    if text is not None:
+                        if task is secondary_task:
+                            self.hedge_wins += 1
+                        return text
+            return None
+        finally:
+            # Also covers the caller being cancelled mid-wait; done tasks ignore cancel().
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict[str, float | int]:
+        stats: dict[str, float | int] = {
+            "failovers": self.failovers,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "short_circuits": self.short_circuits,
+            "throttled": self.throttled,
+        }
+        for backend in self._latency:
+            stats[f"{backend}_hedge_delay_seconds"] = round(self.hedge_delay(backend), 4)
+        for backend in self._breakers:
+            stats[f"{backend}_breaker_open"] = int(not self.available(backend))
+        if self.limiter is not None:
+            stats.update({f"rate_limit_{name}": value for name, value in self.limiter.stats().items()})
+        return stats
+
+
+def build_llm_router(
+    app_settings: Settings,
+    call_backend: CallBackend,
+    limit_key: Callable[[str], str] = str,
+) -> LLMRouter:
+    return LLMRouter(
+        call_backend=call_backend,
+        mode=(app_settings.LLM_ROUTING_MODE or "single").strip().lower(),
+        hedge_percentile=app_settings.LLM_HEDGE_PERCENTILE,
+        hedge_default_delay_seconds=app_settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS,
+        hedge_min_samples=app_settings.LLM_HEDGE_MIN_SAMPLES,
+        breaker_failure_threshold=app_settings.LLM_BREAKER_FAILURE_THRESHOLD,
+        breaker_reset_seconds=app_settings.LLM_BREAKER_RESET_SECONDS,
+        timeout_percentile=app_settings.LLM_TIMEOUT_PERCENTILE,
+        timeout_multiplier=app_settings.LLM_TIMEOUT_MULTIPLIER,
+        timeout_min_seconds=app_settings.LLM_TIMEOUT_MIN_SECONDS,
+        timeout_max_seconds=app_settings.LLM_TIMEOUT_MAX_SECONDS,
+        limiter=build_rate_limiter(app_settings),
+        limit_key=limit_key,
+        limit_max_wait_seconds=app_settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS,
+        limit_completion_tokens=app_settings.LLM_RATE_LIMIT_COMPLETION_TOKENS,
+    )
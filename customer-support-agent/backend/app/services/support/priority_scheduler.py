@@ -0,0 +1,98 @@
+"""Priority admission for LLM calls when provider capacity is saturated.
+
+At most `max_concurrency` calls run at once. Waiters are served by an aged deadline:
+`enqueued_at + rank * aging_seconds`, so an urgent call jumps ahead of routine work that
+arrived up to `2 * aging_seconds` earlier, but a routine call that has waited that long
+is served before newer urgent ones and cannot starve.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+PRIORITY_CLASSES = ("urgent", "premium", "routine")  # Highest first
+
+# Priority of the support request being processed; read where LLM calls are admitted.
+current_priority: ContextVar[str] = ContextVar("support_priority", default="routine")
+
+
+class PriorityScheduler:
+    def __init__(
+        self,
+        max_concurrency: int,
+        aging_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.aging_seconds = aging_seconds
+        self._clock = clock
+        self._active = 0
+        self._waiters: list[tuple[float, int, str, float, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._queued: Counter[str] = Counter()
+        self._admitted: Counter[str] = Counter()
+        self._wait_seconds: defaultdict[str, float] = defaultdict(float)
+        self._max_queued: Counter[str] = Counter()
+
+    @asynccontextmanager
+    async def slot(self, priority: str | None = None) -> AsyncIterator[None]:
+        await self._acquire(priority or current_priority.get())
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: str) -> None:
+        if priority not in PRIORITY_CLASSES:
+            priority = "routine"
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._admitted[priority] += 1
+            return
+
+        now = self._clock()
+        deadline = now + PRIORITY_CLASSES.index(priority) * self.aging_seconds
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (deadline, next(self._sequence), priority, now, future))
+        self._queued[priority] += 1
+        self._max_queued[priority] = max(self._max_queued[priority], self._queued[priority])
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the caller gave up; pass it on.
+                self._release()
+            else:
+                self._queued[priority] -= 1
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next live waiter so newcomers cannot barge in.
+        while self._waiters:
+            _, _, priority, enqueued_at, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._queued[priority] -= 1
+            self._admitted[priority] += 1
+            self._wait_seconds[priority] += self._clock() - enqueued_at
+            future.set_result(None)
+            return
+        self._active -= 1
+
+    def stats(self) -> dict[str, float | int]:
+        stats: dict[str, float | int] = {"active": self._active}
+        for priority in PRIORITY_CLASSES:
+            admitted = self._admitted[priority]
+            stats[f"{priority}_queued"] = self._queued[priority]
+            stats[f"{priority}_max_queued"] = self._max_queued[priority]
+            stats[f"{priority}_admitted"] = admitted
+            stats[f"{priority}_avg_wait_ms"] = (
+                round(self._wait_seconds[priority] / admitted * 1000, 2) if admitted else 0.0
+            )
+        return stats
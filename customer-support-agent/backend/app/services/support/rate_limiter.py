@@ -0,0 +1,195 @@
+"""Outbound admission control for LLM calls.
+
+Each (provider, model) pair gets two token buckets that refill continuously: one for
+requests per minute and one for tokens per minute. Callers queue in arrival order and
+wait for budget up to `max_wait`; a caller that would wait longer is refused, so the
+support graph degrades to its rules path instead of piling into a provider 429 storm.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import Settings
+
+# Atomic refill-and-take on a Redis hash, timed by the Redis clock so workers on different
+# hosts share one budget. Returns the seconds to wait (0 when the request was admitted).
+_REDIS_TAKE = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local rpm, tpm, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'at')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+local wait = 0
+if requests < 1 then wait = (1 - requests) * 60 / rpm end
+if tokens < cost then wait = math.max(wait, (cost - tokens) * 60 / tpm) end
+if wait == 0 then
+  requests = requests - 1
+  tokens = tokens - cost
+end
+redis.call('HSET', KEYS[1], 'requests', requests, 'tokens', tokens, 'at', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(wait)
+"""
+
+
+def estimate_tokens(prompt: str, completion_tokens: int) -> int:
+    # ~4 characters per token is close enough for budgeting; providers bill the real count.
+    return len(prompt) // 4 + completion_tokens
+
+
+class RateLimiter(ABC):
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests_per_minute = max(1, requests_per_minute)
+        self.tokens_per_minute = max(1, tokens_per_minute)
+        self._clock = clock
+        # asyncio.Lock is FIFO, which gives queued callers arrival order. Locks are bound
+        # to an event loop, so they are kept per loop.
+        self._locks: weakref.WeakKeyDictionary[Any, dict[str, asyncio.Lock]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.admitted = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def _lock_for(self, key: str) -> asyncio.Lock:
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+        return lock
+
+    @abstractmethod
+    async def _take(self, key: str, cost: int) -> float:
+        """Take one request of `cost` tokens if both buckets allow it; else the seconds to wait."""
+
+    async def acquire(self, key: str, tokens: int, max_wait: float) -> bool:
+        """Wait for budget for one request of `tokens`; False once `max_wait` would pass."""
+        cost = min(tokens, self.tokens_per_minute)
+        deadline = self._clock() + max_wait
+        lock = self._lock_for(key)
+        if lock.locked():
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=max(0.0, max_wait))
+            except TimeoutError:
+                self.rejected += 1
+                return False
+        else:
+            await lock.acquire()
+
+        try:
+            while True:
+                try:
+                    wait = await self._take(key, cost)
+                except Exception:  # noqa: BLE001 - a limiter outage must not block the provider
+                    # Fail open rather than take the provider down with the limiter.
+                    self.errors += 1
+                    return True
+                if wait <= 0:
+                    self.admitted += 1
+                    return True
+                if self._clock() + wait > deadline:
+                    self.rejected += 1
+                    return False
+                await asyncio.sleep(wait)
+        finally:
+            lock.release()
+
+    def stats(self) -> dict[str, int]:
+        return {"admitted": self.admitted, "rejected": self.rejected, "errors": self.errors}
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Per-process budget; each uvicorn worker gets the full limits."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(requests_per_minute, tokens_per_minute, clock)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+
+    async def _take(self, key: str, cost: int) -> float:
+        rpm, tpm = self.requests_per_minute, self.tokens_per_minute
+        now = self._clock()
+        requests, tokens, at = self._buckets.get(key, (rpm, tpm, now))
+        elapsed = max(0.0, now - at)
+        requests = min(rpm, requests + elapsed * rpm / 60)
+        tokens = min(tpm, tokens + elapsed * tpm / 60)
+
+        wait = 0.0
+        if requests < 1:
+            wait = (1 - requests) * 60 / rpm
+        if tokens < cost:
+            wait = max(wait, (cost - tokens) * 60 / tpm)
+        if wait == 0:
+            requests -= 1
+            tokens -= cost
+        self._buckets[key] = (requests, tokens, now)
+        return wait
+
+
+class RedisRateLimiter(RateLimiter):
+    """Budget shared by every worker through one Redis hash per (provider, model)."""
+
+    def __init__(
+        self,
+        client: Any,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        prefix: str,
+    ) -> None:
+        super().__init__(requests_per_minute, tokens_per_minute)
+        self._client = client
+        self._prefix = prefix
+
+    async def _take(self, key: str, cost: int) -> float:
+        raw = await self._client.eval(
+            _REDIS_TAKE,
+            1,
+            f"{self._prefix}:{key}",
+            self.requests_per_minute,
+            self.tokens_per_minute,
+            cost,
+        )
+        return float(raw.decode() if isinstance(raw, bytes) else raw)
+
+
+def build_rate_limiter(app_settings: Settings) -> RateLimiter | None:
+    backend = (app_settings.LLM_RATE_LIMIT_BACKEND or "off").strip().lower()
+    if backend in ("", "off", "none"):
+        return None
+
+    if backend == "redis":
+        from app.core.redis_client import get_redis_client
+
+        return RedisRateLimiter(
+            client=get_redis_client(),
+            requests_per_minute=app_settings.LLM_RATE_LIMIT_RPM,
+            tokens_per_minute=app_settings.LLM_RATE_LIMIT_TPM,
+            prefix="llm:ratelimit",
+        )
+    if backend == "memory":
+        return InMemoryRateLimiter(
+            requests_per_minute=app_settings.LLM_RATE_LIMIT_RPM,
+            tokens_per_minute=app_settings.LLM_RATE_LIMIT_TPM,
+        )
+    raise ValueError(
+        f"Unknown LLM_RATE_LIMIT_BACKEND={app_settings.LLM_RATE_LIMIT_BACKEND!r}. "
+        "Supported: ['off', 'memory', 'redis']"
+    )
@@ -0,0 +1,440 @@
+"""Semantic cache for support responses.
+
+Queries are embedded locally with hashed word and character n-grams, so near-duplicates
+("how do I reset my password" / "I need to reset my password") can reuse a stored
+response without an embedding service. Vectors are L2-normalized, so a dot product is the
+cosine similarity.
+
+Entries are partitioned by a caller-supplied scope (pipeline mode and category), so an
+answer is only reused for a request that would have been answered the same way.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from app.core.config import Settings
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# NLTK's English stopword list without its negations, which `_terms` handles instead.
+# Apostrophes are stripped before tokenizing, so contractions arrive whole ("don't" ->
+# "dont"). Dropping function words keeps phrasing from dominating the similarity.
+_STOPWORDS = frozenset(
+    {
+        "a", "about", "above", "after", "again", "against", "all", "am", "an", "and", "any",
+        "are", "as", "at", "be", "because", "been", "before", "being", "below", "between",
+        "both", "but", "by", "can", "d", "did", "do", "does", "doing", "down", "during",
+        "each", "few", "for", "from", "further", "had", "has", "have", "having", "he", "her",
+        "here", "hers", "herself", "him", "himself", "his", "how", "i", "if", "in", "into",
+        "is", "it", "its", "itself", "just", "ll", "m", "ma", "me", "more", "most", "my",
+        "myself", "now", "o", "of", "off", "on", "once", "only", "or", "other", "our", "ours",
+        "ourselves", "out", "over", "own", "re", "s", "same", "she", "should", "so", "some",
+        "such", "than", "that", "the", "their", "theirs", "them", "themselves", "then",
+        "there", "these", "they", "this", "those", "through", "to", "too", "under", "until",
+        "up", "ve", "very", "was", "we", "were", "what", "when", "where", "which", "while",
+        "who", "whom", "why", "will", "with", "y", "you", "your", "yours", "yourself",
+        "yourselves",
+    }
+)
+
+# Negation cues, including the apostrophe-less contractions customers type.
+_NEGATIONS = frozenset(
+    {
+        "no", "not", "nor", "never", "cannot", "cant", "aint", "arent", "couldnt", "didnt",
+        "doesnt", "dont", "hadnt", "hasnt", "havent", "isnt", "mightnt", "mustnt", "neednt",
+        "shant", "shouldnt", "wasnt", "werent", "wont", "wouldnt",
+    }
+)
+
+
+def _terms(text: str) -> list[tuple[str, bool]]:
+    """Content words of `text`, each flagged when a negation cue precedes it."""
+    tokens = _TOKEN_RE.findall(text.lower().replace("'", "").replace("\u2019", ""))
+    terms: list[tuple[str, bool]] = []
+    negated = False
+    for token in tokens:
+        if token in _NEGATIONS:
+            negated = True
+        elif token not in _STOPWORDS:
+            terms.append((token, negated))
+            negated = False
+    return terms or [(token, False) for token in tokens]
+
+
+class HashedNgramFeaturizer:
+    """Embeds text as a signed feature-hashed bag of words and character trigrams.
+
+    Hashing uses crc32 rather than `hash()` so vectors are stable across processes,
+    which the shared Redis index relies on.
+    """
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> list[str]:
+        features: list[str] = []
+        for token, negated in _terms(text):
+            if negated:
+                # A negated word gets one marker and no trigrams: its trigrams are the
+                # plain word's, so "not delivered" would still look like "delivered".
+                features.append(f"w:!{token}")
+                continue
+            features.append(f"w:{token}")
+            padded = f"#{token}#"
+            features.extend(f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            # Whole words are weighted above their trigrams so shared vocabulary dominates.
+            weight = 2.0 if feature.startswith("w:") else 1.0
+            vector[digest % self.dim] += sign * weight
+
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class InMemorySemanticIndex:
+    """Fixed-capacity NumPy similarity index with TTL expiry and LRU eviction."""
+
+    def __init__(
+        self,
+        dim: int,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._ttl = ttl_seconds
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._expires_at = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._occupied = np.zeros(max_entries, dtype=bool)
+        self._payloads: list[dict[str, Any] | None] = [None] * max_entries
+        self._slots: dict[str, int] = {}
+        self._keys: list[str | None] = [None] * max_entries
+        # Scopes are stored as small integer codes so a lookup masks them with NumPy.
+        self._scope_codes: dict[str, int] = {}
+        self._scopes = np.full(max_entries, -1, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return int(self._occupied.sum())
+
+    def _evict_expired(self, now: float) -> None:
+        expired = self._occupied & (self._expires_at <= now)
+        if expired.any():
+            self._occupied[expired] = False
+            for slot in np.flatnonzero(expired):
+                self._release(int(slot))
+
+    def _release(self, slot: int) -> None:
+        key = self._keys[slot]
+        if key is not None:
+            self._slots.pop(key, None)
+        self._keys[slot] = None
+        self._payloads[slot] = None
+
+    async def search(
+        self,
+        vector: np.ndarray,
+        scope: str,
+        min_score: float,
+    ) -> tuple[float, dict[str, Any]] | None:
+        now = self._clock()
+        self._evict_expired(now)
+        code = self._scope_codes.get(scope)
+        if code is None:
+            return None
+        candidates = self._occupied & (self._scopes == code)
+        if not candidates.any():
+            return None
+
+        scores = self._vectors @ vector
+        scores[~candidates] = -1.0
+        slot = int(np.argmax(scores))
+        payload = self._payloads[slot]
+        if payload is None or scores[slot] < min_score:
+            return None
+        self._last_used[slot] = now
+        return float(scores[slot]), payload
+
+    async def add(
+        self,
+        key: str,
+        vector: np.ndarray,
+        payload: dict[str, Any],
+        scope: str,
+    ) -> None:
+        now = self._clock()
+        self._evict_expired(now)
+
+        slot = self._slots.get(key)
+        if slot is None:
+            free = np.flatnonzero(~self._occupied)
+            slot = int(free[0]) if free.size else int(np.argmin(self._last_used))
+            self._release(slot)
+            self._slots[key] = slot
+            self._keys[slot] = key
+
+        self._vectors[slot] = vector
+        self._payloads[slot] = payload
+        self._scopes[slot] = self._scope_codes.setdefault(scope, len(self._scope_codes))
+        self._expires_at[slot] = now + self._ttl
+        self._last_used[slot] = now
+        self._occupied[slot] = True
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisSemanticIndex:
+    """Redis-backed index shared by all workers.
+
+    Vectors live in one hash and payloads in per-entry keys with a Redis TTL. Every write
+    also appends the entry id to a change log, and each worker keeps a NumPy mirror of the
+    vectors plus its position in that log: a lookup costs one round trip to see the log is
+    unchanged, and otherwise fetches only the vectors of the entries that changed. The log
+    is trimmed as it grows; a worker that falls behind the trimmed head reloads the hash.
+    Entry ids start with their scope, so the mirror can mask entries by scope.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        dim: int,
+        max_entries: int,
+        ttl_seconds: int,
+        prefix: str,
+    ) -> None:
+        self._client = client
+        self._dim = dim
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._prefix = prefix
+        self._position: int | None = None  # Log entries applied, counted from the start
+        self._vectors: dict[str, np.ndarray] = {}
+        self._ids: list[str] = []
+        self._scopes = np.zeros(0, dtype=str)
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+
+    def _key(self, suffix: str) -> str:
+        return f"{self._prefix}:{suffix}"
+
+    async def _refresh(self) -> None:
+        pipe = self._client.pipeline()
+        pipe.get(self._key("log_base"))
+        pipe.llen(self._key("log"))
+        base, length = await pipe.execute()
+        base = int(base or 0)
+        if self._position == base + length:
+            return
+
+        if self._position is not None and self._position >= base:
+            # Read the new log entries in the same transaction as the base, so a trim
+            # in between cannot shift them.
+            pipe = self._client.pipeline()
+            pipe.get(self._key("log_base"))
+            pipe.lrange(self._key("log"), self._position - base, -1)
+            current_base, changed = await pipe.execute()
+            if int(current_base or 0) == base:
+                await self._apply_changes([_decode(entry_id) for entry_id in changed])
+                self._position += len(changed)
+                self._rebuild()
+                return
+
+        pipe = self._client.pipeline()
+        pipe.get(self._key("log_base"))
+        pipe.llen(self._key("log"))
+        pipe.hgetall(self._key("vectors"))
+        base, length, raw = await pipe.execute()
+        self._vectors = {
+            _decode(entry_id): np.frombuffer(value, dtype=np.float32)
+            for entry_id, value in raw.items()
+        }
+        self._position = int(base or 0) + length
+        self._rebuild()
+
+    async def _apply_changes(self, changed: list[str]) -> None:
+        entry_ids = list(dict.fromkeys(changed))
+        if not entry_ids:
+            return
+        # A missing vector means the entry was removed since it was logged.
+        values = await self._client.hmget(self._key("vectors"), entry_ids)
+        for entry_id, value in zip(entry_ids, values):
+            if value is None:
+                self._vectors.pop(entry_id, None)
+            else:
+                self._vectors[entry_id] = np.frombuffer(value, dtype=np.float32)
+
+    def _rebuild(self) -> None:
+        self._ids = list(self._vectors)
+        self._scopes = np.array([entry_id.partition("|")[0] for entry_id in self._ids])
+        if self._ids:
+            self._matrix = np.vstack(list(self._vectors.values()))
+        else:
+            self._matrix = np.zeros((0, self._dim), dtype=np.float32)
+
+    async def _remove(self, entry_ids: list[str]) -> None:
+        pipe = self._client.pipeline()
+        pipe.hdel(self._key("vectors"), *entry_ids)
+        pipe.zrem(self._key("lru"), *entry_ids)
+        pipe.delete(*(self._key(f"payload:{entry_id}") for entry_id in entry_ids))
+        pipe.rpush(self._key("log"), *entry_ids)
+        await pipe.execute()
+
+    async def _trim_log(self) -> None:
+        excess = await self._client.llen(self._key("log")) - 2 * max(self._max_entries, 32)
+        if excess <= 0:
+            return
+        pipe = self._client.pipeline()
+        pipe.ltrim(self._key("log"), excess, -1)
+        pipe.incrby(self._key("log_base"), excess)
+        await pipe.execute()
+
+    async def search(
+        self,
+        vector: np.ndarray,
+        scope: str,
+        min_score: float,
+    ) -> tuple[float, dict[str, Any]] | None:
+        await self._refresh()
+        if not self._ids:
+            return None
+
+        scores = self._matrix @ vector
+        scores[self._scopes != scope] = -1.0
+        slot = int(np.argmax(scores))
+        if scores[slot] < min_score:
+            return None  # Not a hit, so the payload is not worth a round trip
+        entry_id = self._ids[slot]
+        raw = await self._client.get(self._key(f"payload:{entry_id}"))
+        if raw is None:
+            # Payload expired; drop the dangling vector so other workers stop matching it.
+            await self._remove([entry_id])
+            return None
+        await self._client.zadd(self._key("lru"), {entry_id: time.time()})
+        return float(scores[slot]), json.loads(raw)
+
+    async def add(
+        self,
+        key: str,
+        vector: np.ndarray,
+        payload: dict[str, Any],
+        scope: str,
+    ) -> None:
+        entry_id = f"{scope}|{hashlib.sha1(key.encode('utf-8')).hexdigest()}"
+        pipe = self._client.pipeline()
+        pipe.hset(self._key("vectors"), entry_id, vector.astype(np.float32).tobytes())
+        pipe.set(self._key(f"payload:{entry_id}"), json.dumps(payload), ex=self._ttl)
+        pipe.zadd(self._key("lru"), {entry_id: time.time()})
+        pipe.rpush(self._key("log"), entry_id)
+        await pipe.execute()
+
+        overflow = await self._client.zcard(self._key("lru")) - self._max_entries
+        if overflow > 0:
+            evicted = await self._client.zpopmin(self._key("lru"), overflow)
+            await self._remove([_decode(item[0]) for item in evicted])
+        await self._trim_log()
+
+
+class SemanticCache:
+    """Returns a stored support payload when a query is similar enough to a cached one."""
+
+    def __init__(
+        self,
+        index: InMemorySemanticIndex | RedisSemanticIndex,
+        threshold: float,
+        featurizer: HashedNgramFeaturizer | None = None,
+    ) -> None:
+        self.index = index
+        self.threshold = threshold
+        self.featurizer = featurizer or HashedNgramFeaturizer()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    async def lookup(self, query: str, scope: str = "") -> dict[str, Any] | None:
+        """Payload stored under `scope` for a query similar to this one, if any."""
+        try:
+            match = await self.index.search(self.featurizer.embed(query), scope, self.threshold)
+        except Exception:  # noqa: BLE001 - see below
+            # A cache outage must never fail the request; treat it as a miss.
+            self.errors += 1
+            match = None
+
+        if match is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return match[1]
+
+    async def store(self, query: str, payload: dict[str, Any], scope: str = "") -> None:
+        key = f"{scope}|{' '.join(query.lower().split())}"
+        try:
+            await self.index.add(key, self.featurizer.embed(query), payload, scope)
+        except Exception:  # noqa: BLE001 - a failed store only costs a future miss
+            self.errors += 1
+            return
+        self.stores += 1
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_semantic_cache(app_settings: Settings) -> SemanticCache | None:
+    backend = (app_settings.SEMANTIC_CACHE_BACKEND or "off").strip().lower()
+    if backend in ("", "off", "none"):
+        return None
+
+    featurizer = HashedNgramFeaturizer()
+    index: InMemorySemanticIndex | RedisSemanticIndex
+    if backend == "redis":
+        from app.core.redis_client import get_redis_client
+
+        index = RedisSemanticIndex(
+            client=get_redis_client(),
+            dim=featurizer.dim,
+            max_entries=app_settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl_seconds=app_settings.SEMANTIC_CACHE_TTL_SECONDS,
+            # Bump the version when the featurizer changes: old vectors live in another space.
+            prefix="support:semantic:v2",
+        )
+    elif backend == "memory":
+        index = InMemorySemanticIndex(
+            dim=featurizer.dim,
+            max_entries=app_settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl_seconds=app_settings.SEMANTIC_CACHE_TTL_SECONDS,
+        )
+    else:
+        raise ValueError(
+            f"Unknown SEMANTIC_CACHE_BACKEND={app_settings.SEMANTIC_CACHE_BACKEND!r}. "
+            "Supported: ['off', 'memory', 'redis']"
+        )
+
+    return SemanticCache(
+        index=index,
+        threshold=app_settings.SEMANTIC_CACHE_THRESHOLD,
+        featurizer=featurizer,
+    )
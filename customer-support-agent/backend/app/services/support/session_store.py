@@ -0,0 +1,349 @@
+"""Write-behind store for support conversation sessions.
+
+Turns are appended to an in-process buffer and committed in batches by a background task,
+so the chat path never waits on the database. Reads merge the newest stored turns with
+anything still buffered, so a session always sees its own writes.
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from app.core.config import Settings
+from app.core.database import get_database_pool
+
+
+@dataclass(frozen=True)
+class SessionTurn:
+    session_id: str
+    role: str  # "user" | "assistant"
+    content: str
+    response_id: str | None = None  # Provider response id, for `previous_response_id`
+    created_at: float = field(default_factory=time.time)
+
+
+class SessionBackend(Protocol):
+    async def recent(self, session_id: str, limit: int) -> list[SessionTurn]:
+        ...
+
+    async def last_response_id(self, session_id: str) -> str | None:
+        ...
+
+    async def write(self, turns: list[SessionTurn]) -> None:
+        ...
+
+
+def _session_updates(turns: list[SessionTurn]) -> list[tuple[str, str | None, float]]:
+    # One row per session: its newest provider response id and timestamp in this batch.
+    latest: dict[str, tuple[str | None, float]] = {}
+    for turn in turns:
+        previous_id = latest.get(turn.session_id, (None, 0.0))[0]
+        latest[turn.session_id] = (turn.response_id or previous_id, turn.created_at)
+    return [(session_id, response_id, at) for session_id, (response_id, at) in latest.items()]
+
+
+_POSTGRES_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS support_sessions (
+        session_id TEXT PRIMARY KEY,
+        last_response_id TEXT,
+        updated_at DOUBLE PRECISION NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS support_session_turns (
+        id BIGSERIAL PRIMARY KEY,
+        session_id TEXT NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        response_id TEXT,
+        created_at DOUBLE PRECISION NOT NULL
+    )
+    """,
+    # Serves "last N turns of a session" as a single backward index range scan.
+    """
+    CREATE INDEX IF NOT EXISTS support_session_turns_recent
+        ON support_session_turns (session_id, id DESC)
+    """,
+)
+
+_UPSERT_SESSION = """
+    INSERT INTO support_sessions (session_id, last_response_id, updated_at)
+    VALUES ({0}, {1}, {2})
+    ON CONFLICT (session_id) DO UPDATE SET
+        last_response_id = COALESCE(excluded.last_response_id, support_sessions.last_response_id),
+        updated_at = excluded.updated_at
+"""
+
+
+class PostgresSessionBackend:
+    def __init__(self, url: str) -> None:
+        self._url = url
+        self._schema_ready = False
+
+    async def _pool(self) -> Any:
+        pool = await get_database_pool(self._url)
+        if not self._schema_ready:
+            async with pool.acquire() as connection:
+                for statement in _POSTGRES_SCHEMA:
+                    await connection.execute(statement)
+            self._schema_ready = True
+        return pool
+
+    async def recent(self, session_id: str, limit: int) -> list[SessionTurn]:
+        pool = await self._pool()
+        rows = await pool.fetch(
+            "SELECT role, content, response_id, created_at FROM support_session_turns "
+            "WHERE session_id = $1 ORDER BY id DESC LIMIT $2",
+            session_id,
+            limit,
+        )
+        return [
+            SessionTurn(
+                session_id=session_id,
+                role=row["role"],
+                content=row["content"],
+                response_id=row["response_id"],
+                created_at=row["created_at"],
+            )
+            for row in reversed(rows)
+        ]
+
+    async def last_response_id(self, session_id: str) -> str | None:
+        pool = await self._pool()
+        return await pool.fetchval(
+            "SELECT last_response_id FROM support_sessions WHERE session_id = $1",
+            session_id,
+        )
+
+    async def write(self, turns: list[SessionTurn]) -> None:
+        pool = await self._pool()
+        async with pool.acquire() as connection, connection.transaction():
+            await connection.executemany(
+                "INSERT INTO support_session_turns "
+                "(session_id, role, content, response_id, created_at) "
+                "VALUES ($1, $2, $3, $4, $5)",
+                [
+                    (turn.session_id, turn.role, turn.content, turn.response_id, turn.created_at)
+                    for turn in turns
+                ],
+            )
+            await connection.executemany(
+                _UPSERT_SESSION.format("$1", "$2", "$3"),
+                _session_updates(turns),
+            )
+
+
+class SQLiteSessionBackend:
+    """Local stand-in with the same schema and queries; used for tests and single-node dev."""
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS support_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    last_response_id TEXT,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS support_session_turns (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    response_id TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS support_session_turns_recent
+                    ON support_session_turns (session_id, id DESC);
+                """
+            )
+
+    def _fetch_recent(self, session_id: str, limit: int) -> list[SessionTurn]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT role, content, response_id, created_at FROM support_session_turns "
+                "WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [SessionTurn(session_id, *row) for row in reversed(rows)]
+
+    def _fetch_last_response_id(self, session_id: str) -> str | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT last_response_id FROM support_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, turns: list[SessionTurn]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO support_session_turns "
+                "(session_id, role, content, response_id, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (turn.session_id, turn.role, turn.content, turn.response_id, turn.created_at)
+                    for turn in turns
+                ],
+            )
+            self._connection.executemany(
+                _UPSERT_SESSION.format("?", "?", "?"),
+                _session_updates(turns),
+            )
+
+    async def recent(self, session_id: str, limit: int) -> list[SessionTurn]:
+        return await asyncio.to_thread(self._fetch_recent, session_id, limit)
+
+    async def last_response_id(self, session_id: str) -> str | None:
+        return await asyncio.to_thread(self._fetch_last_response_id, session_id)
+
+    async def write(self, turns: list[SessionTurn]) -> None:
+        await asyncio.to_thread(self._write, turns)
+
+
+class SessionStore:
+    def __init__(
+        self,
+        backend: SessionBackend,
+        flush_interval_seconds: float = 0.5,
+        max_batch: int = 100,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.backend = backend
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.flushed = 0
+        self.errors = 0
+        self.dropped = 0
+        self._pending: list[SessionTurn] = []
+        self._inflight: list[SessionTurn] = []
+        self._flusher: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+        # (event loop, lock): asyncio locks are bound to the loop they are first awaited on.
+        self._lock: tuple[asyncio.AbstractEventLoop, asyncio.Lock] | None = None
+
+    def append(self, turn: SessionTurn) -> None:
+        """Buffer a turn; it is committed by the next batch flush."""
+        self._pending.append(turn)
+        # Bound memory while the database is unreachable: shed the oldest buffered turns.
+        overflow = len(self._pending) - self.max_pending
+        if overflow > 0:
+            del self._pending[:overflow]
+            self.dropped += overflow
+        self._ensure_flusher()
+        if len(self._pending) >= self.max_batch:
+            task = asyncio.create_task(self.flush())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._flusher is None or self._flusher.done() or self._flusher.get_loop() is not loop:
+            self._flusher = loop.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def _flush_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock[0] is not loop:
+            self._lock = (loop, asyncio.Lock())
+        return self._lock[1]
+
+    async def flush(self) -> None:
+        # One batch in flight at a time; callers queue on the lock, and turns buffered
+        # meanwhile go in the next batch.
+        async with self._flush_lock():
+            if not self._pending:
+                return
+            self._inflight, self._pending = self._pending, []
+            try:
+                await self.backend.write(self._inflight)
+            except asyncio.CancelledError:
+                # Whether the write committed is unknown; requeue rather than lose the turns.
+                self._pending[:0] = self._inflight
+                raise
+            except Exception:  # noqa: BLE001 - requeued for the next flush
+                self.errors += 1
+                self._pending[:0] = self._inflight
+            else:
+                self.flushed += len(self._inflight)
+            finally:
+                self._inflight = []
+
+    def _buffered(self, session_id: str) -> list[SessionTurn]:
+        return [turn for turn in (*self._inflight, *self._pending) if turn.session_id == session_id]
+
+    async def recent(self, session_id: str, limit: int) -> list[SessionTurn]:
+        """Return the last `limit` turns of a session, oldest first."""
+        buffered = self._buffered(session_id)
+        stored = await self.backend.recent(session_id, limit)
+        # A batch may have committed during the read; drop turns now returned by both.
+        seen = set(stored)
+        return [*stored, *(turn for turn in buffered if turn not in seen)][-limit:]
+
+    async def last_response_id(self, session_id: str) -> str | None:
+        for turn in reversed(self._buffered(session_id)):
+            if turn.response_id:
+                return turn.response_id
+        return await self.backend.last_response_id(session_id)
+
+    async def close(self) -> None:
+        """Stop the background flusher and commit everything still buffered."""
+        loop = asyncio.get_running_loop()
+        if self._flusher is not None and self._flusher.get_loop() is loop:
+            # With the lock held no batch is mid-write, so the cancel cannot cut one off.
+            async with self._flush_lock():
+                self._flusher.cancel()
+        self._flusher = None
+        await asyncio.gather(
+            *(task for task in self._tasks if task.get_loop() is loop),
+            return_exceptions=True,
+        )
+        while self._pending:
+            errors = self.errors
+            await self.flush()
+            if self.errors > errors:
+                break
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending) + len(self._inflight),
+            "flushed": self.flushed,
+            "errors": self.errors,
+            "dropped": self.dropped,
+        }
+
+
+def build_session_store(app_settings: Settings) -> SessionStore | None:
+    url = (app_settings.DATABASE_URL or "").strip()
+    if not url:
+        return None
+
+    backend: SessionBackend
+    if url.startswith(("postgres://", "postgresql://")):
+        backend = PostgresSessionBackend(url)
+    elif url.startswith("sqlite://"):
+        # sqlite:///relative.db, sqlite:////absolute.db, or sqlite:// for in-memory.
+        path = url.removeprefix("sqlite://").removeprefix("/")
+        backend = SQLiteSessionBackend(path or ":memory:")
+    else:
+        raise ValueError(
+            f"Unsupported DATABASE_URL scheme in {url.split(':', 1)[0]!r}. "
+            "Supported: ['postgresql', 'sqlite']"
+        )
+
+    return SessionStore(
+        backend=backend,
+        flush_interval_seconds=app_settings.SESSION_FLUSH_INTERVAL_SECONDS,
+        max_batch=app_settings.SESSION_FLUSH_BATCH_SIZE,
+    )
@@ -0,0 +1,85 @@
+"""Per-request overhead of building the support workflow vs. reusing it from the registry.
+
+Usage:
+    python -m benchmarks.bench_graph_registry [--requests 200] [--with-sdk]
+
+`--with-sdk` sets a dummy OPENAI_API_KEY so the fresh-build path also constructs the
+OpenAI client, which is what a configured deployment pays. Only setup is timed in that
+mode; no provider calls are made.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+
+from app.core.config import settings
+from app.core.graph_registry import GraphRegistry
+from app.orchestration.langgraph_orchestrator import LangGraphOrchestrator
+from app.services.langgraph_support_service import LangGraphSupportService
+
+QUERY = "I need a refund for a double charge on my last invoice"
+
+
+def _time_per_call(fn: Callable[[], object], requests: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<28} mean={statistics.mean(samples):8.3f} ms  "
+        f"p50={statistics.median(samples):8.3f} ms  p99={p99:8.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--with-sdk", action="store_true")
+    args = parser.parse_args()
+
+    if args.with_sdk:
+        settings.OPENAI_API_KEY = "sk-benchmark"
+
+    registry = GraphRegistry()
+    depends_on = LangGraphSupportService.settings_dependencies
+
+    def fresh_setup() -> LangGraphOrchestrator:
+        return LangGraphOrchestrator(service=LangGraphSupportService())
+
+    def registry_setup() -> LangGraphOrchestrator:
+        service = registry.get("langgraph_support", LangGraphSupportService, depends_on=depends_on)
+        return LangGraphOrchestrator(service=service)
+
+    # Warm imports so neither side pays first-import cost inside the loop.
+    fresh_setup()
+    registry_setup()
+
+    print(f"requests={args.requests} with_sdk={args.with_sdk}")
+    _report("setup: fresh service", _time_per_call(fresh_setup, args.requests))
+    _report("setup: registry", _time_per_call(registry_setup, args.requests))
+
+    if not args.with_sdk:
+        _report(
+            "request: fresh service",
+            _time_per_call(
+                lambda: asyncio.run(fresh_setup().process_support_message(QUERY)), args.requests
+            ),
+        )
+        _report(
+            "request: registry",
+            _time_per_call(
+                lambda: asyncio.run(registry_setup().process_support_message(QUERY)), args.requests
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
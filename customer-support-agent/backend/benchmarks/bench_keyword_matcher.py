@@ -0,0 +1,92 @@
+"""Rule-based keyword matching: per-keyword substring scans vs. the compiled matcher.
+
+Usage:
+    python -m benchmarks.bench_keyword_matcher [--keywords-per-label 100] [--query-words 400]
+
+The taxonomy is padded with synthetic keywords to a realistic size, and queries are long
+support messages, which is where one `keyword in text` scan per keyword hurts most.
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+from collections import Counter
+
+from app.services.support.keyword_matcher import KeywordMatcher
+
+BASE_TAXONOMY = {
+    "billing": ["refund", "charge", "billing", "invoice"],
+    "technical": ["error", "bug", "not working", "crash"],
+    "account": ["login", "password", "account", "profile"],
+    "orders": ["delivery", "shipping", "order", "tracking"],
+    "urgent": ["urgent", "asap", "immediately", "angry"],
+}
+
+
+def _synthetic_words(rng: random.Random, count: int) -> list[str]:
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(count)]
+
+
+def _legacy_counts(taxonomy: dict[str, list[str]], text: str) -> Counter[str]:
+    # Mirrors the previous implementation: lowercase copy, then one substring scan per keyword.
+    lowered = text.lower()
+    counts: Counter[str] = Counter()
+    for label, keywords in taxonomy.items():
+        for keyword in keywords:
+            if keyword in lowered:
+                counts[label] += 1
+    return counts
+
+
+def _time_us(fn, queries: list[str], rounds: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keywords-per-label", type=int, default=100)
+    parser.add_argument("--query-words", type=int, default=400)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    taxonomy = {
+        label: keywords + _synthetic_words(rng, args.keywords_per_label - len(keywords))
+        for label, keywords in BASE_TAXONOMY.items()
+    }
+    vocabulary = _synthetic_words(rng, 2000) + [word for words in taxonomy.values() for word in words]
+    queries = [" ".join(rng.choices(vocabulary, k=args.query_words)) for _ in range(args.queries)]
+
+    # The legacy scan matched substrings, so give a third of the compiled keywords the
+    # equivalent prefix wildcard.
+    compiled_taxonomy = {
+        label: [word + "*" if index % 3 == 0 else word for index, word in enumerate(words)]
+        for label, words in taxonomy.items()
+    }
+    urgent = compiled_taxonomy.pop("urgent")
+    matcher = KeywordMatcher(categories=compiled_taxonomy, signals={"urgent": urgent})
+
+    legacy = _time_us(lambda query: _legacy_counts(taxonomy, query), queries, args.rounds)
+    compiled = _time_us(matcher.count, queries, args.rounds)
+
+    keyword_total = sum(len(words) for words in taxonomy.values())
+    query_chars = statistics.mean(len(query) for query in queries)
+    print(f"keywords={keyword_total} query_chars~{query_chars:.0f} samples={len(legacy)}")
+    for label, samples in (("substring scans", legacy), ("compiled matcher", compiled)):
+        print(
+            f"{label:<18} mean={statistics.mean(samples):9.1f} us  "
+            f"p50={statistics.median(samples):9.1f} us"
+        )
+    print(f"speedup (mean): {statistics.mean(legacy) / statistics.mean(compiled):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
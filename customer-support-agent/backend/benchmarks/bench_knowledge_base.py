@@ -0,0 +1,85 @@
+"""Knowledge base search: index open time and per-query latency.
+
+Usage:
+    python -m benchmarks.bench_knowledge_base [--articles 5000] [--queries 2000]
+
+Articles are synthetic help-center pages drawn from a Zipf-like vocabulary, so common
+terms have long posting lists as in real text. Queries mix support phrasing with
+vocabulary terms.
+"""
+import argparse
+import random
+import statistics
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.support.knowledge_base import Article, KnowledgeBaseIndex, write_index
+
+SUPPORT_WORDS = ["refund", "invoice", "password", "login", "shipping", "order", "account"]
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    letters = string.ascii_lowercase
+    words = ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size)]
+    return SUPPORT_WORDS + words
+
+
+def _articles(rng: random.Random, vocabulary: list[str], count: int) -> list[Article]:
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [
+        Article(
+            title=" ".join(rng.choices(vocabulary, weights=weights, k=4)),
+            url=f"/help/{index}",
+            body=" ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(150, 600))),
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary = _vocabulary(rng, 20_000)
+    articles = _articles(rng, vocabulary, args.articles)
+    queries = [
+        f"how do I {rng.choice(SUPPORT_WORDS)} {' '.join(rng.choices(vocabulary[:2000], k=3))}"
+        for _ in range(args.queries)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "kb.index"
+        start = time.perf_counter()
+        write_index(articles, path)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = KnowledgeBaseIndex(path)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        index.search(queries[0])  # Fault in the pages touched by a typical query.
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(
+            f"articles={args.articles} index={path.stat().st_size / 1e6:.1f} MB "
+            f"build={build_seconds:.1f} s open={open_ms:.2f} ms"
+        )
+        print(
+            f"queries={args.queries} p50={statistics.median(latencies):.3f} ms "
+            f"p99={p99:.3f} ms max={ordered[-1]:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Wikipedia search throughput: a new AsyncClient per call vs. the shared pooled client.
+
+Usage:
+    python -m benchmarks.bench_wikipedia_client [--requests 300] [--concurrency 20]
+
+Searches hit a local HTTP/1.1 keep-alive stub that returns a canned search payload, so
+only client-side cost is measured: building an AsyncClient (and its TLS context) plus a
+new TCP connection per search, versus reusing pooled connections. Against the real API
+each avoided connection also saves a TLS handshake round trip, so the gap is larger.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+
+from app.clients.wikipedia_client import WikipediaClient
+from app.core.http_client import build_http_client
+
+PAYLOAD = json.dumps(
+    {"query": {"search": [{"title": f"Result {index}"} for index in range(5)]}}
+).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    # Headers and body go out in separate writes; without TCP_NODELAY a reused connection
+    # stalls ~40 ms on delayed ACKs, which would measure the stub rather than the client.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # Name required by http.server
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args: Any) -> None:
+        return None
+
+
+async def _legacy_search(base_url: str, query: str) -> list[dict[str, str]]:
+    # The previous WikipediaClient.search: one client (and connection) per call.
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.get(base_url, params={"srsearch": query})
+        response.raise_for_status()
+        return response.json()["query"]["search"]
+
+
+async def _run(
+    search: Callable[[str], Awaitable[object]],
+    requests: int,
+    concurrency: int,
+) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await search(f"query {index}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    return time.perf_counter() - start, latencies
+
+
+def _report(label: str, elapsed: float, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<30} {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50={statistics.median(latencies):7.2f} ms  p99={p99:7.2f} ms"
+    )
+
+
+async def _bench(base_url: str, requests: int, concurrency: int) -> None:
+    shared = build_http_client()
+    client = WikipediaClient(http_client=shared, base_url=base_url)
+    try:
+        # Warm both paths so imports and the first connection are not timed.
+        await _legacy_search(base_url, "warmup")
+        await client.search("warmup")
+
+        print(f"requests={requests} concurrency={concurrency}")
+        for mode, limit in (("sequential", 1), ("concurrent", concurrency)):
+            _report(
+                f"{mode}: client per call",
+                *await _run(lambda query: _legacy_search(base_url, query), requests, limit),
+            )
+            _report(f"{mode}: shared client", *await _run(client.search, requests, limit))
+    finally:
+        await shared.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/w/api.php"
+        asyncio.run(_bench(base_url, args.requests, args.concurrency))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
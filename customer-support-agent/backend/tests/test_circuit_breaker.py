@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.support.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.services.support.llm_router import LatencyTracker, LLMRouter
+
+
+def test_breaker_opens_probes_and_recloses(clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_open_breaker_skips_provider_calls() -> None:
+    calls: list[str] = []
+
+    async def failing(backend: str, prompt: str, json_mode: bool) -> str:
+        calls.append(backend)
+        raise ConnectionError("provider brownout")
+
+    router = LLMRouter(failing, breaker_failure_threshold=3)
+
+    async def scenario() -> list[str | None]:
+        return [await router.complete(["openai"], "hi") for _ in range(10)]
+
+    assert asyncio.run(scenario()) == [None] * 10
+    assert len(calls) == 3
+    assert router.stats()["openai_breaker_open"] == 1
+    assert router.stats()["short_circuits"] == 7
+
+
+def test_timeout_adapts_to_node_latency() -> None:
+    async def slow(backend: str, prompt: str, json_mode: bool) -> str:
+        await asyncio.sleep(5)
+        return "too late"
+
+    router = LLMRouter(
+        slow,
+        hedge_min_samples=10,
+        timeout_multiplier=2.0,
+        timeout_min_seconds=0.05,
+        timeout_max_seconds=20.0,
+    )
+    tracker = LatencyTracker()
+    for _ in range(10):
+        tracker.record(0.04)
+    router._node_latency[("openai", "categorize")] = tracker
+
+    assert router.timeout_for("openai", "categorize") == 0.08
+    assert router.timeout_for("openai", "respond") == 20.0
+
+    start = time.perf_counter()
+    assert asyncio.run(router.complete(["openai"], "hi", node="categorize")) is None
+    assert time.perf_counter() - start < 1.0
+    assert router.stats()["timeouts"] == 1
+
+
+def test_support_service_uses_rules_while_breaker_is_open() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    calls: list[str] = []
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        calls.append(prompt)
+        return "Handled by the model."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    breaker = service._router.breaker("fake")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    result = asyncio.run(service.run("I need a refund for a double charge"))
+
+    assert calls == []
+    assert result["category"] == "billing"
+    assert result["category_source"] == "rules_fallback"
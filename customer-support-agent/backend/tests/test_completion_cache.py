@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.support.completion_cache import (
+    CompletionCache,
+    InMemoryCompletionStore,
+    parse_node_ttls,
+)
+
+
+def test_parse_node_ttls() -> None:
+    parsed = parse_node_ttls("categorize=3600, respond=30,bad")
+    assert parsed == {"categorize": 3600.0, "respond": 30.0}
+
+
+@pytest.mark.parametrize("raw", ["respond=soon", "respond=-5"])
+def test_parse_node_ttls_rejects_bad_values(raw: str) -> None:
+    with pytest.raises(ValueError, match="COMPLETION_CACHE_NODE_TTLS entry 'respond="):
+        parse_node_ttls(raw)
+
+
+def test_store_is_size_bounded_lru() -> None:
+    store = InMemoryCompletionStore(max_entries=2)
+
+    async def scenario() -> None:
+        await store.set("a", "1", 60)
+        await store.set("b", "2", 60)
+        assert await store.get("a") == "1"
+        await store.set("c", "3", 60)
+        assert await store.get("b") is None
+        assert await store.get("a") == "1"
+
+    asyncio.run(scenario())
+    assert len(store) == 2
+
+
+def test_per_node_ttl_expires_entries(clock) -> None:
+    cache = CompletionCache(
+        InMemoryCompletionStore(max_entries=10, clock=clock),
+        default_ttl_seconds=60,
+        node_ttls={"respond": 5, "analyze": 0},
+    )
+    calls: list[str] = []
+
+    async def compute() -> str:
+        calls.append("call")
+        return "text"
+
+    async def scenario() -> None:
+        await cache.get_or_compute("k", "respond", compute)
+        await cache.get_or_compute("k", "respond", compute)
+        clock.now = 6
+        await cache.get_or_compute("k", "respond", compute)
+        await cache.get_or_compute("other", "analyze", compute)
+        await cache.get_or_compute("other", "analyze", compute)
+
+    asyncio.run(scenario())
+    # respond: miss, hit, expired miss; analyze has TTL 0 so it is never cached.
+    assert len(calls) == 4
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_identical_prompts_share_one_call() -> None:
+    cache = CompletionCache(InMemoryCompletionStore(max_entries=10), default_ttl_seconds=60)
+    calls: list[str] = []
+
+    async def compute() -> str:
+        calls.append("call")
+        await asyncio.sleep(0.02)
+        return "billing"
+
+    async def scenario() -> list[str | None]:
+        calls_in_flight = (cache.get_or_compute("k", "categorize", compute) for _ in range(10))
+        return await asyncio.gather(*calls_in_flight)
+
+    results = asyncio.run(scenario())
+
+    assert results == ["billing"] * 10
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 9
+
+
+def test_follower_takes_over_when_the_leader_is_cancelled() -> None:
+    cache = CompletionCache(InMemoryCompletionStore(max_entries=10), default_ttl_seconds=60)
+    calls: list[str] = []
+
+    async def compute() -> str:
+        calls.append("call")
+        await asyncio.sleep(0.02)
+        return "billing"
+
+    async def scenario() -> list[str | None]:
+        leader = asyncio.create_task(cache.get_or_compute("k", "categorize", compute))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(cache.get_or_compute("k", "categorize", compute))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(scenario())
+
+    assert results == ["billing"] * 3
+    assert len(calls) == 2
+    assert cache.stats()["coalesced"] == 2
+    assert not cache._inflight
+
+
+def test_failed_completions_are_not_cached() -> None:
+    cache = CompletionCache(InMemoryCompletionStore(max_entries=10), default_ttl_seconds=60)
+
+    async def compute() -> None:
+        return None
+
+    asyncio.run(cache.get_or_compute("k", "respond", compute))
+    asyncio.run(cache.get_or_compute("k", "respond", compute))
+
+    assert cache.stats()["misses"] == 2
+
+
+def test_support_service_reuses_completions() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    prompts: list[str] = []
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        prompts.append(prompt)
+        return "billing" if prompt.startswith("Categorize") else "From the model."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    asyncio.run(service.run("where is my invoice"))
+    asyncio.run(service.run("where is my invoice"))
+
+    assert len(prompts) == 3
+    assert service.cache_stats()["completion"]["hits"] == 3
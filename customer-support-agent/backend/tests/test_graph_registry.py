@@ -0,0 +1,190 @@
+import asyncio
+import time
+
+import pytest
+from anyio import to_thread
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.deps import (
+    get_jsonplaceholder_orchestrator,
+    get_langgraph_orchestrator,
+    get_llm_orchestrator,
+    get_search_orchestrator,
+)
+from app.core.graph_registry import GraphRegistry
+from app.main import app
+from app.services.langgraph_support_service import LangGraphSupportService
+
+
+def test_registry_builds_once_per_fingerprint() -> None:
+    registry = GraphRegistry()
+    built: list[object] = []
+
+    def factory() -> object:
+        built.append(object())
+        return built[-1]
+
+    first = registry.get("workflow", factory, depends_on=("LLM_MODEL",))
+    second = registry.get("workflow", factory, depends_on=("LLM_MODEL",))
+
+    assert first is second
+    assert len(built) == 1
+
+
+def test_registry_rebuilds_when_settings_change() -> None:
+    registry = GraphRegistry()
+    previous = settings.LLM_MODEL
+    try:
+        first = registry.get("workflow", object, depends_on=("LLM_MODEL",))
+        settings.LLM_MODEL = "gpt-4.1-mini"
+        second = registry.get("workflow", object, depends_on=("LLM_MODEL",))
+    finally:
+        settings.LLM_MODEL = previous
+
+    assert first is not second
+
+
+def test_langgraph_orchestrator_reuses_service() -> None:
+    assert get_langgraph_orchestrator().service is get_langgraph_orchestrator().service
+
+
+def test_factories_can_fetch_other_entries() -> None:
+    registry = GraphRegistry()
+
+    outer = registry.get("outer", lambda: ("outer", registry.get("inner", object)))
+
+    assert outer[1] is registry.get("inner", object)
+
+
+def test_override_replaces_an_entry_inside_the_block() -> None:
+    registry = GraphRegistry()
+    built = registry.get("cache", object)
+    stand_in = object()
+
+    with registry.override("cache", stand_in):
+        assert registry.get("cache", object) is stand_in
+    assert registry.get("cache", object) is built
+
+
+def test_aclose_releases_current_and_replaced_entries_newest_first() -> None:
+    registry = GraphRegistry()
+    closed: list[str] = []
+
+    class Resource:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def close(self) -> None:
+            closed.append(self.name)
+
+    class AsyncResource(Resource):
+        async def aclose(self) -> None:
+            closed.append(self.name)
+
+    previous = settings.LLM_MODEL
+    try:
+        registry.get("client", lambda: Resource("old client"), depends_on=("LLM_MODEL",))
+        settings.LLM_MODEL = "gpt-4.1-mini"
+        registry.get("client", lambda: Resource("new client"), depends_on=("LLM_MODEL",))
+    finally:
+        settings.LLM_MODEL = previous
+    registry.get("service", lambda: AsyncResource("service"))
+    registry.get("plain", object)
+
+    asyncio.run(registry.aclose())
+
+    assert closed == ["service", "new client", "old client"]
+    assert registry.get("service", object) is not None
+
+
+def test_replaced_entries_are_closed_on_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = GraphRegistry()
+    closed: list[str] = []
+
+    class AsyncResource:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        async def aclose(self) -> None:
+            closed.append(self.name)
+
+    def build(name: str) -> AsyncResource:
+        return registry.get("service", lambda: AsyncResource(name), depends_on=("LLM_MODEL",))
+
+    async def scenario() -> None:
+        build("first")
+        monkeypatch.setattr(settings, "LLM_MODEL", "gpt-4.1-mini")
+        # Sync dependencies are resolved in a worker thread, away from the event loop.
+        await to_thread.run_sync(build, "second")
+        monkeypatch.setattr(settings, "LLM_MODEL", "gpt-4.1")
+        build("third")
+        await asyncio.sleep(0)
+        assert closed == ["first", "second"]
+        await registry.aclose()
+
+    asyncio.run(scenario())
+
+    assert closed == ["first", "second", "third"]
+
+
+def test_settings_change_closes_the_replaced_support_service(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    closed: list[LangGraphSupportService] = []
+    original_aclose = LangGraphSupportService.aclose
+
+    async def recording_aclose(self: LangGraphSupportService) -> None:
+        closed.append(self)
+        await original_aclose(self)
+
+    monkeypatch.setattr(LangGraphSupportService, "aclose", recording_aclose)
+    with TestClient(app) as client:
+        client.get("/api/langgraph/triage/stats")
+        first = get_langgraph_orchestrator().service
+        monkeypatch.setattr(settings, "LLM_MODEL", "gpt-4.1-mini")
+        client.get("/api/langgraph/triage/stats")
+        deadline = time.monotonic() + 1
+        while not closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Closed while the app keeps serving, not only at shutdown.
+        assert closed == [first]
+
+
+def test_aclose_keeps_going_when_a_resource_fails_to_close(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    registry = GraphRegistry()
+    closed: list[str] = []
+
+    class Broken:
+        async def aclose(self) -> None:
+            raise RuntimeError("connection already gone")
+
+    class Resource:
+        def close(self) -> None:
+            closed.append("client")
+
+    registry.get("client", Resource)
+    registry.get("broken", Broken)
+
+    asyncio.run(registry.aclose())
+
+    assert closed == ["client"]
+    assert "Failed to close Broken" in caplog.text
+
+
+def test_dependencies_share_app_scoped_orchestrators() -> None:
+    assert get_search_orchestrator() is get_search_orchestrator()
+    assert get_jsonplaceholder_orchestrator() is get_jsonplaceholder_orchestrator()
+    assert get_llm_orchestrator() is get_llm_orchestrator()
+    assert get_langgraph_orchestrator() is get_langgraph_orchestrator()
+
+
+def test_lifespan_closes_app_scoped_resources() -> None:
+    with TestClient(app) as client:
+        client.get("/api/health")
+        orchestrator = get_search_orchestrator()
+
+    assert get_search_orchestrator() is not orchestrator
@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+from app.services.support.keyword_matcher import KeywordMatcher
+
+
+def test_matches_whole_words_wildcards_and_phrases() -> None:
+    matcher = KeywordMatcher(
+        categories={"billing": ["invoice", "refund*"], "technical": ["not working", "bug"]},
+        signals={"urgent": ["asap"]},
+    )
+
+    hits = matcher.count("Refunded twice, invoice missing, checkout NOT   working ASAP")
+
+    assert hits == {"billing": 2, "technical": 1, "urgent": 1}
+    # Word boundaries: no matches inside longer words.
+    assert matcher.count("debugging invoices") == {}
+
+
+def test_loads_taxonomy_file_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "taxonomy.json"
+    path.write_text(
+        json.dumps({"categories": {"orders": ["order*"], "billing": ["charge*"]}, "signals": {}}),
+        encoding="utf-8",
+    )
+
+    matcher = KeywordMatcher.from_file(path)
+
+    assert matcher.categories == ["orders", "billing"]
+    assert matcher.count("my order was charged") == {"orders": 1, "billing": 1}
+
+
+def test_default_taxonomy_covers_rule_keywords() -> None:
+    matcher = KeywordMatcher.from_file()
+
+    assert matcher.count("The app keeps crashing with an error")["technical"] == 2
+    assert matcher.count("this is urgent")["urgent"] == 1
@@ -0,0 +1,200 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from app.clients.knowledge_base_client import KnowledgeBaseClient
+from app.core.config import settings
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.search_service import SearchService
+from app.services.support.knowledge_base import (
+    Article,
+    KnowledgeBaseIndex,
+    load_articles,
+    tokenize,
+    write_index,
+)
+
+
+def _write_articles(directory: Path) -> None:
+    (directory / "billing").mkdir()
+    (directory / "billing" / "refund-policy.md").write_text(
+        "# Refund policy\n\nRefunds are issued to the original payment method within 5 days.\n",
+        encoding="utf-8",
+    )
+    (directory / "password.md").write_text(
+        "---\ntitle: Reset your password\nurl: https://help.example.com/password\n---\n"
+        "Use the forgot password link on the login page to reset it.\n",
+        encoding="utf-8",
+    )
+    (directory / "shipping.json").write_text(
+        json.dumps(
+            [
+                {"title": "Shipping times", "body": "Orders ship within two business days."},
+                {"title": "Tracking an order", "body": "Tracking numbers arrive by email."},
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def index_path(tmp_path: Path) -> Path:
+    articles = tmp_path / "articles"
+    articles.mkdir()
+    _write_articles(articles)
+    write_index(load_articles(articles), tmp_path / "kb.index")
+    return tmp_path / "kb.index"
+
+
+@pytest.fixture
+def index(index_path: Path) -> KnowledgeBaseIndex:
+    return KnowledgeBaseIndex(index_path)
+
+
+@pytest.fixture
+def support_service(index_path: Path, monkeypatch: pytest.MonkeyPatch) -> LangGraphSupportService:
+    monkeypatch.setattr(settings, "KNOWLEDGE_BASE_INDEX_PATH", str(index_path))
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    service.prompts = []  # type: ignore[attr-defined]
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        service.prompts.append(prompt)  # type: ignore[attr-defined]
+        return "billing" if prompt.startswith("Categorize") else "Generated answer."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    return service
+
+
+def test_tokenize_drops_stopwords_and_folds_plurals() -> None:
+    assert tokenize("Where are my Refunds?") == ["refund"]
+
+
+def test_loader_reads_markdown_front_matter_and_json_lists(tmp_path: Path) -> None:
+    _write_articles(tmp_path)
+
+    articles = {article.title: article.url for article in load_articles(tmp_path)}
+
+    assert articles == {
+        "Refund policy": "/help/billing/refund-policy",
+        "Reset your password": "https://help.example.com/password",
+        "Shipping times": "/help/shipping#0",
+        "Tracking an order": "/help/shipping#1",
+    }
+
+
+def test_search_ranks_by_bm25(index: KnowledgeBaseIndex) -> None:
+    results = index.search("how do I get a refund", limit=3)
+
+    assert [document["title"] for _, document in results] == ["Refund policy"]
+    assert results[0][0] > 0
+
+
+def test_title_matches_outrank_body_matches(tmp_path: Path) -> None:
+    write_index(
+        [
+            Article("Billing overview", "/a", "Questions about an invoice go to support."),
+            Article("Invoice downloads", "/b", "Download copies from the account page."),
+        ],
+        tmp_path / "kb.index",
+    )
+
+    results = KnowledgeBaseIndex(tmp_path / "kb.index").search("invoice")
+
+    assert [document["url"] for _, document in results] == ["/b", "/a"]
+
+
+def test_unknown_terms_and_empty_index_return_nothing(tmp_path: Path) -> None:
+    write_index([], tmp_path / "empty.index")
+
+    assert KnowledgeBaseIndex(tmp_path / "empty.index").search("refund") == []
+
+
+def test_rejects_files_that_are_not_indexes(tmp_path: Path) -> None:
+    (tmp_path / "bogus.index").write_bytes(b"not an index" * 10)
+
+    with pytest.raises(ValueError):
+        KnowledgeBaseIndex(tmp_path / "bogus.index")
+
+
+def test_client_plugs_into_search_service(index: KnowledgeBaseIndex) -> None:
+    service = SearchService(sources=[KnowledgeBaseClient(index=index)])
+
+    search = asyncio.run(service.federated_search("track my order"))
+
+    assert search.results == [
+        {"title": "Tracking an order", "url": "/help/shipping#1", "source": "knowledge_base"},
+        {"title": "Shipping times", "url": "/help/shipping#0", "source": "knowledge_base"},
+    ]
+    assert search.lookups[0].status == "BYPASS"
+
+
+def test_confident_match_returns_the_canonical_answer(
+    support_service: LangGraphSupportService,
+) -> None:
+    result = asyncio.run(support_service.run("reset my password"))
+
+    assert result["response"] == "Use the forgot password link on the login page to reset it."
+    assert result["response_source"] == "knowledge_base"
+    assert not any(prompt.startswith("Write a concise") for prompt in support_service.prompts)
+    assert support_service.response_stats()["llm_calls_saved"] == 1
+
+
+def test_weak_match_grounds_the_generated_response(
+    support_service: LangGraphSupportService,
+) -> None:
+    result = asyncio.run(support_service.run("refund for a double charge"))
+
+    respond_prompt = next(p for p in support_service.prompts if p.startswith("Write a concise"))
+    assert result["response"] == "Generated answer."
+    assert result["response_source"] == "llm"
+    assert "Refund policy (/help/billing/refund-policy): Refunds are issued" in respond_prompt
+    assert support_service.response_stats()["grounded"] == 1
+
+
+def test_streamed_response_uses_the_canonical_answer(
+    support_service: LangGraphSupportService,
+) -> None:
+    async def collect() -> list[tuple[str, dict]]:
+        return [item async for item in support_service.run_stream("reset my password")]
+
+    events = asyncio.run(collect())
+
+    assert [event for event, _ in events] == ["category", "analysis", "delta", "done"]
+    assert events[-1][1]["response_source"] == "knowledge_base"
+
+
+def test_fused_mode_answers_from_the_knowledge_base_first(
+    support_service: LangGraphSupportService,
+) -> None:
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        support_service.prompts.append(prompt)  # type: ignore[attr-defined]
+        return '{"category": "account", "analysis": "Locked out, low urgency."}'
+
+    support_service._call_backend = backend  # type: ignore[method-assign]
+    result = asyncio.run(support_service.run("reset my password", pipeline_mode="fused"))
+
+    assert result["pipeline_mode"] == "fused"
+    assert result["category"] == "account"
+    assert result["response"] == "Use the forgot password link on the login page to reset it."
+    assert result["response_source"] == "knowledge_base"
+    assert '"response"' not in support_service.prompts[0]  # type: ignore[attr-defined]
+
+
+def test_fused_mode_grounds_the_generated_response(
+    support_service: LangGraphSupportService,
+) -> None:
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        support_service.prompts.append(prompt)  # type: ignore[attr-defined]
+        return '{"category": "billing", "analysis": "Refund.", "response": "Refunded."}'
+
+    support_service._call_backend = backend  # type: ignore[method-assign]
+    result = asyncio.run(support_service.run("refund for a double charge", pipeline_mode="fused"))
+
+    assert result["response"] == "Refunded."
+    assert result["response_source"] == "llm"
+    fused_prompt = support_service.prompts[0]  # type: ignore[attr-defined]
+    assert "Refund policy (/help/billing/refund-policy): Refunds are issued" in fused_prompt
+    assert support_service.response_stats()["grounded"] == 1
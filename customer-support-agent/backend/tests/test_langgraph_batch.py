@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.langgraph_support_service import LangGraphSupportService
+
+
+def test_batch_endpoint_streams_ndjson() -> None:
+    client = TestClient(app)
+    queries = ["I need a refund", "The app keeps crashing", "reset my password", "hello there"]
+    response = client.post(
+        "/api/langgraph/support/batch",
+        json={"queries": queries, "concurrency": 2},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    by_index = {line["index"]: line for line in lines}
+    assert sorted(by_index) == [0, 1, 2, 3]
+    assert by_index[0]["category"] == "billing"
+    assert by_index[1]["category"] == "technical"
+    assert by_index[2]["query"] == "reset my password"
+
+
+def test_batch_respects_concurrency_limit() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    in_flight = 0
+    peak = 0
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "general"
+
+    service._call_backend = backend  # type: ignore[method-assign]
+
+    async def collect() -> list[int]:
+        queries = [f"question number {index}" for index in range(20)]
+        return [index async for index, _ in service.run_batch(queries, concurrency=3)]
+
+    indexes = asyncio.run(collect())
+
+    assert sorted(indexes) == list(range(20))
+    assert peak <= 3
+
+
+def test_batch_packs_categorization_into_one_call() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    categorize_prompts: list[str] = []
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        if prompt.startswith("Categorize each numbered"):
+            categorize_prompts.append(prompt)
+            return '{"1": "orders", "2": "account", "3": "not-a-label"}'
+        if prompt.startswith("Categorize"):
+            return "billing"
+        return "From the model."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+
+    async def collect() -> dict[int, dict]:
+        queries = ["where is my parcel", "cannot log in", "double charged"]
+        results = service.run_batch(queries, pack_categorization=True)
+        return {index: result async for index, result in results}  # type: ignore[misc]
+
+    results = asyncio.run(collect())
+
+    assert len(categorize_prompts) == 1
+    assert results[0]["category"] == "orders"
+    assert results[1]["category"] == "account"
+    # Invalid packed labels fall back to the per-query categorize node.
+    assert results[2]["category"] == "billing"
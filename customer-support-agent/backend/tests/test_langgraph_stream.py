@@ -0,0 +1,272 @@
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Self, cast
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import llm_service as llm_service_module
+from app.services.langgraph_support_service import LangGraphSupportService, SupportState
+from app.services.llm.base import StreamEvent
+from app.services.support.circuit_breaker import CLOSED, OPEN
+from app.services.support.rate_limiter import InMemoryRateLimiter
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def _collect(service: LangGraphSupportService, query: str) -> list[tuple[str, dict]]:
+    return [item async for item in service.run_stream(query)]
+
+
+def test_stream_emits_node_events_then_response_tokens() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        return "billing" if prompt.startswith("Categorize") else "Duplicate charge."
+
+    def stream(prompt: str, *args: object) -> Iterator[StreamEvent]:
+        for text in ("Sorry ", "about ", "that."):
+            yield StreamEvent(kind="delta", text=text)
+        yield StreamEvent(kind="done", response_id="resp_1")
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    service._stream_llm = stream  # type: ignore[method-assign]
+
+    events = asyncio.run(_collect(service, "I was charged twice"))
+
+    assert [name for name, _ in events] == [
+        "category", "analysis", "delta", "delta", "delta", "done",
+    ]
+    assert events[0][1] == {"category": "billing", "category_source": "llm"}
+    assert events[1][1] == {"analysis": "Duplicate charge."}
+    assert events[-1][1]["response"] == "Sorry about that."
+
+
+def test_stream_falls_back_when_provider_stream_fails() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str | None:
+        return None
+
+    def broken_stream(prompt: str, *args: object) -> Iterator[StreamEvent]:
+        raise RuntimeError("stream unavailable")
+        yield StreamEvent(kind="delta", text="")
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    service._stream_llm = broken_stream  # type: ignore[method-assign]
+
+    events = asyncio.run(_collect(service, "I need a refund for a double charge"))
+
+    deltas = [data["text"] for name, data in events if name == "delta"]
+    assert len(deltas) == 1
+    assert events[-1][1]["response"] == deltas[0]
+    assert events[-1][1]["category"] == "billing"
+
+
+class _GeminiStream:
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        return None
+
+    def __iter__(self) -> Iterator[StreamEvent]:
+        yield StreamEvent(kind="delta", text="Sorry.")
+        yield StreamEvent(kind="done")
+
+
+def test_stream_uses_the_backend_with_credentials(monkeypatch) -> None:
+    # LLM_PROVIDER names OpenAI, but only a Gemini key is configured.
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "")
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+    requested: list[str | None] = []
+
+    def get_provider(name: str | None = None) -> SimpleNamespace:
+        requested.append(name)
+        return SimpleNamespace(stream_chat=lambda **_: _GeminiStream())
+
+    monkeypatch.setattr(llm_service_module, "get_llm_provider", get_provider)
+    service = LangGraphSupportService()
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        return "billing" if prompt.startswith("Categorize") else "Duplicate charge."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+
+    events = asyncio.run(_collect(service, "I was charged twice"))
+
+    assert service._llm_backend == "gemini"
+    assert requested == ["gemini"]
+    assert events[-1][1]["response"] == "Sorry."
+    assert events[-1][1]["response_source"] == "llm"
+
+
+def test_stream_endpoint_returns_server_sent_events() -> None:
+    client = TestClient(app)
+    response = client.post("/api/langgraph/support/stream", json={"query": "where is my invoice"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert events[0] == ("category", {"category": "billing", "category_source": "rules_fallback"})
+    assert events[-1][0] == "done"
+    assert events[-1][1]["response"].strip()
+
+
+class _RecordingSemanticCache:
+    def __init__(self) -> None:
+        self.stored: list[dict] = []
+
+    async def lookup(self, query: str, scope: str = "") -> None:
+        return None
+
+    async def store(self, query: str, result: dict, scope: str = "") -> None:
+        self.stored.append(result)
+
+
+def test_stream_cut_off_mid_response_is_marked_and_not_cached() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    cache = _RecordingSemanticCache()
+    service._semantic_cache = cache  # type: ignore[assignment]
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        return "billing" if prompt.startswith("Categorize") else "Duplicate charge."
+
+    def dropped_stream(prompt: str, *args: object) -> Iterator[StreamEvent]:
+        yield StreamEvent(kind="delta", text="Sorry ")
+        raise ConnectionError("connection reset")
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    service._stream_llm = dropped_stream  # type: ignore[method-assign]
+
+    events = asyncio.run(_collect(service, "I was charged twice"))
+
+    assert events[-1][1]["response"] == "Sorry "
+    assert events[-1][1]["truncated"] is True
+    assert cache.stored == []
+
+
+def test_client_disconnect_stops_the_provider_stream() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    closed = threading.Event()
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        return "billing" if prompt.startswith("Categorize") else "Duplicate charge."
+
+    def slow_stream(prompt: str, *args: object) -> Iterator[StreamEvent]:
+        try:
+            for index in range(100):
+                time.sleep(0.02)  # A blocking SDK read
+                yield StreamEvent(kind="delta", text=f"token {index} ")
+        finally:
+            closed.set()
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    service._stream_llm = slow_stream  # type: ignore[method-assign]
+
+    async def disconnect_after_first_token() -> None:
+        first_token = asyncio.Event()
+
+        async def consume() -> None:
+            async for name, _ in service.run_stream("I was charged twice"):
+                if name == "delta":
+                    first_token.set()
+
+        task = asyncio.create_task(consume())
+        await first_token.wait()
+        # Starlette cancels the response task while it waits for the next token.
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(disconnect_after_first_token())
+
+    assert closed.wait(timeout=1)
+
+
+def _stream_once(service: LangGraphSupportService, stream: object) -> str:
+    """Run only the streaming respond step; the non-streaming fallback is stubbed out."""
+
+    async def respond(state: SupportState) -> SupportState:
+        return {**state, "response": "Rules reply.", "response_source": "rules_fallback"}
+
+    service._stream_llm = stream  # type: ignore[method-assign]
+    service._respond_node = respond  # type: ignore[method-assign]
+    state = cast(
+        SupportState,
+        {"query": "I was charged twice", "category": "billing", "analysis": "", "passages": []},
+    )
+
+    async def drain() -> str:
+        return "".join([event.text async for event in service._stream_response(state)])
+
+    return asyncio.run(drain())
+
+
+def test_stream_failures_open_the_breaker() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    breaker = service._router.breaker("fake")
+    attempts: list[str] = []
+
+    def broken_stream(prompt: str, *args: object) -> Iterator[StreamEvent]:
+        attempts.append(prompt)
+        raise ConnectionError("connection reset")
+        yield StreamEvent(kind="delta", text="")
+
+    for _ in range(breaker.failure_threshold):
+        assert _stream_once(service, broken_stream) == "Rules reply."
+
+    assert breaker.state == OPEN
+    assert _stream_once(service, broken_stream) == "Rules reply."
+    assert len(attempts) == breaker.failure_threshold
+
+
+def test_completed_stream_resets_breaker_failures() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    breaker = service._router.breaker("fake")
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.record_failure()
+
+    def stream(prompt: str, *args: object) -> Iterator[StreamEvent]:
+        yield StreamEvent(kind="delta", text="Sorry.")
+
+    assert _stream_once(service, stream) == "Sorry."
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_stream_refused_by_the_rate_limiter_takes_the_fallback() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    service._router.limiter = InMemoryRateLimiter(requests_per_minute=1, tokens_per_minute=100_000)
+    service._router.limit_max_wait_seconds = 0
+    attempts: list[str] = []
+
+    def stream(prompt: str, *args: object) -> Iterator[StreamEvent]:
+        attempts.append(prompt)
+        yield StreamEvent(kind="delta", text="Sorry.")
+
+    assert _stream_once(service, stream) == "Sorry."
+    assert _stream_once(service, stream) == "Rules reply."
+    assert len(attempts) == 1
+    assert service._router.stats()["throttled"] == 1
+    assert service._router.breaker("fake").state == CLOSED
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from app.core.config import settings
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.support.llm_router import LatencyTracker, LLMRouter
+
+
+def _backend(delays: dict[str, float], failing: frozenset[str] = frozenset()):
+    calls: list[str] = []
+    cancelled: list[str] = []
+
+    async def call(backend: str, prompt: str, json_mode: bool) -> str:
+        calls.append(backend)
+        try:
+            await asyncio.sleep(delays[backend])
+        except asyncio.CancelledError:
+            cancelled.append(backend)
+            raise
+        if backend in failing:
+            raise ConnectionError(f"{backend} unavailable")
+        return f"answer from {backend}"
+
+    return call, calls, cancelled
+
+
+def test_hedge_sends_secondary_when_primary_is_slow_and_cancels_the_loser() -> None:
+    call, calls, cancelled = _backend({"openai": 1.0, "gemini": 0.01})
+    router = LLMRouter(call, mode="hedge", hedge_default_delay_seconds=0.05)
+
+    start = time.perf_counter()
+    text = asyncio.run(router.complete(["openai", "gemini"], "hi"))
+    elapsed = time.perf_counter() - start
+
+    assert text == "answer from gemini"
+    assert calls == ["openai", "gemini"]
+    assert cancelled == ["openai"]
+    assert elapsed < 0.5
+    assert router.stats()["hedge_wins"] == 1
+
+
+def test_hedge_is_not_sent_when_primary_answers_in_time() -> None:
+    call, calls, _ = _backend({"openai": 0.01, "gemini": 0.01})
+    router = LLMRouter(call, mode="hedge", hedge_default_delay_seconds=0.5)
+
+    assert asyncio.run(router.complete(["openai", "gemini"], "hi")) == "answer from openai"
+    assert calls == ["openai"]
+    assert router.stats()["hedges"] == 0
+
+
+def test_failover_moves_to_next_provider_on_error() -> None:
+    call, calls, _ = _backend({"openai": 0.0, "gemini": 0.0}, failing=frozenset({"openai"}))
+    router = LLMRouter(call, mode="failover")
+
+    assert asyncio.run(router.complete(["openai", "gemini"], "hi")) == "answer from gemini"
+    assert calls == ["openai", "gemini"]
+    assert router.stats()["failovers"] == 1
+
+
+def test_hedge_delay_follows_observed_latency_percentile() -> None:
+    router = LLMRouter(lambda *args: None, mode="hedge", hedge_min_samples=10)
+    tracker = LatencyTracker()
+    for millis in range(1, 101):
+        tracker.record(millis / 1000)
+    router._latency["openai"] = tracker
+
+    assert router.hedge_delay("openai") == 0.096
+    assert router.hedge_delay("gemini") == router.hedge_default_delay_seconds
+
+
+def test_support_service_fails_over_between_backends(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_ROUTING_MODE", "failover")
+    service = LangGraphSupportService()
+    service._llm_backend = "primary"
+    service._fallback_backends = ["secondary"]
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str | None:
+        if backend == "primary":
+            raise TimeoutError("primary timed out")
+        return "orders" if prompt.startswith("Categorize") else "From the secondary."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    result = asyncio.run(service.run("hello there"))
+
+    assert result["category"] == "orders"
+    assert result["response"] == "From the secondary."
@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Self
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import (
+    GRAPH_NODE_SECONDS,
+    LLM_ERRORS,
+    LLM_FALLBACKS,
+    LLM_REQUEST_SECONDS,
+    LLM_TIME_TO_FIRST_TOKEN_SECONDS,
+    LLM_TOKENS,
+    MetricsRegistry,
+)
+from app.main import app
+from app.services import llm_service as llm_service_module
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.llm.base import StreamEvent
+from app.services.llm_service import LLMService
+
+
+def test_histogram_renders_cumulative_prometheus_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("node",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'say "hi"')
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP demo_seconds Demo.", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{node="say \\"hi\\"",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{node="say \\"hi\\"",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{node="say \\"hi\\"",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{node="say \\"hi\\""} 4' in lines
+
+
+def test_support_run_records_node_latency_errors_and_fallbacks() -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    labels = ("analyze", "fake", service._default_model_for("fake"))
+    before_calls = LLM_REQUEST_SECONDS.count("categorize", *labels[1:])
+    before_errors = LLM_ERRORS.value(*labels)
+    before_fallbacks = LLM_FALLBACKS.value("analyze", "fake")
+    before_nodes = GRAPH_NODE_SECONDS.count("support", "respond")
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str | None:
+        if prompt.startswith("Categorize"):
+            return "billing"
+        if prompt.startswith("Write a one-sentence"):
+            raise RuntimeError("provider error")
+        return "We are on it."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+
+    result = asyncio.run(service.run("I was charged twice"))
+
+    assert result["category"] == "billing"
+    assert LLM_REQUEST_SECONDS.count("categorize", *labels[1:]) == before_calls + 1
+    assert LLM_ERRORS.value(*labels) == before_errors + 1
+    assert LLM_FALLBACKS.value("analyze", "fake") == before_fallbacks + 1
+    assert GRAPH_NODE_SECONDS.count("support", "respond") == before_nodes + 1
+
+
+class _FakeStream:
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        return None
+
+    def __iter__(self):
+        yield StreamEvent(kind="delta", text="Hi")
+        usage = SimpleNamespace(input_tokens=12, output_tokens=3)
+        yield StreamEvent(kind="done", response_id="resp_1", usage=usage)
+
+
+def test_stream_chat_records_time_to_first_token_and_usage(monkeypatch) -> None:
+    provider = SimpleNamespace(stream_chat=lambda **_: _FakeStream())
+    monkeypatch.setattr(llm_service_module, "get_llm_provider", lambda name=None: provider)
+    monkeypatch.setattr(llm_service_module.settings, "LLM_PROVIDER", "openai")
+    before_ttft = LLM_TIME_TO_FIRST_TOKEN_SECONDS.count("greet", "openai", "m")
+    before_output = LLM_TOKENS.value("greet", "openai", "m", "output")
+
+    with LLMService().stream_chat(model="m", input_items=[], node="greet") as events:
+        texts = [event.text for event in events if event.kind == "delta"]
+
+    assert texts == ["Hi"]
+    assert LLM_TIME_TO_FIRST_TOKEN_SECONDS.count("greet", "openai", "m") == before_ttft + 1
+    assert LLM_TOKENS.value("greet", "openai", "m", "output") == before_output + 3
+
+
+def test_stream_chat_records_duration_when_closed_early(monkeypatch) -> None:
+    provider = SimpleNamespace(stream_chat=lambda **_: _FakeStream())
+    monkeypatch.setattr(llm_service_module, "get_llm_provider", lambda name=None: provider)
+    monkeypatch.setattr(llm_service_module.settings, "LLM_PROVIDER", "openai")
+    before = LLM_REQUEST_SECONDS.count("early", "openai", "m")
+
+    with LLMService().stream_chat(model="m", input_items=[], node="early") as stream:
+        events = iter(stream)
+        assert next(events).text == "Hi"
+        events.close()  # type: ignore[attr-defined]
+
+    assert LLM_REQUEST_SECONDS.count("early", "openai", "m") == before + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text() -> None:
+    LangGraphSupportService()  # Registers the cache gauge
+    client = TestClient(app)
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE llm_request_duration_seconds histogram" in response.text
+    assert "# TYPE support_cache_stat gauge" in response.text
@@ -0,0 +1,76 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.support.priority_scheduler import PriorityScheduler
+
+
+async def _run_order(scheduler: PriorityScheduler, arrivals: list[tuple[str, float]]) -> list[str]:
+    """Occupy the only slot, queue `arrivals` at their clock times, then drain."""
+    order: list[str] = []
+    clock = scheduler._clock
+    blocker = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("routine"):
+            await blocker.wait()
+
+    async def job(name: str, priority: str) -> None:
+        async with scheduler.slot(priority):
+            order.append(name)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    jobs = []
+    for name, at in arrivals:
+        clock.now = at
+        jobs.append(asyncio.create_task(job(name, name.split("-")[0])))
+        await asyncio.sleep(0)
+    blocker.set()
+    await asyncio.gather(holder, *jobs)
+    return order
+
+
+def test_higher_priority_is_served_first_when_saturated(clock) -> None:
+    scheduler = PriorityScheduler(max_concurrency=1, aging_seconds=5, clock=clock)
+    arrivals = [("routine-1", 0.0), ("premium-1", 0.1), ("urgent-1", 0.2), ("routine-2", 0.3)]
+
+    order = asyncio.run(_run_order(scheduler, arrivals))
+
+    assert order == ["urgent-1", "premium-1", "routine-1", "routine-2"]
+    stats = scheduler.stats()
+    assert stats["routine_max_queued"] == 2
+    assert stats["urgent_queued"] == 0
+
+
+def test_aging_prevents_starvation(clock) -> None:
+    scheduler = PriorityScheduler(max_concurrency=1, aging_seconds=5, clock=clock)
+    # The routine job has waited 12 s, more than two priority steps; it goes first.
+    arrivals = [("routine-old", 0.0), ("urgent-new", 12.0)]
+
+    assert asyncio.run(_run_order(scheduler, arrivals)) == ["routine-old", "urgent-new"]
+
+
+def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    scheduler = PriorityScheduler(max_concurrency=1)
+
+    async def scenario() -> int:
+        async with scheduler.slot("routine"):
+            waiter = asyncio.create_task(scheduler._acquire("urgent"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        async with scheduler.slot("routine"):
+            pass
+        return scheduler.stats()["active"]
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_support_requests_are_classified_by_urgency_and_tenant(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "SUPPORT_PREMIUM_TENANTS", "acme, globex")
+    service = LangGraphSupportService()
+
+    assert service.priority_for("Please fix this ASAP") == "urgent"
+    assert service.priority_for("Where is my order?", tenant_id="acme") == "premium"
+    assert service.priority_for("Where is my order?", tenant_id="initech") == "routine"
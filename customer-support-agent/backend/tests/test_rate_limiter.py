@@ -0,0 +1,65 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.support.rate_limiter import InMemoryRateLimiter
+
+
+def test_bucket_admits_burst_then_refills(clock) -> None:
+    limiter = InMemoryRateLimiter(requests_per_minute=60, tokens_per_minute=10_000, clock=clock)
+
+    async def scenario() -> list[bool]:
+        results = [await limiter.acquire("openai:gpt", 10, max_wait=0) for _ in range(61)]
+        clock.now = 1.0  # one request's worth of refill at 60 rpm
+        results.append(await limiter.acquire("openai:gpt", 10, max_wait=0))
+        results.append(await limiter.acquire("gemini:flash", 10, max_wait=0))
+        return results
+
+    results = asyncio.run(scenario())
+    assert results[:60] == [True] * 60
+    assert results[60] is False
+    assert results[61:] == [True, True]
+
+
+def test_token_budget_limits_large_prompts(clock) -> None:
+    limiter = InMemoryRateLimiter(requests_per_minute=1000, tokens_per_minute=1000, clock=clock)
+
+    async def scenario() -> list[bool]:
+        return [await limiter.acquire("k", 400, max_wait=0) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [True, True, False]
+
+
+def test_queued_callers_wait_for_refill_within_budget() -> None:
+    limiter = InMemoryRateLimiter(requests_per_minute=600, tokens_per_minute=100_000)
+
+    async def scenario() -> list[bool]:
+        for _ in range(600):
+            await limiter.acquire("k", 1, max_wait=0)
+        # 600 rpm refills one request every 0.1 s: two fit in a 0.25 s budget, later ones not.
+        return list(
+            await asyncio.gather(*(limiter.acquire("k", 1, max_wait=0.25) for _ in range(4)))
+        )
+
+    assert asyncio.run(scenario()) == [True, True, False, False]
+
+
+def test_throttled_calls_degrade_to_rules(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_BACKEND", "memory")
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_RPM", 1)
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_MAX_WAIT_SECONDS", 0.0)
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+    calls: list[str] = []
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        calls.append(prompt)
+        return "orders"
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    result = asyncio.run(service.run("I need a refund for a double charge"))
+
+    assert len(calls) == 1  # categorize was admitted; analyze and respond were throttled
+    assert result["category"] == "orders"
+    assert result["response"].startswith("Category: orders.")
+    assert service.routing_stats()["throttled"] == 2
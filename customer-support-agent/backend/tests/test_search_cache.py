@@ -0,0 +1,106 @@
+import asyncio
+from collections.abc import Callable
+
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_search_orchestrator
+from app.main import app
+from app.orchestration.search_orchestrator import SearchOrchestrator
+from app.services.search_cache import InMemorySearchStore, SearchCache
+from app.services.search_service import SearchService
+
+
+class _FakeWikipedia:
+    name = "wikipedia"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls: list[str] = []
+        self.delay = delay
+        self.fail = False
+
+    async def search(self, query: str) -> list[dict[str, str]]:
+        self.calls.append(query)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        title = f"{query} v{len(self.calls)}"
+        return [{"title": title, "url": f"https://example/{title}", "source": "wikipedia"}]
+
+
+def _cache(clock: Callable[[], float], ttl: float = 60, stale: float = 600) -> SearchCache:
+    store = InMemorySearchStore(max_entries=100, clock=clock)
+    return SearchCache(store=store, ttl_seconds=ttl, stale_seconds=stale, clock=clock)
+
+
+def test_concurrent_misses_share_one_upstream_call(clock) -> None:
+    upstream = _FakeWikipedia(delay=0.01)
+    cache = _cache(clock)
+
+    async def scenario() -> list[str]:
+        lookups = await asyncio.gather(
+            *(cache.get_or_fetch(query, upstream.search) for query in ["Refunds", " refunds "] * 5)
+        )
+        return [lookup.status for lookup in lookups]
+
+    statuses = asyncio.run(scenario())
+
+    assert upstream.calls == ["Refunds"]
+    assert statuses == ["MISS"] * 10
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 9
+
+
+def test_stale_entry_is_served_while_revalidating(clock) -> None:
+    upstream = _FakeWikipedia()
+    cache = _cache(clock)
+
+    async def scenario() -> tuple[str, str, str, str]:
+        await cache.get_or_fetch("refunds", upstream.search)
+        clock.now += 30
+        fresh = await cache.get_or_fetch("refunds", upstream.search)
+        clock.now += 60
+        stale = await cache.get_or_fetch("refunds", upstream.search)
+        await asyncio.gather(*cache._revalidations)
+        refreshed = await cache.get_or_fetch("refunds", upstream.search)
+        return fresh.status, stale.status, stale.results[0]["title"], refreshed.results[0]["title"]
+
+    fresh, stale, stale_title, refreshed_title = asyncio.run(scenario())
+
+    assert (fresh, stale) == ("HIT", "STALE")
+    assert stale_title == "refunds v1"
+    assert refreshed_title == "refunds v2"
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_failed_revalidation_keeps_the_stale_entry(clock) -> None:
+    upstream = _FakeWikipedia()
+    cache = _cache(clock)
+
+    async def scenario() -> str:
+        await cache.get_or_fetch("refunds", upstream.search)
+        clock.now += 120
+        upstream.fail = True
+        await cache.get_or_fetch("refunds", upstream.search)
+        await asyncio.gather(*cache._revalidations)
+        return (await cache.get_or_fetch("refunds", upstream.search)).status
+
+    assert asyncio.run(scenario()) == "STALE"
+    assert cache.stats()["errors"] == 1
+
+
+def test_search_endpoint_sets_cache_headers(clock) -> None:
+    upstream = _FakeWikipedia()
+    service = SearchService(sources=[upstream], cache=_cache(clock))
+    app.dependency_overrides[get_search_orchestrator] = lambda: SearchOrchestrator(service)
+    try:
+        client = TestClient(app)
+        first = client.get("/api/search", params={"q": "refund policy"})
+        second = client.get("/api/search", params={"q": "Refund  Policy"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["Cache-Control"] == "public, max-age=60, stale-while-revalidate=600"
+    assert second.json()["results"] == first.json()["results"]
+    assert len(upstream.calls) == 1
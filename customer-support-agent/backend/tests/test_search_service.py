@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.deps import get_search_orchestrator, get_search_sources
+from app.core.errors import UpstreamServiceError
+from app.main import app
+from app.orchestration.search_orchestrator import SearchOrchestrator
+from app.services.search_cache import InMemorySearchStore, SearchCache
+from app.services.search_service import SearchService, merge_results
+
+
+class _FakeSource:
+    def __init__(self, name: str, titles: list[str], delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.titles = titles
+        self.delay = delay
+        self.fail = fail
+        self.completed = 0
+
+    async def search(self, query: str) -> list[dict[str, str]]:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        self.completed += 1
+        return [
+            {"title": title, "url": f"https://example/{title}", "source": self.name}
+            for title in self.titles
+        ]
+
+
+def _cache() -> SearchCache:
+    store = InMemorySearchStore(max_entries=100)
+    return SearchCache(store=store, ttl_seconds=60, stale_seconds=600)
+
+
+def test_merge_interleaves_by_rank_and_drops_duplicate_urls() -> None:
+    first = [{"url": "https://a/1"}, {"url": "https://a/2"}, {"url": "https://shared/"}]
+    second = [{"url": "https://shared"}, {"url": "https://b/2"}]
+
+    merged = merge_results([first, second])
+
+    assert [item["url"] for item in merged] == [
+        "https://a/1",
+        "https://shared",
+        "https://a/2",
+        "https://b/2",
+    ]
+
+
+def test_slow_source_is_left_out_at_the_deadline() -> None:
+    fast = _FakeSource("wikipedia", ["Paris"])
+    slow = _FakeSource("wikivoyage", ["Paris guide"], delay=0.5)
+    service = SearchService(sources=[fast, slow], deadline_seconds=0.05)
+
+    search = asyncio.run(service.federated_search("paris"))
+
+    assert [item["title"] for item in search.results] == ["Paris"]
+    assert [(outcome.name, outcome.status) for outcome in search.sources] == [
+        ("wikipedia", "ok"),
+        ("wikivoyage", "timeout"),
+    ]
+    assert search.partial
+    assert service.cache_headers(search)["Cache-Control"] == "no-store"
+
+
+def test_straggler_keeps_running_to_warm_the_cache() -> None:
+    slow = _FakeSource("wikivoyage", ["Rome guide"], delay=0.05)
+    service = SearchService(sources=[slow], cache=_cache(), deadline_seconds=0.01)
+
+    async def scenario() -> tuple[str, str]:
+        first = await service.federated_search("rome")
+        await asyncio.sleep(0.1)
+        second = await service.federated_search("rome")
+        return first.sources[0].status, second.sources[0].status
+
+    assert asyncio.run(scenario()) == ("timeout", "ok")
+    assert slow.completed == 1
+
+
+def test_failed_source_marks_the_response_partial() -> None:
+    service = SearchService(
+        sources=[_FakeSource("wikipedia", [], fail=True), _FakeSource("wikivoyage", ["Oslo"])]
+    )
+
+    search = asyncio.run(service.federated_search("oslo"))
+
+    assert [item["source"] for item in search.results] == ["wikivoyage"]
+    assert search.sources[0].status == "error"
+    assert search.partial
+
+
+def test_all_sources_failing_raises() -> None:
+    service = SearchService(sources=[_FakeSource("wikipedia", [], fail=True)])
+
+    with pytest.raises(UpstreamServiceError):
+        asyncio.run(service.federated_search("anything"))
+
+
+def test_search_endpoint_reports_per_source_status() -> None:
+    service = SearchService(
+        sources=[_FakeSource("wikipedia", ["Lisbon"]), _FakeSource("wikivoyage", ["Lisbon"])],
+    )
+    app.dependency_overrides[get_search_orchestrator] = lambda: SearchOrchestrator(service)
+    try:
+        response = TestClient(app).get("/api/search", params={"q": "lisbon"})
+    finally:
+        app.dependency_overrides.clear()
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [item["source"] for item in body["results"]] == ["wikipedia"]
+    assert [source["name"] for source in body["sources"]] == ["wikipedia", "wikivoyage"]
+    assert body["sources"][1]["result_count"] == 1
+    assert body["partial"] is False
+
+
+def test_unknown_search_source_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SEARCH_SOURCES", "wikipedia, nope")
+
+    with pytest.raises(ValueError, match="nope"):
+        get_search_sources()
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+import pytest
+
+from app.core.config import settings
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.support.semantic_cache import (
+    HashedNgramFeaturizer,
+    InMemorySemanticIndex,
+    RedisSemanticIndex,
+    SemanticCache,
+)
+
+
+def _cache(
+    max_entries: int = 8,
+    ttl_seconds: float = 60.0,
+    clock: Callable[[], float] = time.monotonic,
+) -> SemanticCache:
+    featurizer = HashedNgramFeaturizer()
+    index = InMemorySemanticIndex(
+        dim=featurizer.dim,
+        max_entries=max_entries,
+        ttl_seconds=ttl_seconds,
+        clock=clock,
+    )
+    return SemanticCache(
+        index=index, threshold=settings.SEMANTIC_CACHE_THRESHOLD, featurizer=featurizer
+    )
+
+
+def test_near_duplicate_queries_hit() -> None:
+    cache = _cache()
+    asyncio.run(cache.store("how do I reset my password", {"category": "account"}))
+
+    assert asyncio.run(cache.lookup("I need to reset my password")) == {"category": "account"}
+    assert asyncio.run(cache.lookup("how do I reset my router")) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_rephrased_queries_hit_at_the_default_threshold() -> None:
+    cache = _cache()
+    asyncio.run(cache.store("where is my invoice", {"category": "billing"}))
+
+    assert asyncio.run(cache.lookup("can't find my invoice")) == {"category": "billing"}
+    assert asyncio.run(cache.lookup("cant find my invoice")) == {"category": "billing"}
+
+
+@pytest.mark.parametrize(
+    ("stored", "negated"),
+    [
+        ("my package was delivered", "my package was not delivered"),
+        ("cancel my order", "do not cancel my order"),
+        ("cancel my order", "don't cancel my order"),
+    ],
+)
+def test_negated_queries_miss(stored: str, negated: str) -> None:
+    cache = _cache()
+    asyncio.run(cache.store(stored, {"category": "orders"}))
+
+    assert asyncio.run(cache.lookup(negated)) is None
+
+
+def test_entries_are_only_served_within_their_scope() -> None:
+    cache = _cache()
+    asyncio.run(cache.store("reset my password", {"mode": "graph"}, scope="graph:*"))
+    asyncio.run(cache.store("reset my password", {"mode": "fused"}, scope="fused:*"))
+
+    assert asyncio.run(cache.lookup("reset my password", "graph:*")) == {"mode": "graph"}
+    assert asyncio.run(cache.lookup("reset my password", "fused:*")) == {"mode": "fused"}
+    assert asyncio.run(cache.lookup("reset my password", "graph:billing")) is None
+
+
+def test_entries_expire_after_ttl(clock) -> None:
+    cache = _cache(ttl_seconds=10, clock=clock)
+    asyncio.run(cache.store("reset my password", {"category": "account"}))
+
+    clock.now = 11
+    assert asyncio.run(cache.lookup("reset my password")) is None
+
+
+def test_least_recently_used_entry_is_evicted(clock) -> None:
+    cache = _cache(max_entries=2, clock=clock)
+    asyncio.run(cache.store("refund double charge", {"category": "billing"}))
+    clock.now = 1
+    asyncio.run(cache.store("app crashes on startup", {"category": "technical"}))
+    clock.now = 2
+    assert asyncio.run(cache.lookup("refund double charge")) is not None
+
+    clock.now = 3
+    asyncio.run(cache.store("package tracking delayed", {"category": "orders"}))
+
+    assert len(cache.index) == 2
+    assert asyncio.run(cache.lookup("app crashes on startup")) is None
+    assert asyncio.run(cache.lookup("refund double charge")) is not None
+
+
+def _cached_service() -> LangGraphSupportService:
+    previous = settings.SEMANTIC_CACHE_BACKEND
+    settings.SEMANTIC_CACHE_BACKEND = "memory"
+    try:
+        service = LangGraphSupportService()
+    finally:
+        settings.SEMANTIC_CACHE_BACKEND = previous
+    service._llm_backend = "fake"
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        return "account" if prompt.startswith("Categorize") else "Use the reset link."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+    return service
+
+
+def test_support_service_serves_cached_response() -> None:
+    service = _cached_service()
+
+    first = asyncio.run(service.run("how do I reset my password"))
+    second = asyncio.run(service.run("I need to reset my password"))
+
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["query"] == "I need to reset my password"
+    assert second["response"] == first["response"]
+    assert service.cache_stats()["semantic"]["hits"] == 1
+
+
+def test_cached_answers_respect_pipeline_mode_and_category() -> None:
+    service = _cached_service()
+    asyncio.run(service.run("how do I reset my password", pipeline_mode="graph"))
+
+    fused = asyncio.run(service.run("how do I reset my password", pipeline_mode="fused"))
+    categorized = asyncio.run(
+        service.run("how do I reset my password", pipeline_mode="graph", category="billing")
+    )
+
+    assert fused["cache_hit"] is False
+    assert categorized["cache_hit"] is False
+
+
+def test_rules_fallback_answers_are_not_cached() -> None:
+    service = _cached_service()
+
+    async def unavailable(backend: str, prompt: str, json_mode: bool = False) -> None:
+        return None
+
+    service._call_backend = unavailable  # type: ignore[method-assign]
+    first = asyncio.run(service.run("how do I reset my password"))
+    second = asyncio.run(service.run("how do I reset my password"))
+
+    assert first["response_source"] == "rules_fallback"
+    assert second["cache_hit"] is False
+
+
+def test_redis_index_applies_only_changed_entries() -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    featurizer = HashedNgramFeaturizer()
+
+    def cache() -> SemanticCache:
+        index = RedisSemanticIndex(
+            client=client,
+            dim=featurizer.dim,
+            max_entries=8,
+            ttl_seconds=60,
+            prefix="test:semantic",
+        )
+        return SemanticCache(
+        index=index, threshold=settings.SEMANTIC_CACHE_THRESHOLD, featurizer=featurizer
+    )
+
+    async def scenario() -> None:
+        writer, reader = cache(), cache()
+        await writer.store("reset my password", {"category": "account"})
+        assert await reader.lookup("reset my password") == {"category": "account"}
+
+        # Later writes reach the reader through the change log, not a full reload.
+        client.hgetall = None  # type: ignore[method-assign]
+        await writer.store("refund double charge", {"category": "billing"})
+        assert await reader.lookup("refund double charge") == {"category": "billing"}
+        assert await reader.lookup("app crashes on startup") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,238 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services.langgraph_support_service import LangGraphSupportService
+from app.services.llm import reset_llm_providers
+from app.services.llm.base import StreamEvent
+from app.services.llm_service import LLMService
+from app.services.support.session_store import SessionStore, SessionTurn, SQLiteSessionBackend
+
+
+def _turns(session_id: str, count: int) -> list[SessionTurn]:
+    return [
+        SessionTurn(session_id, "user" if i % 2 == 0 else "assistant", f"turn {i}", created_at=i)
+        for i in range(count)
+    ]
+
+
+def test_writes_are_buffered_until_flush_and_reads_see_them() -> None:
+    backend = SQLiteSessionBackend(":memory:")
+    store = SessionStore(backend=backend, flush_interval_seconds=60)
+
+    async def scenario() -> None:
+        for turn in _turns("s1", 5):
+            store.append(turn)
+        store.append(SessionTurn("s2", "user", "other session"))
+
+        assert await backend.recent("s1", 10) == []
+        assert [turn.content for turn in await store.recent("s1", 3)] == [
+            "turn 2", "turn 3", "turn 4",
+        ]
+
+        await store.flush()
+        assert [turn.content for turn in await backend.recent("s1", 2)] == ["turn 3", "turn 4"]
+        assert len(await store.recent("s1", 10)) == 5
+        await store.close()
+
+    asyncio.run(scenario())
+    assert store.stats() == {"pending": 0, "flushed": 6, "errors": 0, "dropped": 0}
+
+
+def test_last_response_id_survives_turns_without_one() -> None:
+    backend = SQLiteSessionBackend(":memory:")
+    store = SessionStore(backend=backend, flush_interval_seconds=60)
+
+    async def scenario() -> tuple[str | None, str | None]:
+        store.append(SessionTurn("s1", "assistant", "first", response_id="resp_1"))
+        buffered = await store.last_response_id("s1")
+        await store.flush()
+        store.append(SessionTurn("s1", "user", "follow-up"))
+        await store.close()
+        return buffered, await store.last_response_id("s1")
+
+    assert asyncio.run(scenario()) == ("resp_1", "resp_1")
+
+
+def test_failed_flush_keeps_turns_for_the_next_batch() -> None:
+    class FlakyBackend(SQLiteSessionBackend):
+        failures = 1
+
+        async def write(self, turns: list[SessionTurn]) -> None:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("database unavailable")
+            await super().write(turns)
+
+    backend = FlakyBackend(":memory:")
+    store = SessionStore(backend=backend, flush_interval_seconds=60)
+
+    async def scenario() -> list[SessionTurn]:
+        for turn in _turns("s1", 2):
+            store.append(turn)
+        await store.flush()
+        await store.flush()
+        return await backend.recent("s1", 10)
+
+    assert len(asyncio.run(scenario())) == 2
+    assert store.stats()["errors"] == 1
+
+
+class _GatedBackend(SQLiteSessionBackend):
+    """Writes wait until `release` is set, so a test can act while a batch is in flight."""
+
+    def __init__(self) -> None:
+        super().__init__(":memory:")
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def write(self, turns: list[SessionTurn]) -> None:
+        self.started.set()
+        await self.release.wait()
+        await super().write(turns)
+
+
+def test_close_waits_for_the_batch_in_flight_and_flushes_the_rest() -> None:
+    backend = _GatedBackend()
+    store = SessionStore(backend=backend, flush_interval_seconds=60)
+
+    async def scenario() -> list[SessionTurn]:
+        first, second = _turns("s1", 2)
+        store.append(first)
+        flushing = asyncio.create_task(store.flush())
+        await backend.started.wait()
+        store.append(second)
+
+        asyncio.get_running_loop().call_later(0.05, backend.release.set)
+        await asyncio.wait_for(store.close(), timeout=2)
+        await flushing
+        return await backend.recent("s1", 10)
+
+    assert len(asyncio.run(scenario())) == 2
+    assert store.stats() == {"pending": 0, "flushed": 2, "errors": 0, "dropped": 0}
+
+
+def test_cancelled_write_requeues_its_batch() -> None:
+    backend = _GatedBackend()
+    store = SessionStore(backend=backend, flush_interval_seconds=60)
+
+    async def scenario() -> list[SessionTurn]:
+        for turn in _turns("s1", 2):
+            store.append(turn)
+        flushing = asyncio.create_task(store.flush())
+        await backend.started.wait()
+        flushing.cancel()
+        await asyncio.gather(flushing, return_exceptions=True)
+        assert store.stats()["pending"] == 2
+
+        backend.release.set()
+        await store.close()
+        return await backend.recent("s1", 10)
+
+    assert [turn.content for turn in asyncio.run(scenario())] == ["turn 0", "turn 1"]
+
+
+class _RecordingLLMService:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def stream_chat(
+        self, model, input_items, previous_response_id=None, node="chat", provider_name=None
+    ):
+        self.calls.append(
+            {"input_items": input_items, "previous_response_id": previous_response_id}
+        )
+        events = [
+            StreamEvent(kind="delta", text=f"Reply {len(self.calls)}"),
+            StreamEvent(kind="done", response_id=f"resp_{len(self.calls)}"),
+        ]
+
+        class _Stream:
+            def __enter__(self):
+                return iter(events)
+
+            def __exit__(self, *args: object) -> None:
+                return None
+
+        return _Stream()
+
+
+def _session_service(
+    monkeypatch, backend: str
+) -> tuple[LangGraphSupportService, _RecordingLLMService]:
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite://")
+    service = LangGraphSupportService()
+    service._llm_backend = backend
+
+    async def call_backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        return "billing" if prompt.startswith("Categorize") else "Needs a refund."
+
+    service._call_backend = call_backend  # type: ignore[method-assign]
+    llm = _RecordingLLMService()
+    service._llm_service = llm  # type: ignore[assignment]
+    return service, llm
+
+
+def _chat(service: LangGraphSupportService, queries: list[str]) -> None:
+    async def scenario() -> None:
+        for query in queries:
+            async for _ in service.run_stream(query, session_id="chat-1"):
+                pass
+        await service.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_stream_continues_openai_sessions_by_response_id(monkeypatch) -> None:
+    service, llm = _session_service(monkeypatch, "openai")
+
+    _chat(service, ["I was charged twice", "Any update?"])
+
+    assert llm.calls[0]["previous_response_id"] is None
+    assert llm.calls[1]["previous_response_id"] == "resp_1"
+    assert len(llm.calls[1]["input_items"]) == 1
+
+
+def test_stream_replays_history_for_providers_without_response_ids(monkeypatch) -> None:
+    service, llm = _session_service(monkeypatch, "gemini")
+
+    _chat(service, ["I was charged twice", "Any update?"])
+
+    history = llm.calls[1]["input_items"][:-1]
+    assert history == [
+        {"role": "user", "content": "I was charged twice"},
+        {"role": "assistant", "content": "Reply 1"},
+    ]
+    assert llm.calls[1]["previous_response_id"] is None
+
+
+def test_gemini_sessions_replay_assistant_turns_as_model_turns(monkeypatch) -> None:
+    from app.services.llm import gemini_provider
+
+    histories: list[list[dict]] = []
+
+    class FakeGenerativeModel:
+        def __init__(self, model_name: str, system_instruction: str | None = None) -> None:
+            pass
+
+        def start_chat(self, history: list[dict]) -> "FakeGenerativeModel":
+            # The real API rejects any other role with a 400.
+            assert all(message["role"] in ("user", "model") for message in history)
+            histories.append(history)
+            return self
+
+        def send_message(self, message: str, stream: bool = False) -> list[SimpleNamespace]:
+            return [SimpleNamespace(text=f"Reply {len(histories)}", usage_metadata=None)]
+
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "gemini")
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_provider.genai, "GenerativeModel", FakeGenerativeModel)
+    service, _ = _session_service(monkeypatch, "gemini")
+    service._llm_service = LLMService()
+    try:
+        _chat(service, ["I was charged twice", "Any update?"])
+    finally:
+        reset_llm_providers()
+
+    assert [message["role"] for message in histories[1]] == ["user", "model"]
+    assert histories[1][1]["parts"] == ["Reply 1"]
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.core.tracing import NOOP_SPAN, OTLPExporter, parse_traceparent, tracer
+from app.services.langgraph_support_service import LangGraphSupportService
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "TRACE_EXPORTER", "jsonl")
+    monkeypatch.setattr(settings, "TRACE_JSONL_PATH", str(path))
+    yield path
+    tracer.shutdown()
+
+
+def test_support_run_links_nodes_and_provider_calls(trace_file) -> None:
+    service = LangGraphSupportService()
+    service._llm_backend = "fake"
+
+    async def backend(backend: str, prompt: str, json_mode: bool = False) -> str:
+        return "billing" if prompt.startswith("Categorize") else "Noted."
+
+    service._call_backend = backend  # type: ignore[method-assign]
+
+    asyncio.run(service.run("I was charged twice"))
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    by_id = {span["span_id"]: span for span in spans}
+    run = next(span for span in spans if span["name"] == "LangGraphSupportService.run")
+    categorize = next(span for span in spans if span["name"] == "support.categorize")
+    calls = [span for span in spans if span["name"] == "llm.call"]
+    assert run["parent_id"] is None
+    assert categorize["parent_id"] == run["span_id"]
+    assert len(calls) == 3
+    assert {by_id[call["parent_id"]]["name"] for call in calls} == {
+        "support.categorize", "support.analyze", "support.respond",
+    }
+    assert calls[0]["attributes"]["llm.provider"] == "fake"
+    assert {span["trace_id"] for span in spans} == {run["trace_id"]}
+
+
+def test_sampling_decision_is_inherited_by_children(trace_file, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+
+    with tracer.span("root") as root, tracer.span("child") as child:
+        child.set_attribute("ignored", True)
+    # An explicitly sampled remote parent overrides the local rate.
+    with tracer.span("remote child", remote_parent=parse_traceparent(
+        "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    )):
+        pass
+
+    assert root is NOOP_SPAN and child is NOOP_SPAN
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["remote child"]
+    assert spans[0]["parent_id"] == "00f067aa0ba902b7"
+
+
+def test_parse_traceparent_rejects_malformed_headers() -> None:
+    assert parse_traceparent(None) is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    unsampled = parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00")
+    assert unsampled is not None and unsampled.sampled is False
+
+
+def test_otlp_payload_follows_the_json_encoding(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "TRACE_EXPORTER", "jsonl")
+    monkeypatch.setattr(settings, "TRACE_JSONL_PATH", "/dev/null")
+    with tracer.span("llm.call", {"llm.provider": "openai", "attempt": 1}) as span:
+        pass
+    tracer.shutdown()
+    exporter = OTLPExporter("http://collector:4318/", "customer-support-agent")
+    exporter.shutdown()
+
+    payload = exporter.payload([span])
+
+    assert exporter.url == "http://collector:4318/v1/traces"
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {
+        "stringValue": "customer-support-agent"
+    }
+    otlp_span = resource_spans["scopeSpans"][0]["spans"][0]
+    assert otlp_span["traceId"] == span.trace_id
+    assert "parentSpanId" not in otlp_span
+    assert {"key": "attempt", "value": {"intValue": "1"}} in otlp_span["attributes"]
+    assert otlp_span["status"] == {"code": 1}
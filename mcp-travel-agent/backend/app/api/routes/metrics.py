@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.metrics import CONTENT_TYPE, metrics_registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=Response)
+def metrics() -> Response:
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE)
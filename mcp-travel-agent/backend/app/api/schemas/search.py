@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 
@@ -7,6 +9,15 @@ class SearchResult(BaseModel):
     source: str
 
 
+class SearchSourceStatus(BaseModel):
+    name: str
+    status: Literal["ok", "timeout", "error"]
+    latency_ms: float
+    result_count: int = 0
+
+
 class SearchResponse(BaseModel):
     query: str
     results: list[SearchResult]
+    sources: list[SearchSourceStatus] = []
+    partial: bool = False  # True when a source timed out or failed
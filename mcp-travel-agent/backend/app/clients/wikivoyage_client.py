@@ -0,0 +1,9 @@
+from app.clients.wikipedia_client import WikipediaClient
+
+
+class WikivoyageClient(WikipediaClient):
+    """Wikivoyage travel guides; same MediaWiki search API as Wikipedia."""
+
+    name = "wikivoyage"
+    base_url = "https://en.wikivoyage.org/w/api.php"
+    article_url = "https://en.wikivoyage.org/wiki/"
@@ -12,10 +12,37 @@ class Settings(BaseSettings):
     CORS_ORIGINS: str = "http://localhost:3000"
     LLM_PROVIDER: str = "openai"
     LLM_MODEL: str = ""  # Provider default: gpt-4o-mini (openai), gemini-2.0-flash-exp (gemini)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100  # Per provider client pool
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    LLM_HTTP_TIMEOUT_SECONDS: float = 60.0
+    STARTUP_IMPORT_WARMUP: bool = True  # Import the LLM SDK and LangGraph in the background
+    GEMINI_MODEL_CACHE_SIZE: int = 32  # Cached GenerativeModel handles per process
+    HTTP_CLIENT_HTTP2: bool = True  # Used when `h2` is installed (httpx[http2])
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100  # Shared outbound client (Wikipedia, ...)
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10.0
+    JSONPLACEHOLDER_CACHE_MAX_ENTRIES: int = 256  # ETag-revalidated responses; 0 disables
+    JSONPLACEHOLDER_CACHE_TTL_SECONDS: float = 60.0  # Cap on serving without revalidation
+    SEARCH_SOURCES: str = "wikipedia"  # Comma-separated: wikipedia, wikivoyage (merged in order)
+    SEARCH_DEADLINE_SECONDS: float = 3.0  # Slower sources are left out (response marked partial)
+    SEARCH_CACHE_BACKEND: str = "memory"  # off | memory | redis (shared via REDIS_URL)
+    SEARCH_CACHE_TTL_SECONDS: float = 300.0  # Served without revalidation while this fresh
+    SEARCH_CACHE_STALE_SECONDS: float = 3600.0  # Then served stale while refetching
+    SEARCH_CACHE_MAX_ENTRIES: int = 2048
+    TRACE_EXPORTER: str = "off"  # off | jsonl | otlp
+    TRACE_SAMPLE_RATE: float = 1.0  # Fraction of new traces recorded (decided at the root span)
+    TRACE_JSONL_PATH: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318"  # OTLP/HTTP collector base URL
+    TRACE_SERVICE_NAME: str = "mcp-travel-agent"
 
     def cors_origin_list(self) -> list[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
+    def search_source_list(self) -> list[str]:
+        return [name.strip().lower() for name in self.SEARCH_SOURCES.split(",") if name.strip()]
+
     def resolved_llm_model(self) -> str:
         if self.LLM_MODEL:
             return self.LLM_MODEL
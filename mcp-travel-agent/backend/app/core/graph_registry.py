@@ -0,0 +1,127 @@
+"""Process-wide registry of app-scoped resources: compiled workflows, caches, orchestrators."""
+import asyncio
+import inspect
+import logging
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from anyio import from_thread
+
+from app.core.config import Settings, settings
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class GraphRegistry:
+    """Builds each app-scoped resource once per process and shares it across requests.
+
+    Entries are keyed by name and fingerprinted on the settings they depend on, so a
+    resource is only rebuilt (SDK clients re-created, graph recompiled) when one of
+    those settings actually changes. A replaced entry is closed on the event loop right
+    away; when no loop is reachable it is kept until `aclose()`, which the app lifespan
+    calls on shutdown.
+    """
+
+    def __init__(self, app_settings: Settings | None = None) -> None:
+        self._settings = app_settings or settings
+        self._entries: dict[str, tuple[tuple[Any, ...], Any]] = {}
+        self._retired: list[Any] = []
+        self._closing: set[asyncio.Task[None]] = set()
+        self._overrides: dict[str, Any] = {}
+        # Re-entrant: a factory may fetch the entries it is built from (e.g. a cache).
+        self._lock = threading.RLock()
+
+    def _fingerprint(self, depends_on: Sequence[str]) -> tuple[Any, ...]:
+        return tuple(getattr(self._settings, field) for field in depends_on)
+
+    def get(self, name: str, factory: Callable[[], T], depends_on: Sequence[str] = ()) -> T:
+        if name in self._overrides:
+            return self._overrides[name]
+        fingerprint = self._fingerprint(depends_on)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        # Sync dependencies run in the threadpool, so concurrent first requests must not
+        # each build their own copy.
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry[0] != fingerprint:
+                if entry is not None:
+                    self._retire(entry[1])
+                entry = (fingerprint, factory())
+                self._entries[name] = entry
+            return entry[1]
+
+    def _retire(self, resource: Any) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                # Sync dependencies run in AnyIO worker threads: schedule it on the loop.
+                from_thread.run_sync(self._schedule_close, resource)
+            except RuntimeError:
+                self._retired.append(resource)
+            return
+        self._schedule_close(resource)
+
+    def _schedule_close(self, resource: Any) -> None:
+        task = asyncio.get_running_loop().create_task(self._close(resource))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @contextmanager
+    def override(self, name: str, value: Any) -> Iterator[None]:
+        """Serve `value` for `name` inside the block (tests); it is not closed by the registry."""
+        with self._lock:
+            previous = self._overrides.get(name, _MISSING)
+            self._overrides[name] = value
+        try:
+            yield
+        finally:
+            with self._lock:
+                if previous is _MISSING:
+                    self._overrides.pop(name, None)
+                else:
+                    self._overrides[name] = previous
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._retired.clear()
+
+    async def aclose(self) -> None:
+        """Clear the registry and release what the entries hold (`aclose()` or `close()`).
+
+        Entries close newest first, so resources built from other entries go before them.
+        A resource that fails to close is logged and skipped so the rest are still released.
+        """
+        with self._lock:
+            resources = self._retired + [resource for _, resource in self._entries.values()]
+            self._entries.clear()
+            self._retired.clear()
+        for resource in reversed(resources):
+            await self._close(resource)
+        if self._closing:
+            await asyncio.gather(*self._closing)
+
+    @staticmethod
+    async def _close(resource: Any) -> None:
+        close = getattr(resource, "aclose", None) or getattr(resource, "close", None)
+        if close is None:
+            return
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:  # One failing close must not keep the others open
+            logger.warning("Failed to close %s", type(resource).__name__, exc_info=True)
+
+
+_MISSING = object()
+
+graph_registry = GraphRegistry()
@@ -0,0 +1,138 @@
+"""Conditional-GET cache for outbound JSON APIs (ETag / If-None-Match).
+
+- Entries younger than their freshness window are served without a request.
+- Older entries are revalidated: the stored ETag goes out as `If-None-Match`, and a
+  `304 Not Modified` reuses the stored body, so the upstream sends no payload.
+- The freshness window is the upstream `Cache-Control: max-age`, capped by the
+  configured TTL; `no-store` responses are not kept.
+- Entries keep the raw payload and every caller gets a freshly decoded body, so
+  callers may modify what they receive without touching the cache.
+"""
+from __future__ import annotations
+
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.core.config import Settings
+from app.core.metrics import metrics_registry
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Settings the JSONPlaceholder cache is built from; it is rebuilt when one changes.
+JSONPLACEHOLDER_CACHE_SETTINGS = (
+    "JSONPLACEHOLDER_CACHE_MAX_ENTRIES",
+    "JSONPLACEHOLDER_CACHE_TTL_SECONDS",
+)
+
+
+@dataclass
+class CachedResponse:
+    content: bytes
+    etag: str | None
+    fresh_until: float
+
+
+def _fresh_seconds(response: httpx.Response, ttl_seconds: float) -> float | None:
+    """Seconds the response may be served without revalidation; None if not storable."""
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+    max_age = _MAX_AGE_RE.search(cache_control)
+    if max_age is None:
+        return ttl_seconds
+    return min(float(max_age.group(1)), ttl_seconds)
+
+
+class ConditionalResponseCache:
+    """Size-bounded LRU of JSON bodies keyed by URL and query parameters."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    async def get_json(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Mapping[str, str | int] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> Any:
+        request = client.build_request("GET", url, params=params, headers=headers)
+        key = str(request.url)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.fresh_until > self._clock():
+                self.hits += 1
+                return json.loads(entry.content)
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+
+        response = await client.send(request)
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            fresh_seconds = _fresh_seconds(response, self.ttl_seconds)
+            entry.fresh_until = self._clock() + (fresh_seconds or 0.0)
+            return json.loads(entry.content)
+
+        response.raise_for_status()
+        self.misses += 1
+        body = response.json()
+        fresh_seconds = _fresh_seconds(response, self.ttl_seconds)
+        etag = response.headers.get("ETag")
+        if fresh_seconds is None or (fresh_seconds == 0 and not etag):
+            # Nothing to gain from keeping it: it can neither be served nor revalidated.
+            self._entries.pop(key, None)
+            return body
+        self._entries[key] = CachedResponse(
+            response.content, etag, self._clock() + fresh_seconds
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return body
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.revalidated) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_jsonplaceholder_cache(app_settings: Settings) -> ConditionalResponseCache | None:
+    if app_settings.JSONPLACEHOLDER_CACHE_MAX_ENTRIES <= 0:
+        return None
+    cache = ConditionalResponseCache(
+        max_entries=app_settings.JSONPLACEHOLDER_CACHE_MAX_ENTRIES,
+        ttl_seconds=app_settings.JSONPLACEHOLDER_CACHE_TTL_SECONDS,
+    )
+    metrics_registry.gauge_callback(
+        "jsonplaceholder_cache_stat",
+        "JSONPlaceholder response cache counters, read at scrape time.",
+        ("stat",),
+        lambda: [((stat,), value) for stat, value in cache.stats().items()],
+    )
+    return cache
@@ -0,0 +1,57 @@
+"""Process-wide `httpx.AsyncClient` for outbound API calls (Wikipedia search, ...).
+
+Opened in the app lifespan and closed on shutdown, so keep-alive connections (and their
+TCP/TLS handshakes) are reused across requests instead of paid on every call. HTTP/2 is
+used when the `h2` package is installed (`httpx[http2]`), multiplexing concurrent
+requests to the same host over one connection.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Any
+
+import httpx
+
+from app.core.config import Settings, settings
+
+# (event loop, client): connections are bound to the loop that opened them.
+_shared: tuple[Any, httpx.AsyncClient] | None = None
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_http_client(app_settings: Settings | None = None) -> httpx.AsyncClient:
+    app_settings = app_settings or settings
+    return httpx.AsyncClient(
+        http2=app_settings.HTTP_CLIENT_HTTP2 and http2_available(),
+        timeout=app_settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=app_settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=app_settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=app_settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared client for the running event loop, created on first use."""
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared[0] is not loop or _shared[1].is_closed:
+        # A different loop (e.g. a test client without lifespan) cannot reuse the old
+        # loop's connections; start a fresh pool for it.
+        _shared = (loop, build_http_client())
+    return _shared[1]
+
+
+async def close_http_client() -> None:
+    global _shared
+    if _shared is None:
+        return
+    loop, client = _shared
+    _shared = None
+    if loop is asyncio.get_running_loop():
+        await client.aclose()
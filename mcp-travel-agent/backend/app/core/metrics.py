@@ -0,0 +1,282 @@
+"""Process-wide metrics, exposed in the Prometheus text format at `/api/metrics`.
+
+Dependency-free on purpose: recording a sample is a dict update under a lock (around a
+microsecond), so LLM calls and graph nodes stay instrumented in production. Each uvicorn
+worker keeps its own registry; scrape every worker or aggregate in Prometheus.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans cache hits (milliseconds) up to slow completions near the SDK timeout.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Graph node that issued the LLM call being made; read where provider calls are timed.
+current_node: ContextVar[str] = ContextVar("llm_node", default="default")
+
+F = TypeVar("F", bound=Callable[..., Any])
+GaugeCallback = Callable[[], Iterable[tuple[Sequence[str], float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last is +Inf), sum, count].
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            snapshot = [
+                (key, list(series[0]), series[1], series[2])
+                for key, series in self._series.items()
+            ]
+        lines: list[str] = []
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class CallbackGauge:
+    """Gauge read at scrape time from a callback, for stats a component already keeps."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str],
+        callback: GaugeCallback,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._callback = callback
+
+    def samples(self) -> list[str]:
+        try:
+            values = list(self._callback())
+        except Exception:  # noqa: BLE001 - see below
+            # A broken stats source must not take the whole scrape down with it.
+            return []
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | CallbackGauge] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None and not isinstance(metric, CallbackGauge):
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def gauge_callback(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str],
+        callback: GaugeCallback,
+    ) -> CallbackGauge:
+        """Register (or replace, e.g. after a service rebuild) a scrape-time gauge."""
+        return self._register(CallbackGauge(name, documentation, labels, callback))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+LLM_REQUEST_SECONDS = metrics_registry.histogram(
+    "llm_request_duration_seconds",
+    "Latency of LLM provider calls (full response, or full stream).",
+    ("node", "provider", "model"),
+)
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = metrics_registry.histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from starting an LLM stream to its first text delta.",
+    ("node", "provider", "model"),
+)
+LLM_TOKENS = metrics_registry.counter(
+    "llm_tokens_total",
+    "Tokens reported by the provider, by direction (input or output).",
+    ("node", "provider", "model", "direction"),
+)
+LLM_ERRORS = metrics_registry.counter(
+    "llm_errors_total",
+    "LLM provider calls that raised.",
+    ("node", "provider", "model"),
+)
+LLM_FALLBACKS = metrics_registry.counter(
+    "llm_fallbacks_total",
+    "LLM steps answered by the rules path because no usable completion came back.",
+    ("node", "provider"),
+)
+SEARCH_SOURCE_SECONDS = metrics_registry.histogram(
+    "search_source_duration_seconds",
+    "Latency of each federated search source, by outcome (ok, error or timeout).",
+    ("source", "status"),
+)
+GRAPH_NODE_SECONDS = metrics_registry.histogram(
+    "graph_node_duration_seconds",
+    "Time spent in each workflow graph node.",
+    ("graph", "node"),
+)
+
+
+def record_usage(node: str, provider: str, model: str, usage: Any) -> None:
+    """Count tokens from a provider usage object (OpenAI `usage` or Gemini `usage_metadata`)."""
+    if usage is None:
+        return
+    input_tokens = getattr(usage, "input_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "prompt_token_count", None)
+    output_tokens = getattr(usage, "output_tokens", None)
+    if output_tokens is None:
+        output_tokens = getattr(usage, "candidates_token_count", None)
+    if isinstance(input_tokens, int):
+        LLM_TOKENS.inc(node, provider, model, "input", amount=input_tokens)
+    if isinstance(output_tokens, int):
+        LLM_TOKENS.inc(node, provider, model, "output", amount=output_tokens)
+
+
+def timed_node(graph: str, node: str) -> Callable[[F], F]:
+    """Record the duration of a (sync or async) graph node in `graph_node_duration_seconds`."""
+
+    def decorate(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    GRAPH_NODE_SECONDS.observe(time.perf_counter() - start, graph, node)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                GRAPH_NODE_SECONDS.observe(time.perf_counter() - start, graph, node)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -2,5 +2,9 @@ from typing import Protocol
 
 
 class SearchClientProtocol(Protocol):
-    def search(self, query: str) -> list[dict[str, str]]:
+    """A federated search source; `name` is reported as each result's `source`."""
+
+    name: str
+
+    async def search(self, query: str) -> list[dict[str, str]]:
         ...
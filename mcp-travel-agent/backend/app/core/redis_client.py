@@ -0,0 +1,36 @@
+"""Shared async Redis connections for optional cache backends."""
+from typing import Any
+
+from app.core.config import settings
+
+_clients: dict[str, Any] = {}
+
+
+def get_redis_client(url: str | None = None) -> Any:
+    """Return a process-wide `redis.asyncio.Redis` for `url` (defaults to REDIS_URL).
+
+    `redis` is an optional dependency; it is only imported when a Redis-backed feature
+    is enabled.
+    """
+    redis_url = url or settings.REDIS_URL
+    client = _clients.get(redis_url)
+    if client is not None:
+        return client
+
+    try:
+        import redis.asyncio as redis
+    except ImportError as exc:
+        raise RuntimeError(
+            "Redis-backed caching requires the 'redis' package (install the 'redis' extra)."
+        ) from exc
+
+    client = redis.Redis.from_url(redis_url)
+    _clients[redis_url] = client
+    return client
+
+
+async def close_redis_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,418 @@
+"""Lightweight request tracing: nested spans carried in a context variable.
+
+A span opened inside another (in the same task, a child task, or a threadpool call made
+through Starlette/anyio, which all copy the context) becomes its child, so one request
+yields a tree such as `POST /api/... -> Orchestrator.method -> node -> llm.call`.
+
+Sampling is decided once per trace at the root (`TRACE_SAMPLE_RATE`, or the sampled flag
+of an incoming W3C `traceparent` header); unsampled traces cost one context-variable read
+per span. Finished spans go to the exporter chosen by `TRACE_EXPORTER`:
+
+- `off` (default): tracing is disabled.
+- `jsonl`: one JSON object per span appended to `TRACE_JSONL_PATH`.
+- `otlp`: batched OTLP/HTTP JSON posts to `TRACE_OTLP_ENDPOINT` from a background thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, ClassVar, TypeVar
+
+import httpx
+
+from app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = (
+        "attributes",
+        "end_ns",
+        "error",
+        "kind",
+        "name",
+        "parent_id",
+        "sampled",
+        "span_id",
+        "start_ns",
+        "status",
+        "trace_id",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        span_id: str,
+        parent_id: str | None = None,
+        kind: str = "internal",
+        sampled: bool = True,
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.kind = kind
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.status = "ok"
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+# Shared stand-in for every span of an unsampled trace; attributes set on it are dropped.
+NOOP_SPAN = Span("noop", "0" * 32, "0" * 16, sampled=False)
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def parse_traceparent(header: str | None) -> Span | None:
+    """Remote parent from a W3C `traceparent` header, or None when absent or malformed."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return Span("remote", trace_id, span_id, sampled=bool(int(flags, 16) & 1))
+
+
+class JsonLinesExporter:
+    def __init__(self, path: str, service_name: str) -> None:
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self._file: Any = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps({"service": self.service_name, **span.to_dict()}, default=str)
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Kept open across exports; shutdown() closes it.
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)  # noqa: SIM115
+            self._file.write(line + "\n")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPExporter:
+    """Posts spans as OTLP/HTTP JSON in batches from a daemon thread; never blocks callers."""
+
+    _KINDS: ClassVar[dict[str, int]] = {"internal": 1, "server": 2, "client": 3}
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 2.0,
+        max_queue_size: int = 8192,
+    ) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._worker, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def payload(self, spans: list[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": _otlp_value(self.service_name)}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [self._otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _otlp_span(self, span: Span) -> dict[str, Any]:
+        item: dict[str, Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": self._KINDS.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()
+            ],
+            "status": {"code": 2, "message": span.error or ""}
+            if span.status == "error"
+            else {"code": 1},
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        return item
+
+    def _worker(self) -> None:
+        with httpx.Client(timeout=5.0) as client:
+            stopping = False
+            while not stopping:
+                batch: list[Span] = []
+                deadline = time.monotonic() + self.flush_interval_seconds
+                while len(batch) < self.batch_size:
+                    try:
+                        span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if span is None:
+                        stopping = True
+                        break
+                    batch.append(span)
+                if batch:
+                    try:
+                        client.post(self.url, json=self.payload(batch)).raise_for_status()
+                    except httpx.HTTPError as exc:
+                        logger.warning("OTLP export of %d spans failed: %s", len(batch), exc)
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=self.flush_interval_seconds + 5.0)
+
+
+class Tracer:
+    def __init__(
+        self,
+        app_settings: Settings | None = None,
+        random_fn: Callable[[], float] = random.random,
+    ) -> None:
+        self._settings = app_settings or settings
+        self._random = random_fn
+        self._lock = threading.Lock()
+        self._fingerprint: tuple[Any, ...] | None = None
+        self._exporter: JsonLinesExporter | OTLPExporter | None = None
+
+    def exporter(self) -> JsonLinesExporter | OTLPExporter | None:
+        app_settings = self._settings
+        fingerprint = (
+            app_settings.TRACE_EXPORTER,
+            app_settings.TRACE_JSONL_PATH,
+            app_settings.TRACE_OTLP_ENDPOINT,
+            app_settings.TRACE_SERVICE_NAME,
+        )
+        if fingerprint == self._fingerprint:
+            return self._exporter
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                previous = self._exporter
+                self._exporter = self._build_exporter()
+                self._fingerprint = fingerprint
+                if previous is not None:
+                    previous.shutdown()
+            return self._exporter
+
+    def _build_exporter(self) -> JsonLinesExporter | OTLPExporter | None:
+        app_settings = self._settings
+        backend = (app_settings.TRACE_EXPORTER or "off").strip().lower()
+        if backend in ("", "off", "none"):
+            return None
+        if backend == "jsonl":
+            return JsonLinesExporter(app_settings.TRACE_JSONL_PATH, app_settings.TRACE_SERVICE_NAME)
+        if backend == "otlp":
+            return OTLPExporter(app_settings.TRACE_OTLP_ENDPOINT, app_settings.TRACE_SERVICE_NAME)
+        raise ValueError(
+            f"Unknown TRACE_EXPORTER={app_settings.TRACE_EXPORTER!r}. "
+            "Supported: ['off', 'jsonl', 'otlp']"
+        )
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        attributes: dict[str, Any] | None = None,
+        kind: str = "internal",
+        remote_parent: Span | None = None,
+    ) -> Iterator[Span]:
+        exporter = self.exporter()
+        parent = _current_span.get() or remote_parent
+        if exporter is None or parent is NOOP_SPAN:
+            yield NOOP_SPAN
+            return
+
+        if parent is None:
+            sampled = self._random() < self._settings.TRACE_SAMPLE_RATE
+            trace_id = os.urandom(16).hex()
+        else:
+            sampled = parent.sampled
+            trace_id = parent.trace_id
+        if not sampled:
+            # Descendants see the no-op span and skip straight through.
+            token = _current_span.set(NOOP_SPAN)
+            try:
+                yield NOOP_SPAN
+            finally:
+                _current_span.reset(token)
+            return
+
+        span = Span(
+            name,
+            trace_id,
+            os.urandom(8).hex(),
+            parent_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.status = "error"
+            span.error = f"{type(exc).__name__}: {exc}"[:500]
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            try:
+                exporter.export(span)
+            except Exception:
+                # Tracing is best effort; a full disk must not fail the request.
+                logger.warning("Failed to export span %s", span.name, exc_info=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._exporter is not None:
+                self._exporter.shutdown()
+            self._exporter = None
+            self._fingerprint = None
+
+
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Run a (sync or async) function inside a span called `name`."""
+
+    def decorate(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with tracer.span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def _route_template(path: str, path_params: dict[str, Any]) -> str:
+    # Name spans by route template (/sessions/{session_id}) so they aggregate per endpoint.
+    values = {str(value): f"{{{name}}}" for name, value in path_params.items()}
+    return "/".join(values.get(segment, segment) for segment in path.split("/"))
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the root `server` span of each HTTP request."""
+
+    def __init__(self, app: Any, app_tracer: Tracer | None = None) -> None:
+        self.app = app
+        self._tracer = app_tracer or tracer
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or self._tracer.exporter() is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        remote_parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope["method"]
+        attributes = {"http.method": method, "http.target": scope["path"]}
+        with self._tracer.span(
+            f"{method} {scope['path']}",
+            attributes,
+            kind="server",
+            remote_parent=remote_parent,
+        ) as span:
+
+            async def send_with_status(message: dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                if span.sampled and scope.get("path_params"):
+                    span.name = f"{method} {_route_template(scope['path'], scope['path_params'])}"
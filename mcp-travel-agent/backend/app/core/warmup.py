@@ -0,0 +1,22 @@
+"""Background import of the SDKs the first LLM request would otherwise wait on.
+
+`app.main` no longer imports `openai`, `google.generativeai` or `langgraph`, so health
+checks and search traffic are served as soon as the app starts. The lifespan runs
+`warm_up_imports` in a worker thread right after startup, so the configured provider
+and LangGraph are usually loaded before the first request that needs them.
+"""
+import contextlib
+import importlib
+
+from app.services.llm.factory import load_provider_class
+
+WARMUP_MODULES = ("langgraph.graph",)
+
+
+def warm_up_imports() -> None:
+    # Failures surface on first use instead, where they are reported to the caller.
+    with contextlib.suppress(ImportError, ValueError):
+        load_provider_class()
+    for module in WARMUP_MODULES:
+        with contextlib.suppress(ImportError):
+            importlib.import_module(module)
@@ -5,5 +5,5 @@ class JsonPlaceholderOrchestrator:
     def __init__(self, client: JsonPlaceholderClient) -> None:
         self.client = client
 
-    def list_posts(self) -> list[dict]:
-        return self.client.list_posts()
+    async def list_posts(self, start: int = 0, limit: int = 10) -> list[dict]:
+        return await self.client.list_posts(start=start, limit=limit)
@@ -1,4 +1,5 @@
 from app.api.schemas.travel import TravelPlanRequest, TravelPlanResponse
+from app.core.tracing import traced
 from app.services.travel.travel_workflow_service import TravelWorkflowService
 
 
@@ -6,6 +7,7 @@ class TravelOrchestrator:
     def __init__(self, service: TravelWorkflowService) -> None:
         self.service = service
 
+    @traced("TravelOrchestrator.plan_trip")
     def plan_trip(self, request: TravelPlanRequest) -> TravelPlanResponse:
         data = self.service.plan(request)
         return TravelPlanResponse(**data)
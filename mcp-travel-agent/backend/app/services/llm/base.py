@@ -3,7 +3,7 @@ LLM abstraction: interface that any chat provider must implement.
 This is the interface in the factory pattern.
 """
 from dataclasses import dataclass
-from typing import Iterator, Protocol, runtime_checkable
+from typing import Any, Iterator, Protocol, runtime_checkable
 
 
 @dataclass
@@ -13,6 +13,7 @@ class StreamEvent:
     kind: str  # "delta" | "done"
     text: str | None = None
     response_id: str | None = None
+    usage: Any = None  # Provider token usage, on "done" events when reported
 
 
 @runtime_checkable
@@ -1,4 +1,6 @@
 """Gemini implementation of LLMProvider using Gemini generateContent streaming."""
+import threading
+from collections import OrderedDict
 from typing import Any, Iterator
 
 import google.generativeai as genai
@@ -6,6 +8,9 @@ import google.generativeai as genai
 from app.core.config import settings
 from app.services.llm.base import LLMChatStream, StreamEvent
 
+# Gemini only accepts "user" and "model" turns; "model" is its name for the assistant.
+_GEMINI_ROLES = {"user": "user", "assistant": "model", "model": "model"}
+
 
 class _GeminiStreamAdapter:
     def __init__(self, gemini_stream: Any) -> None:
@@ -18,11 +23,13 @@ class _GeminiStreamAdapter:
         return None
 
     def __iter__(self) -> Iterator[StreamEvent]:
+        usage = None
         for chunk in self._stream:
+            usage = getattr(chunk, "usage_metadata", None) or usage
             if hasattr(chunk, "text") and chunk.text:
                 yield StreamEvent(kind="delta", text=chunk.text)
 
-        yield StreamEvent(kind="done", response_id="gemini-stream")
+        yield StreamEvent(kind="done", response_id="gemini-stream", usage=usage)
 
 
 class GeminiProvider:
@@ -31,6 +38,28 @@ class GeminiProvider:
         if not api_key:
             raise ValueError("GEMINI_API_KEY not set in environment variables")
         genai.configure(api_key=api_key)
+        # GenerativeModel handles are cheap to keep and are reused per (model, system
+        # instruction); the LRU bound keeps per-request system prompts from growing it.
+        self._models: OrderedDict[tuple[str, str | None], Any] = OrderedDict()
+        self._models_lock = threading.Lock()
+        self._max_models = max(1, settings.GEMINI_MODEL_CACHE_SIZE)
+
+    def _model_for(self, model_name: str, system_instruction: str | None) -> Any:
+        key = (model_name, system_instruction)
+        with self._models_lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+
+            model = genai.GenerativeModel(
+                model_name=model_name,
+                system_instruction=system_instruction,
+            )
+            self._models[key] = model
+            while len(self._models) > self._max_models:
+                self._models.popitem(last=False)
+            return model
 
     def stream_chat(
         self,
@@ -47,14 +76,11 @@ class GeminiProvider:
             content = item.get("content", "")
             if role == "system":
                 system_instruction = content
-            elif role in ("user", "assistant"):
-                messages.append({"role": role, "parts": [content]})
+            elif role in _GEMINI_ROLES:
+                messages.append({"role": _GEMINI_ROLES[role], "parts": [content]})
 
         model_name = model or settings.resolved_llm_model()
-        gemini_model = genai.GenerativeModel(
-            model_name=model_name,
-            system_instruction=system_instruction,
-        )
+        gemini_model = self._model_for(model_name, system_instruction)
 
         chat = gemini_model.start_chat(history=messages[:-1] if len(messages) > 1 else [])
         last_message = messages[-1]["parts"][0] if messages else ""
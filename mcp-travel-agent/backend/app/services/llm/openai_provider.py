@@ -1,7 +1,8 @@
 """OpenAI implementation of LLMProvider using Responses API streaming."""
 from typing import Any, Iterator
 
-from openai import OpenAI
+import httpx
+from openai import DefaultHttpxClient, OpenAI
 
 from app.core.config import settings
 from app.services.llm.base import LLMChatStream, StreamEvent
@@ -27,12 +28,35 @@ class _OpenAIStreamAdapter:
                 yield StreamEvent(kind="delta", text=event.delta or "")
             elif event.type == "response.completed" and getattr(event, "response", None):
                 rid = getattr(event.response, "id", None) or ""
-                yield StreamEvent(kind="done", response_id=rid)
+                usage = getattr(event.response, "usage", None)
+                yield StreamEvent(kind="done", response_id=rid, usage=usage)
+
+
+def http_limits() -> Any:
+    """Connection-pool limits for provider HTTP clients, from settings.
+
+    Returned as `Any`: newer openai releases annotate their clients with the `httpx2`
+    fork's `Limits`, which this object satisfies at runtime but not under mypy.
+    """
+    return httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
 
 
 class OpenAIProvider:
     def __init__(self) -> None:
-        self._client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # One pooled client per process (see factory.get_llm_provider); keep-alive
+        # connections are reused across streams instead of re-handshaking each time.
+        self._client = OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.LLM_HTTP_TIMEOUT_SECONDS,
+            http_client=DefaultHttpxClient(limits=http_limits()),
+        )
+
+    def close(self) -> None:
+        self._client.close()
 
     def stream_chat(
         self,
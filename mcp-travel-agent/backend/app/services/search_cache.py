@@ -0,0 +1,264 @@
+"""TTL cache in front of the search sources, keyed by source and normalized query.
+
+- Fresh entries (younger than `ttl_seconds`) are served directly.
+- Stale entries (up to `stale_seconds` past the TTL) are served immediately while one
+  background task refetches them (stale-while-revalidate).
+- Concurrent misses for the same query share a single upstream call (single-flight).
+
+Entries carry their fetch time (wall clock), so workers sharing a Redis store agree on
+their age.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import Settings
+from app.core.metrics import metrics_registry
+
+SearchResults = list[dict[str, str]]
+Fetch = Callable[[str], Awaitable[SearchResults]]
+
+# Settings the cache is built from; it is rebuilt when one changes (see graph_registry).
+SEARCH_CACHE_SETTINGS = (
+    "SEARCH_CACHE_BACKEND",
+    "SEARCH_CACHE_TTL_SECONDS",
+    "SEARCH_CACHE_STALE_SECONDS",
+    "SEARCH_CACHE_MAX_ENTRIES",
+    "REDIS_URL",
+)
+
+
+@dataclass(frozen=True)
+class SearchLookup:
+    results: SearchResults
+    status: str  # HIT | MISS | STALE | BYPASS
+    age_seconds: float = 0.0
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+class InMemorySearchStore:
+    """Size-bounded LRU; entries are dropped once past TTL plus the stale window."""
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.time) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, float, SearchResults]] = OrderedDict()
+
+    async def get(self, key: str) -> tuple[float, SearchResults] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, fetched_at, results = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return fetched_at, results
+
+    async def set(
+        self,
+        key: str,
+        fetched_at: float,
+        results: SearchResults,
+        keep_seconds: float,
+    ) -> None:
+        self._entries[key] = (fetched_at + keep_seconds, fetched_at, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisSearchStore:
+    """Shared store; Redis expires entries once past TTL plus the stale window."""
+
+    def __init__(self, client: Any, prefix: str) -> None:
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> tuple[float, SearchResults] | None:
+        raw = await self._client.get(f"{self._prefix}:{key}")
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return float(entry["fetched_at"]), entry["results"]
+
+    async def set(
+        self,
+        key: str,
+        fetched_at: float,
+        results: SearchResults,
+        keep_seconds: float,
+    ) -> None:
+        payload = json.dumps({"fetched_at": fetched_at, "results": results})
+        await self._client.set(f"{self._prefix}:{key}", payload, ex=max(1, int(keep_seconds)))
+
+
+class SearchCache:
+    def __init__(
+        self,
+        store: InMemorySearchStore | RedisSearchStore,
+        ttl_seconds: float,
+        stale_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.revalidations = 0
+        self.errors = 0
+        self._inflight: dict[str, asyncio.Future[SearchResults]] = {}
+        self._revalidations: set[asyncio.Task] = set()
+
+    async def get_or_fetch(self, query: str, fetch: Fetch, namespace: str = "") -> SearchLookup:
+        """Cached results for `query`; `namespace` keeps each source's entries apart."""
+        key = normalize_query(query)
+        if namespace:
+            key = f"{namespace}:{key}"
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return SearchLookup(await asyncio.shield(pending), "MISS")
+
+        try:
+            entry = await self.store.get(key)
+        except Exception:  # noqa: BLE001 - an unreachable store is treated as a miss
+            self.errors += 1
+            entry = None
+
+        if entry is not None:
+            fetched_at, results = entry
+            age = max(0.0, self._clock() - fetched_at)
+            if age < self.ttl_seconds:
+                self.hits += 1
+                return SearchLookup(results, "HIT", age)
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._revalidate(key, query, fetch)
+                return SearchLookup(results, "STALE", age)
+
+        # Re-check: another caller may have started the same fetch while we awaited the store.
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return SearchLookup(await asyncio.shield(pending), "MISS")
+
+        self.misses += 1
+        return SearchLookup(await self._fetch(key, query, fetch), "MISS")
+
+    async def _fetch(self, key: str, query: str, fetch: Fetch) -> SearchResults:
+        future: asyncio.Future[SearchResults] = asyncio.get_running_loop().create_future()
+        # Followers re-raise the leader's error; retrieving it here keeps asyncio from
+        # logging "exception was never retrieved" when there were no followers.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = future
+        try:
+            results = await fetch(query)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(results)
+        finally:
+            self._inflight.pop(key, None)
+
+        keep_seconds = self.ttl_seconds + self.stale_seconds
+        try:
+            await self.store.set(key, self._clock(), results, keep_seconds)
+        except Exception:  # noqa: BLE001 - a failed store only costs a future miss
+            self.errors += 1
+        return results
+
+    def _revalidate(self, key: str, query: str, fetch: Fetch) -> None:
+        if key in self._inflight:
+            return
+        self.revalidations += 1
+
+        async def refresh() -> None:
+            try:
+                await self._fetch(key, query, fetch)
+            except Exception:  # noqa: BLE001 - see below
+                # Keep serving the stale entry; the next stale hit tries again.
+                self.errors += 1
+
+        task = asyncio.create_task(refresh())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def aclose(self) -> None:
+        # Background refreshes would otherwise outlive the shared HTTP client.
+        for task in list(self._revalidations):
+            task.cancel()
+        await asyncio.gather(*self._revalidations, return_exceptions=True)
+
+    def cache_headers(self, lookup: SearchLookup) -> dict[str, str]:
+        age = int(lookup.age_seconds)
+        max_age = max(0, int(self.ttl_seconds) - age)
+        return {
+            "X-Cache": lookup.status,
+            "Age": str(age),
+            "Cache-Control": (
+                f"public, max-age={max_age}, stale-while-revalidate={int(self.stale_seconds)}"
+            ),
+        }
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        served = self.hits + self.stale_hits + self.coalesced
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidations": self.revalidations,
+            "errors": self.errors,
+            "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_search_cache(app_settings: Settings) -> SearchCache | None:
+    backend = (app_settings.SEARCH_CACHE_BACKEND or "off").strip().lower()
+    if backend in ("", "off", "none"):
+        return None
+
+    store: InMemorySearchStore | RedisSearchStore
+    if backend == "redis":
+        from app.core.redis_client import get_redis_client
+
+        store = RedisSearchStore(client=get_redis_client(), prefix="search")
+    elif backend == "memory":
+        store = InMemorySearchStore(max_entries=app_settings.SEARCH_CACHE_MAX_ENTRIES)
+    else:
+        raise ValueError(
+            f"Unknown SEARCH_CACHE_BACKEND={app_settings.SEARCH_CACHE_BACKEND!r}. "
+            "Supported: ['off', 'memory', 'redis']"
+        )
+
+    cache = SearchCache(
+        store=store,
+        ttl_seconds=app_settings.SEARCH_CACHE_TTL_SECONDS,
+        stale_seconds=app_settings.SEARCH_CACHE_STALE_SECONDS,
+    )
+    metrics_registry.gauge_callback(
+        "search_cache_stat",
+        "Search cache counters, read at scrape time.",
+        ("stat",),
+        lambda: [((stat,), value) for stat, value in cache.stats().items()],
+    )
+    return cache
@@ -1,9 +1,141 @@
-from app.clients.wikipedia_client import WikipediaClient
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from app.core.errors import UpstreamServiceError
+from app.core.metrics import SEARCH_SOURCE_SECONDS
+from app.core.protocols import SearchClientProtocol
+from app.services.search_cache import SearchCache, SearchLookup
+
+# Lookups still running at the deadline finish in the background when a cache is present,
+# so the next request for the query is served from it. Held here so they are not collected.
+_stragglers: set[asyncio.Task] = set()
+
+_CACHE_STATUS_RANK = {"HIT": 0, "STALE": 1, "MISS": 2, "BYPASS": 3}
+
+
+@dataclass(frozen=True)
+class SourceOutcome:
+    name: str
+    status: str  # ok | timeout | error
+    latency_ms: float
+    result_count: int = 0
+
+
+@dataclass(frozen=True)
+class FederatedSearch:
+    results: list[dict[str, str]]
+    sources: list[SourceOutcome]
+    lookups: list[SearchLookup] = field(default_factory=list)
+
+    @property
+    def partial(self) -> bool:
+        return any(outcome.status != "ok" for outcome in self.sources)
+
+
+def merge_results(per_source: Sequence[Sequence[dict[str, str]]]) -> list[dict[str, str]]:
+    """Interleave sources by rank (configured order breaks ties) and drop repeated URLs."""
+    merged: list[dict[str, str]] = []
+    seen: set[str] = set()
+    for rank in range(max((len(results) for results in per_source), default=0)):
+        for results in per_source:
+            if rank >= len(results):
+                continue
+            item = results[rank]
+            url = item.get("url", "").rstrip("/")
+            if url in seen:
+                continue
+            seen.add(url)
+            merged.append(item)
+    return merged
 
 
 class SearchService:
-    def __init__(self, wikipedia_client: WikipediaClient) -> None:
-        self.wikipedia_client = wikipedia_client
+    def __init__(
+        self,
+        sources: Sequence[SearchClientProtocol],
+        cache: SearchCache | None = None,
+        deadline_seconds: float = 3.0,
+    ) -> None:
+        self.sources = list(sources)
+        self.cache = cache
+        self.deadline_seconds = deadline_seconds
 
     async def search(self, query: str) -> list[dict[str, str]]:
-        return await self.wikipedia_client.search(query)
+        return (await self.federated_search(query)).results
+
+    async def federated_search(self, query: str) -> FederatedSearch:
+        """Query every source concurrently and keep whatever answered by the deadline."""
+        tasks = [asyncio.create_task(self._lookup(source, query)) for source in self.sources]
+        if not tasks:
+            return FederatedSearch(results=[], sources=[])
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline_seconds)
+
+        outcomes: list[SourceOutcome] = []
+        lookups: list[SearchLookup] = []
+        for source, task in zip(self.sources, tasks):
+            if task in done:
+                outcome, lookup = task.result()
+                outcomes.append(outcome)
+                if lookup is not None:
+                    lookups.append(lookup)
+                continue
+            SEARCH_SOURCE_SECONDS.observe(self.deadline_seconds, source.name, "timeout")
+            outcomes.append(
+                SourceOutcome(source.name, "timeout", round(self.deadline_seconds * 1000, 2))
+            )
+
+        for task in pending:
+            if self.cache is None:
+                task.cancel()
+            _stragglers.add(task)
+            task.add_done_callback(_discard_straggler)
+
+        if not lookups and all(outcome.status == "error" for outcome in outcomes):
+            raise UpstreamServiceError(f"All search sources failed for query {query!r}")
+        return FederatedSearch(
+            results=merge_results([lookup.results for lookup in lookups]),
+            sources=outcomes,
+            lookups=lookups,
+        )
+
+    async def _lookup(
+        self,
+        source: SearchClientProtocol,
+        query: str,
+    ) -> tuple[SourceOutcome, SearchLookup | None]:
+        start = time.perf_counter()
+        try:
+            if self.cache is None:
+                lookup = SearchLookup(await source.search(query), "BYPASS")
+            else:
+                lookup = await self.cache.get_or_fetch(query, source.search, namespace=source.name)
+        except Exception:  # noqa: BLE001 - one failing source must not fail the search
+            elapsed = time.perf_counter() - start
+            SEARCH_SOURCE_SECONDS.observe(elapsed, source.name, "error")
+            return SourceOutcome(source.name, "error", round(elapsed * 1000, 2)), None
+        elapsed = time.perf_counter() - start
+        SEARCH_SOURCE_SECONDS.observe(elapsed, source.name, "ok")
+        outcome = SourceOutcome(source.name, "ok", round(elapsed * 1000, 2), len(lookup.results))
+        return outcome, lookup
+
+    def cache_headers(self, search: FederatedSearch) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.cache is not None and search.lookups:
+            # The response is only as fresh as its stalest source.
+            status = max(
+                (lookup.status for lookup in search.lookups), key=_CACHE_STATUS_RANK.__getitem__
+            )
+            age = max(lookup.age_seconds for lookup in search.lookups)
+            headers = self.cache.cache_headers(SearchLookup(search.results, status, age))
+        if search.partial:
+            # Missing sources may answer next time; do not let clients keep this response.
+            headers["Cache-Control"] = "no-store"
+        return headers
+
+
+def _discard_straggler(task: asyncio.Task) -> None:
+    _stragglers.discard(task)
+    if not task.cancelled():
+        task.exception()  # Mark retrieved; `_lookup` reports failures instead of raising.
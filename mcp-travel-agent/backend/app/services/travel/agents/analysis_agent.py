@@ -1,7 +1,9 @@
+from app.core.tracing import traced
 from app.services.travel.state import TravelState
 
 
 class AnalysisAgent:
+    @traced("AnalysisAgent.run")
     def run(self, state: TravelState) -> TravelState:
         budget = state["budget_usd"]
         interests = [item.lower() for item in state["interests"]]
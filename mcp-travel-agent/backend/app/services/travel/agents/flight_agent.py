@@ -1,3 +1,4 @@
+from app.core.tracing import traced
 from app.services.travel.state import TravelState
 from app.services.travel.tools.flight_tools import FlightTools
 
@@ -6,6 +7,7 @@ class FlightAgent:
     def __init__(self, tools: FlightTools) -> None:
         self.tools = tools
 
+    @traced("FlightAgent.run")
     def run(self, state: TravelState) -> TravelState:
         flights = self.tools.search_flights(
             origin=state["origin"],
@@ -1,7 +1,9 @@
+from app.core.tracing import traced
 from app.services.travel.state import TravelState
 
 
 class OrchestratorAgent:
+    @traced("OrchestratorAgent.run")
     def run(self, state: TravelState) -> TravelState:
         property_count = len(state["top_properties"])
         cheapest_flight = min((int(item["estimated_price_usd"]) for item in state["flight_options"]), default=0)
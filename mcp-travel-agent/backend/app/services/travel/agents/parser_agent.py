@@ -1,5 +1,6 @@
 import re
 
+from app.core.tracing import traced
 from app.services.travel.state import TravelState
 
 
@@ -28,6 +29,7 @@ def _extract_destination(query: str) -> str:
     return "Chicago"
 
 
+@traced("parser_agent.run")
 def run(state: TravelState) -> TravelState:
     destination = _extract_destination(state["query"])
     assumptions = list(state.get("assumptions", []))
@@ -1,3 +1,4 @@
+from app.core.tracing import traced
 from app.services.travel.state import TravelState
 from app.services.travel.tools.airbnb_tools import AirbnbTools
 
@@ -6,6 +7,7 @@ class PropertyAgent:
     def __init__(self, tools: AirbnbTools) -> None:
         self.tools = tools
 
+    @traced("PropertyAgent.run")
     def run(self, state: TravelState) -> TravelState:
         properties = self.tools.search_properties(
             destination=state["selected_destination"],
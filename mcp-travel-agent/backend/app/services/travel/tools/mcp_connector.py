@@ -1,3 +1,6 @@
+from app.core.tracing import tracer
+
+
 class MCPConnector:
     """Thin adapter boundary for future MCP server integration.
 
@@ -6,8 +9,10 @@ class MCPConnector:
     """
 
     def call_tool(self, server_name: str, tool_name: str, payload: dict) -> dict:
-        return {
-            "server": server_name,
-            "tool": tool_name,
-            "payload": payload,
-        }
+        attributes = {"mcp.server": server_name, "mcp.tool": tool_name}
+        with tracer.span("MCPConnector.call_tool", attributes, kind="client"):
+            return {
+                "server": server_name,
+                "tool": tool_name,
+                "payload": payload,
+            }
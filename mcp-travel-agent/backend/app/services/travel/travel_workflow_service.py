@@ -1,4 +1,6 @@
 from app.api.schemas.travel import TravelPlanRequest
+from app.core.metrics import timed_node
+from app.core.tracing import traced
 from app.services.travel import state as state_types
 from app.services.travel.agents.analysis_agent import AnalysisAgent
 from app.services.travel.agents.flight_agent import FlightAgent
@@ -23,6 +25,10 @@ class TravelWorkflowService:
     The agent names mirror the reference project so the codebase is easier to compare and reason about.
     """
 
+    # Settings that change the agents or compiled graph; see app.core.graph_registry.
+    # The workflow is fully deterministic today, so it is built exactly once per process.
+    settings_dependencies: tuple[str, ...] = ()
+
     def __init__(self) -> None:
         connector = MCPConnector()
         self._property_agent = PropertyAgent(AirbnbTools(connector))
@@ -52,6 +58,7 @@ class TravelWorkflowService:
         graph.add_edge("orchestrator_agent", END)
         return graph.compile()
 
+    @traced("TravelWorkflowService.plan")
     def plan(self, request: TravelPlanRequest) -> dict:
         state: state_types.TravelState = {
             "query": request.query,
@@ -87,17 +94,22 @@ class TravelWorkflowService:
         state = self._orchestrator_node(state)
         return state
 
+    @timed_node("travel", "parser_agent")
     def _parser_node(self, state: state_types.TravelState) -> state_types.TravelState:
         return parse_request(state)
 
+    @timed_node("travel", "property_agent")
     def _property_node(self, state: state_types.TravelState) -> state_types.TravelState:
         return self._property_agent.run(state)
 
+    @timed_node("travel", "flight_agent")
     def _flight_node(self, state: state_types.TravelState) -> state_types.TravelState:
         return self._flight_agent.run(state)
 
+    @timed_node("travel", "analysis_agent")
     def _analysis_node(self, state: state_types.TravelState) -> state_types.TravelState:
         return self._analysis_agent.run(state)
 
+    @timed_node("travel", "orchestrator_agent")
     def _orchestrator_node(self, state: state_types.TravelState) -> state_types.TravelState:
         return self._orchestrator_agent.run(state)
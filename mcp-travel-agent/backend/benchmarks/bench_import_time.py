@@ -0,0 +1,85 @@
+"""Cold import time of `app.main`, with a budget check for CI.
+
+Usage:
+    python -m benchmarks.bench_import_time [--runs 5] [--budget-ms 1000] [--top 10]
+
+Each run imports `app.main` in a fresh interpreter under `python -X importtime` and parses
+the per-module timings it writes to stderr. The fastest run is reported (the others are
+mostly disk-cache and scheduler noise), with the packages that cost the most self time.
+Exits non-zero if that run exceeds the budget or if any module in `--forbid` was imported:
+provider SDKs and LangGraph are loaded on first use or by the startup warmup, so a module
+that imports them eagerly shows up here rather than as slower container starts.
+"""
+import argparse
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_FORBID = "openai,google.generativeai,langgraph"
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Module name -> (self, cumulative) microseconds from `-X importtime` output."""
+    timings: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header row
+        timings[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--forbid", default=DEFAULT_FORBID, help="Comma-separated modules")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    timings = min(runs, key=lambda run: run[args.module][1])
+    total_ms = timings[args.module][1] / 1000
+
+    by_package: Counter[str] = Counter()
+    for name, (self_us, _) in timings.items():
+        by_package[name.split(".")[0]] += self_us
+
+    print(
+        f"import {args.module}: {total_ms:.1f} ms (best of {args.runs}), "
+        f"{len(timings)} modules, budget {args.budget_ms:.0f} ms"
+    )
+    for package, self_us in by_package.most_common(args.top):
+        print(f"  {package:<28} {self_us / 1000:8.1f} ms")
+
+    failures: list[str] = []
+    if total_ms > args.budget_ms:
+        failures.append(f"{total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    forbid = [name.strip() for name in args.forbid.split(",") if name.strip()]
+    forbidden = [name for name in forbid if name in timings]
+    if forbidden:
+        failures.append(f"imported eagerly: {', '.join(forbidden)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from anyio import to_thread
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.deps import (
+    get_jsonplaceholder_orchestrator,
+    get_llm_orchestrator,
+    get_search_orchestrator,
+    get_travel_orchestrator,
+)
+from app.core.graph_registry import GraphRegistry
+from app.main import app
+
+
+def test_travel_orchestrator_reuses_service() -> None:
+    assert get_travel_orchestrator().service is get_travel_orchestrator().service
+
+
+def test_dependencies_share_app_scoped_orchestrators() -> None:
+    assert get_search_orchestrator() is get_search_orchestrator()
+    assert get_jsonplaceholder_orchestrator() is get_jsonplaceholder_orchestrator()
+    assert get_llm_orchestrator() is get_llm_orchestrator()
+    assert get_travel_orchestrator() is get_travel_orchestrator()
+
+
+def test_override_replaces_an_entry_inside_the_block() -> None:
+    registry = GraphRegistry()
+    built = registry.get("cache", object)
+    stand_in = object()
+
+    with registry.override("cache", stand_in):
+        assert registry.get("cache", object) is stand_in
+    assert registry.get("cache", object) is built
+
+
+def test_aclose_releases_entries_newest_first() -> None:
+    registry = GraphRegistry()
+    closed: list[str] = []
+
+    class Resource:
+        def close(self) -> None:
+            closed.append("client")
+
+    class AsyncResource:
+        async def aclose(self) -> None:
+            closed.append("service")
+
+    registry.get("client", Resource)
+    registry.get("service", AsyncResource)
+
+    asyncio.run(registry.aclose())
+
+    assert closed == ["service", "client"]
+
+
+def test_replaced_entries_are_closed_on_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = GraphRegistry()
+    closed: list[str] = []
+
+    class AsyncResource:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        async def aclose(self) -> None:
+            closed.append(self.name)
+
+    def build(name: str) -> AsyncResource:
+        return registry.get("service", lambda: AsyncResource(name), depends_on=("LLM_MODEL",))
+
+    async def scenario() -> None:
+        build("first")
+        monkeypatch.setattr(settings, "LLM_MODEL", "gpt-4.1-mini")
+        # Sync dependencies are resolved in a worker thread, away from the event loop.
+        await to_thread.run_sync(build, "second")
+        monkeypatch.setattr(settings, "LLM_MODEL", "gpt-4.1")
+        build("third")
+        await asyncio.sleep(0)
+        assert closed == ["first", "second"]
+        await registry.aclose()
+
+    asyncio.run(scenario())
+
+    assert closed == ["first", "second", "third"]
+
+
+def test_aclose_keeps_going_when_a_resource_fails_to_close(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    registry = GraphRegistry()
+    closed: list[str] = []
+
+    class Broken:
+        async def aclose(self) -> None:
+            raise RuntimeError("connection already gone")
+
+    class Resource:
+        def close(self) -> None:
+            closed.append("client")
+
+    registry.get("client", Resource)
+    registry.get("broken", Broken)
+
+    asyncio.run(registry.aclose())
+
+    assert closed == ["client"]
+    assert "Failed to close Broken" in caplog.text
+
+
+def test_lifespan_closes_app_scoped_resources() -> None:
+    with TestClient(app) as client:
+        client.get("/api/health")
+        orchestrator = get_search_orchestrator()
+
+    assert get_search_orchestrator() is not orchestrator
@@ -0,0 +1,42 @@
+import asyncio
+
+import httpx
+
+from app.clients.wikipedia_client import WikipediaClient
+from app.core.http_client import close_http_client, get_http_client
+
+
+def test_wikipedia_searches_share_one_client() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"query": {"search": [{"title": "Lisbon"}]}})
+
+    async def scenario() -> list[list[dict[str, str]]]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = WikipediaClient(http_client=http_client, base_url="http://stub/w/api.php")
+            return [await client.search("lisbon"), await client.search("porto")]
+
+    first, second = asyncio.run(scenario())
+
+    assert first == [
+        {
+            "title": "Lisbon",
+            "url": "https://en.wikipedia.org/wiki/Lisbon",
+            "source": "wikipedia",
+        }
+    ]
+    assert second == first
+    assert [request.url.params["srsearch"] for request in requests] == ["lisbon", "porto"]
+    assert requests[0].headers["User-Agent"].startswith("mcp-travel-agent/")
+
+
+def test_shared_client_is_reused_per_loop_and_closed_on_shutdown() -> None:
+    async def scenario() -> tuple[bool, bool]:
+        client = get_http_client()
+        same = get_http_client() is client
+        await close_http_client()
+        return same, client.is_closed
+
+    assert asyncio.run(scenario()) == (True, True)
@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.clients.jsonplaceholder_client import JsonPlaceholderClient
+from app.core.deps import get_jsonplaceholder_orchestrator
+from app.core.http_cache import ConditionalResponseCache
+from app.main import app
+from app.orchestration.jsonplaceholder_orchestrator import JsonPlaceholderOrchestrator
+
+POSTS = [{"id": index, "title": f"Post {index}"} for index in range(1, 101)]
+
+
+
+class _Upstream:
+    """Pages like JSONPlaceholder and answers If-None-Match with 304."""
+
+    def __init__(self, cache_control: str = "max-age=43200") -> None:
+        self.requests: list[httpx.Request] = []
+        self.cache_control = cache_control
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        start = int(request.url.params.get("_start", 0))
+        limit = int(request.url.params.get("_limit", len(POSTS)))
+        etag = f'W/"posts-{start}-{limit}"'
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=POSTS[start : start + limit], headers=headers)
+
+
+def _client(
+    upstream: _Upstream,
+    cache: ConditionalResponseCache | None,
+) -> tuple[httpx.AsyncClient, JsonPlaceholderClient]:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    return http_client, JsonPlaceholderClient(
+        http_client=http_client, cache=cache, base_url="http://stub"
+    )
+
+
+def test_pagination_is_pushed_to_the_upstream() -> None:
+    upstream = _Upstream()
+    http_client, client = _client(upstream, cache=None)
+
+    posts = asyncio.run(client.list_posts(start=20, limit=5))
+    asyncio.run(http_client.aclose())
+
+    assert [post["id"] for post in posts] == [21, 22, 23, 24, 25]
+    assert dict(upstream.requests[0].url.params) == {"_start": "20", "_limit": "5"}
+
+
+def test_repeat_calls_are_served_fresh_then_revalidated(clock) -> None:
+    upstream = _Upstream()
+    cache = ConditionalResponseCache(max_entries=10, ttl_seconds=60, clock=clock)
+    http_client, client = _client(upstream, cache)
+
+    async def scenario() -> list[list[dict]]:
+        pages = [await client.list_posts(), await client.list_posts()]
+        clock.now += 61
+        pages.append(await client.list_posts())
+        pages.append(await client.list_posts())
+        await http_client.aclose()
+        return pages
+
+    pages = asyncio.run(scenario())
+
+    assert all(page == POSTS[:10] for page in pages)
+    # First call fetches, the fresh repeat sends nothing, the stale one gets a 304.
+    assert len(upstream.requests) == 2
+    assert upstream.requests[1].headers["If-None-Match"] == 'W/"posts-0-10"'
+    assert cache.stats() == {
+        "entries": 1,
+        "hits": 2,
+        "revalidated": 1,
+        "misses": 1,
+        "hit_ratio": 0.75,
+    }
+
+
+def test_cached_bodies_are_not_shared_between_callers() -> None:
+    cache = ConditionalResponseCache(max_entries=10, ttl_seconds=60)
+    http_client, client = _client(_Upstream(), cache)
+
+    async def scenario() -> list[dict]:
+        first = await client.list_posts()
+        first[0]["title"] = "edited by a caller"
+        first.clear()
+        second = await client.list_posts()
+        await http_client.aclose()
+        return second
+
+    assert asyncio.run(scenario()) == POSTS[:10]
+    assert cache.stats()["hits"] == 1
+
+
+def test_no_cache_responses_are_always_revalidated() -> None:
+    upstream = _Upstream(cache_control="no-cache")
+    cache = ConditionalResponseCache(max_entries=10, ttl_seconds=60)
+    http_client, client = _client(upstream, cache)
+
+    async def scenario() -> None:
+        await client.list_posts()
+        await client.list_posts()
+        await http_client.aclose()
+
+    asyncio.run(scenario())
+
+    assert [request.headers.get("If-None-Match") for request in upstream.requests] == [
+        None,
+        'W/"posts-0-10"',
+    ]
+
+
+def test_posts_endpoint_accepts_pagination_params() -> None:
+    upstream = _Upstream()
+    _, client = _client(upstream, cache=None)
+    app.dependency_overrides[get_jsonplaceholder_orchestrator] = lambda: (
+        JsonPlaceholderOrchestrator(client)
+    )
+    try:
+        test_client = TestClient(app)
+        page = test_client.get("/api/test/jsonplaceholder/posts", params={"start": 95})
+        invalid = test_client.get("/api/test/jsonplaceholder/posts", params={"limit": 0})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [post["id"] for post in page.json()] == [96, 97, 98, 99, 100]
+    assert invalid.status_code == 422
@@ -1,5 +1,15 @@
+import subprocess
+import sys
+from pathlib import Path
+
 from app.core.config import settings
-from app.services.llm.factory import get_llm_provider
+from app.core.warmup import warm_up_imports
+from app.services.llm.factory import (
+    get_llm_provider,
+    load_provider_class,
+    register_provider,
+    reset_llm_providers,
+)
 
 
 def test_factory_selects_openai() -> None:
@@ -20,3 +30,84 @@ def test_factory_selects_gemini() -> None:
         assert provider.__class__.__name__ == "GeminiProvider"
     finally:
         settings.LLM_PROVIDER = previous
+
+
+class _CountingProvider:
+    instances = 0
+    closed = 0
+
+    def __init__(self) -> None:
+        type(self).instances += 1
+
+    def close(self) -> None:
+        type(self).closed += 1
+
+    def stream_chat(self, model, input_items, previous_response_id=None):
+        raise NotImplementedError
+
+
+def test_factory_reuses_provider_until_settings_change(monkeypatch) -> None:
+    register_provider("counting", _CountingProvider)
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "counting")
+    try:
+        first = get_llm_provider()
+        assert get_llm_provider() is first
+        assert _CountingProvider.instances == 1
+
+        monkeypatch.setattr(settings, "LLM_HTTP_MAX_CONNECTIONS", 7)
+        assert get_llm_provider() is not first
+        assert _CountingProvider.instances == 2
+        assert _CountingProvider.closed == 1
+    finally:
+        reset_llm_providers()
+
+
+def test_gemini_model_handles_are_cached_and_bounded(monkeypatch) -> None:
+    from app.services.llm import gemini_provider
+
+    built: list[tuple[str, str | None]] = []
+
+    def fake_model(model_name: str, system_instruction: str | None = None) -> object:
+        built.append((model_name, system_instruction))
+        return object()
+
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GEMINI_MODEL_CACHE_SIZE", 2)
+    monkeypatch.setattr(gemini_provider.genai, "GenerativeModel", fake_model)
+    provider = gemini_provider.GeminiProvider()
+
+    first = provider._model_for("gemini-2.0-flash-exp", "Be brief.")
+    assert provider._model_for("gemini-2.0-flash-exp", "Be brief.") is first
+    provider._model_for("gemini-2.0-flash-exp", "Be kind.")
+    provider._model_for("gemini-2.0-flash-exp", None)
+    provider._model_for("gemini-2.0-flash-exp", "Be brief.")
+
+    # The oldest handle was evicted once the cache exceeded two entries.
+    assert built.count(("gemini-2.0-flash-exp", "Be brief.")) == 2
+
+
+def test_app_import_leaves_provider_sdks_and_langgraph_unloaded() -> None:
+    # A fresh interpreter: this test process has already imported the SDKs.
+    script = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('openai', 'google.generativeai', 'langgraph') "
+        "if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == ""
+
+
+def test_warmup_loads_the_configured_provider(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+
+    warm_up_imports()
+
+    assert load_provider_class().__name__ == "OpenAIProvider"
+    assert "langgraph.graph" in sys.modules
@@ -0,0 +1,19 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import GRAPH_NODE_SECONDS
+from app.main import app
+
+
+def test_travel_plan_records_agent_latency_in_metrics() -> None:
+    client = TestClient(app)
+    before = GRAPH_NODE_SECONDS.count("travel", "parser_agent")
+
+    client.post("/api/travel/plan", json={"query": "Need a quick city break"})
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert GRAPH_NODE_SECONDS.count("travel", "parser_agent") == before + 1
+    assert 'graph_node_duration_seconds_count{graph="travel",node="orchestrator_agent"}' in (
+        response.text
+    )
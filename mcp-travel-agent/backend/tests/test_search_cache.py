@@ -0,0 +1,50 @@
+import asyncio
+from collections.abc import Callable
+
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_search_orchestrator
+from app.main import app
+from app.orchestration.search_orchestrator import SearchOrchestrator
+from app.services.search_cache import InMemorySearchStore, SearchCache
+from app.services.search_service import SearchService
+
+
+class _FakeWikipedia:
+    name = "wikipedia"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls: list[str] = []
+        self.delay = delay
+        self.fail = False
+
+    async def search(self, query: str) -> list[dict[str, str]]:
+        self.calls.append(query)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        title = f"{query} v{len(self.calls)}"
+        return [{"title": title, "url": f"https://example/{title}", "source": "wikipedia"}]
+
+
+def _cache(clock: Callable[[], float], ttl: float = 60, stale: float = 600) -> SearchCache:
+    store = InMemorySearchStore(max_entries=100, clock=clock)
+    return SearchCache(store=store, ttl_seconds=ttl, stale_seconds=stale, clock=clock)
+
+
+def test_search_endpoint_sets_cache_headers(clock) -> None:
+    upstream = _FakeWikipedia()
+    service = SearchService(sources=[upstream], cache=_cache(clock))
+    app.dependency_overrides[get_search_orchestrator] = lambda: SearchOrchestrator(service)
+    try:
+        client = TestClient(app)
+        first = client.get("/api/search", params={"q": "lisbon tram"})
+        second = client.get("/api/search", params={"q": "Lisbon  Tram"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["Cache-Control"] == "public, max-age=60, stale-while-revalidate=600"
+    assert second.json()["results"] == first.json()["results"]
+    assert len(upstream.calls) == 1
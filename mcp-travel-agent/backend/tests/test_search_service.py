@@ -0,0 +1,61 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_search_orchestrator
+from app.main import app
+from app.orchestration.search_orchestrator import SearchOrchestrator
+from app.services.search_service import SearchService
+
+
+class _FakeSource:
+    def __init__(self, name: str, titles: list[str], delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.titles = titles
+        self.delay = delay
+        self.fail = fail
+        self.completed = 0
+
+    async def search(self, query: str) -> list[dict[str, str]]:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        self.completed += 1
+        return [
+            {"title": title, "url": f"https://example/{title}", "source": self.name}
+            for title in self.titles
+        ]
+
+
+def test_slow_source_is_left_out_at_the_deadline() -> None:
+    fast = _FakeSource("wikipedia", ["Paris"])
+    slow = _FakeSource("wikivoyage", ["Paris travel guide"], delay=0.5)
+    service = SearchService(sources=[fast, slow], deadline_seconds=0.05)
+
+    search = asyncio.run(service.federated_search("paris"))
+
+    assert [item["title"] for item in search.results] == ["Paris"]
+    assert [(outcome.name, outcome.status) for outcome in search.sources] == [
+        ("wikipedia", "ok"),
+        ("wikivoyage", "timeout"),
+    ]
+    assert search.partial
+    assert service.cache_headers(search)["Cache-Control"] == "no-store"
+
+
+def test_search_endpoint_reports_per_source_status() -> None:
+    service = SearchService(
+        sources=[_FakeSource("wikipedia", ["Kyoto"]), _FakeSource("wikivoyage", ["Kyoto"])],
+    )
+    app.dependency_overrides[get_search_orchestrator] = lambda: SearchOrchestrator(service)
+    try:
+        response = TestClient(app).get("/api/search", params={"q": "kyoto"})
+    finally:
+        app.dependency_overrides.clear()
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [item["source"] for item in body["results"]] == ["wikipedia"]
+    assert [source["name"] for source in body["sources"]] == ["wikipedia", "wikivoyage"]
+    assert body["sources"][1]["result_count"] == 1
+    assert body["partial"] is False
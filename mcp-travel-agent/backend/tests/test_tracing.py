@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.tracing import tracer
+from app.main import app
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "TRACE_EXPORTER", "jsonl")
+    monkeypatch.setattr(settings, "TRACE_JSONL_PATH", str(path))
+    yield path
+    tracer.shutdown()
+
+
+def _spans(path) -> dict[str, dict]:
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    return {span["name"]: span for span in spans}
+
+
+def test_travel_plan_produces_nested_spans(trace_file) -> None:
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/travel/plan",
+        json={"query": "Need a quick city break"},
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+
+    assert response.status_code == 200
+    spans = _spans(trace_file)
+    root = spans["POST /api/travel/plan"]
+    assert root["trace_id"] == TRACE_ID
+    assert root["parent_id"] == PARENT_ID
+    assert root["attributes"]["http.status_code"] == 200
+    assert spans["TravelOrchestrator.plan_trip"]["parent_id"] == root["span_id"]
+    plan = spans["TravelWorkflowService.plan"]
+    assert plan["parent_id"] == spans["TravelOrchestrator.plan_trip"]["span_id"]
+    assert spans["PropertyAgent.run"]["parent_id"] == plan["span_id"]
+    tool_call = spans["MCPConnector.call_tool"]
+    assert tool_call["attributes"]["mcp.server"]
+    agent_ids = {spans["PropertyAgent.run"]["span_id"], spans["FlightAgent.run"]["span_id"]}
+    assert tool_call["parent_id"] in agent_ids
+    assert {span["trace_id"] for span in spans.values()} == {TRACE_ID}
+
+
+def test_unsampled_requests_export_nothing(trace_file, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+    client = TestClient(app)
+
+    response = client.post("/api/travel/plan", json={"query": "Need a quick city break"})
+
+    assert response.status_code == 200
+    assert not trace_file.exists() or trace_file.read_text() == ""